@@ -1,21 +1,29 @@
 import streamlit as st
-import zipfile
-import io
-import json
-import datetime
-import re
-import requests  # Required for Titan AI
+import os
+import pandas as pd
+from titan_ai import GROQ_BASE_URL, GroqClient, enrich_csv_text
+from titan_audit import BUDGET_LABELS, DEFAULT_BUDGETS, audit_site
+from titan_compiler import (
+    DEFAULTS, build_page, compile_site, config_hash, gen_blog_index_html, gen_blog_post_html,
+    gen_booking_content, gen_contact_content, gen_home_content, gen_product_page_content,
+    gen_text_page, make_config, site_slug, zip_site,
+)
 
 # --- 0. STATE MANAGEMENT (AI INTEGRATION) ---
 def init_state(key, default_val):
     if key not in st.session_state:
         st.session_state[key] = default_val
 
-init_state('hero_h', "Stop Paying Rent for Your Website.")
-init_state('hero_sub', "The Titan Engine is the world’s first 0.1s website architecture that runs on $0 monthly fees. Pay once. Own it forever.")
-init_state('about_h', "Control Your Empire from a Spreadsheet")
-init_state('about_short', "No WordPress dashboard. No plugins to update. Just open your private Google Sheet, change a text, and watch your site update globally in seconds.")
-init_state('feat_data', "bolt | The Performance Pillar | **0.1s High-Velocity Loading**. While traditional sites take 3–5s, Titan loads instantly.\nwallet | The Economic Pillar | **$0 Monthly Fees**. We eliminated hosting subscriptions.\ntable | The Functional Pillar | **Google Sheets CMS**. Update prices and photos directly from a simple spreadsheet.\nshield | The Authority Pillar | **Unhackable Security**. Zero-DB Architecture removes the hacker's primary entry point.\nlayers | The Reliability Pillar | **Global Edge Deployment**. Distributed across 100+ servers worldwide.\nstar | The Conversion Pillar | **One-Tap WhatsApp**. Direct-to-Chat technology.")
+init_state('hero_h', DEFAULTS['hero_h'])
+init_state('hero_sub', DEFAULTS['hero_sub'])
+init_state('about_h', DEFAULTS['about_h'])
+init_state('about_short', DEFAULTS['about_short'])
+init_state('feat_data', DEFAULTS['feat_data'])
+
+@st.cache_resource
+def get_ai_client(api_key):
+    # One pooled client (and on-disk response cache) per key, reused across reruns and sessions
+    return GroqClient(api_key, base_url=os.environ.get("TITAN_AI_BASE_URL", GROQ_BASE_URL))
 
 # --- 1. APP CONFIGURATION ---
 st.set_page_config(
@@ -88,17 +96,7 @@ with st.sidebar:
             else:
                 try:
                     with st.spinner("Titan AI is writing..."):
-                        url = "https://api.groq.com/openai/v1/chat/completions"
-                        headers = {"Authorization": f"Bearer {groq_key}", "Content-Type": "application/json"}
-                        prompt = f"""
-                        Act as a copywriter. Return a JSON object with these keys for a '{biz_desc}' business:
-                        hero_h (Catchy headline), hero_sub (2 sentences), about_h (Title), about_short (3 sentences),
-                        feat_data (4 lines. Format: iconname | Title | Description. Icons: bolt, wallet, shield, star, heart).
-                        """
-                        data = {"messages": [{"role": "user", "content": prompt}], "model": "llama3-8b-8192", "response_format": {"type": "json_object"}}
-                        resp = requests.post(url, headers=headers, json=data)
-                        res_json = resp.json()['choices'][0]['message']['content']
-                        parsed = json.loads(res_json)
+                        parsed = get_ai_client(groq_key).generate_copy(biz_desc)
                         
                         # Update State
                         st.session_state.hero_h = parsed.get('hero_h', st.session_state.hero_h)
@@ -110,15 +108,36 @@ with st.sidebar:
                 except Exception as e:
                     st.error(f"AI Error: {e}")
 
+        # Whole-sheet mode: product descriptions / blog excerpts for every row in one run
+        st.markdown("**Bulk Enrich a Sheet**")
+        bulk_kind = st.radio("Sheet Type", ["inventory", "blog"], horizontal=True,
+                             format_func=lambda k: "Inventory → descriptions" if k == "inventory" else "Blog → excerpts")
+        bulk_csv = st.file_uploader("Sheet CSV export", type="csv", help="Only empty description/excerpt cells are filled. Rows already generated come from the cache.")
+        if st.button("⚡ Enrich CSV"):
+            if not groq_key or not bulk_csv:
+                st.error("Key & CSV required.")
+            else:
+                try:
+                    bar = st.progress(0.0, "Titan AI is writing...")
+                    enriched, stats = enrich_csv_text(get_ai_client(groq_key), bulk_csv.getvalue().decode("utf-8-sig"), bulk_kind,
+                                                      on_progress=lambda n, total: bar.progress(n / total, f"{n}/{total} rows"))
+                    st.caption(f"{stats['generated']} generated · {stats['cached']} cached · {stats['skipped']} already filled · {stats['failed']} failed")
+                    st.download_button("📥 Enriched CSV", enriched, f"enriched_{bulk_csv.name}", "text/csv")
+                except Exception as e:
+                    st.error(f"AI Error: {e}")
+
+    # Settings below only commit on "Apply", so dragging a slider does not rerun the whole app per tick
+    settings = st.form("site_settings", border=False)
+
     # 3.1 VISUAL DNA
-    with st.expander("🎨 Visual DNA", expanded=False):
+    with settings.expander("🎨 Visual DNA", expanded=False):
         theme_mode = st.selectbox("Base Theme", [
             "Clean Corporate (Light)", "Midnight SaaS (Dark)", "Glassmorphism (Blur)",
             "Cyberpunk Neon", "Luxury Gold", "Forest Eco", "Ocean Breeze", "Stark Minimalist"
         ])
         c1, c2 = st.columns(2)
-        p_color = c1.color_picker("Primary Brand", "#0F172A") 
-        s_color = c2.color_picker("Action (CTA)", "#EF4444")  
+        p_color = c1.color_picker("Primary Brand", DEFAULTS["p_color"]) 
+        s_color = c2.color_picker("Action (CTA)", DEFAULTS["s_color"])  
         
         st.markdown("**Typography**")
         h_font = st.selectbox("Headings", ["Montserrat", "Space Grotesk", "Playfair Display", "Oswald", "Clash Display"])
@@ -129,7 +148,7 @@ with st.sidebar:
         anim_type = st.selectbox("Animation Style", ["Fade Up", "Zoom In", "Slide Right", "None"])
 
     # 3.2 MODULE MANAGER
-    with st.expander("🧩 Section Manager", expanded=False):
+    with settings.expander("🧩 Section Manager", expanded=False):
         st.caption("Toggle sections to include:")
         show_hero = st.checkbox("Hero Carousel", value=True)
         show_stats = st.checkbox("Trust Stats/Logos", value=True)
@@ -142,47 +161,66 @@ with st.sidebar:
         show_faq = st.checkbox("F.A.Q.", value=True)
         show_cta = st.checkbox("Final Call to Action", value=True)
         show_booking = st.checkbox("Booking Engine (New)", value=True) 
+        show_search = st.checkbox("Site Search (Store + Blog)", value=DEFAULTS["show_search"], help="Adds search.html. The store and blog sheets are indexed when you download the ZIP; visitors only fetch the small index pieces their words need.")
 
     # 3.3 TECHNICAL
-    with st.expander("⚙️ SEO & Analytics", expanded=False):
+    with settings.expander("⚙️ SEO & Analytics", expanded=False):
         st.markdown("**Targeting**")
-        seo_area = st.text_input("Service Area (City/Region)", "Global / Online")
-        seo_kw = st.text_area("SEO Keywords", "web design, no monthly fees, one time payment website, stop web rent")
+        seo_area = st.text_input("Service Area (City/Region)", DEFAULTS["seo_area"])
+        seo_kw = st.text_area("SEO Keywords", DEFAULTS["seo_kw"])
         
         st.markdown("**Verification**")
         gsc_tag = st.text_input("Google Verification ID")
         ga_tag = st.text_input("Google Analytics ID (G-XXXX)")
         og_image = st.text_input("Social Share Image URL")
 
+    # 3.4 BUILD OUTPUT
+    with settings.expander("📦 Build Output", expanded=False):
+        asset_mode = st.radio("CSS & JS Delivery", ["inline", "external"], index=["inline", "external"].index(DEFAULTS["asset_mode"]),
+                              format_func=lambda m: "Inline in every page" if m == "inline" else "Shared hashed files (styles/app.<hash>)",
+                              help="Shared files are downloaded once and cached forever via the generated _headers file. The live preview always inlines.")
+        minify = st.checkbox("Minify HTML / CSS / JS", value=DEFAULTS["minify"], help="Strips whitespace and comments from every file in the ZIP and shows a size report.")
+        critical_css = st.checkbox("Per-page critical CSS", value=DEFAULTS["critical_css"], help="Each page inlines only the CSS rules its own markup uses. With shared files the full stylesheet loads without blocking render; inline pages drop the unused rules.")
+        sheet_cache_ttl = st.number_input("Sheet cache TTL (seconds)", min_value=0, value=DEFAULTS["sheet_cache_ttl"], step=60,
+                                          help="Visitors get Google Sheet data from their browser cache instantly; rows older than this are re-fetched in the background.")
+        image_dir = st.text_input("Local Image Folder", DEFAULTS["image_dir"], placeholder="e.g. C:/client/photos",
+                                  help="Image fields (and the sheet image column) may then name files in this folder; sheet rows cannot reach files outside it. They are resized to several widths, encoded as AVIF/WebP + JPEG/PNG and bundled under img/ with srcset.")
+        image_formats = st.multiselect("Modern Image Formats", ["avif", "webp"], default=DEFAULTS["image_formats"])
+        font_dir = st.text_input("Local Font Folder", DEFAULTS["font_dir"], placeholder="e.g. C:/client/fonts",
+                                 help="Font files for the heading/body fonts, named like Montserrat-Bold.ttf, Inter-Regular.woff2 or Inter[wght].ttf. They ship in the ZIP under fonts/ with preload hints instead of Google Fonts; with fontTools installed they are subset to the characters your pages use and converted to WOFF2.")
+    settings.form_submit_button("Apply Settings")
+
 # --- 4. MAIN WORKSPACE ---
 st.title("🏗️ StopWebRent Site Builder v35.4")
 
-tabs = st.tabs(["1. Identity & PWA", "2. Content Blocks", "3. Pricing Logic", "4. Store & Payments", "5. Booking", "6. Blog Engine", "7. Legal & Footer"])
+# All seven tabs are one form: edits are batched and committed together with "Apply Changes"
+editor = st.form("editor", border=False)
+tabs = editor.tabs(["1. Identity & PWA", "2. Content Blocks", "3. Pricing Logic", "4. Store & Payments", "5. Booking", "6. Blog Engine", "7. Legal & Footer"])
 
 with tabs[0]:
     c1, c2 = st.columns(2)
     with c1:
-        biz_name = st.text_input("Business Name", "StopWebRent.com")
-        biz_tagline = st.text_input("Tagline", "Stop Renting. Start Owning.")
-        biz_phone = st.text_input("Phone", "966572562151")
-        biz_email = st.text_input("Email (For Forms)", "hello@kaydiemscriptlab.com")
+        biz_name = st.text_input("Business Name", DEFAULTS["biz_name"])
+        biz_tagline = st.text_input("Tagline", DEFAULTS["biz_tagline"])
+        biz_phone = st.text_input("Phone", DEFAULTS["biz_phone"])
+        biz_email = st.text_input("Email (For Forms)", DEFAULTS["biz_email"])
     with c2:
-        prod_url = st.text_input("Website URL", "https://www.stopwebrent.com")
-        biz_addr = st.text_area("Address", "Kaydiem Script Lab\nKanishka’s House, Garia Station Rd\nKolkata, West Bengal 700084, India", height=100)
+        prod_url = st.text_input("Website URL", DEFAULTS["prod_url"])
+        biz_addr = st.text_area("Address", DEFAULTS["biz_addr"], height=100)
         map_iframe = st.text_area("Google Map Embed Code", placeholder='<iframe src="..."></iframe>', height=100)
-        seo_d = st.text_area("Meta Description (SEO)", "Stop paying monthly fees for Wix or Shopify. The Titan Engine builds ultra-fast (0.1s) websites with $0 hosting costs. Pay once, own your code forever.", height=100)
+        seo_d = st.text_area("Meta Description (SEO)", DEFAULTS["seo_d"], height=100)
         logo_url = st.text_input("Logo URL (PNG/SVG)")
 
     # --- FEATURE 4: PWA SETTINGS ---
     st.subheader("📱 Progressive Web App (PWA)")
     st.info("Makes your website installable as an App on Android/iOS.")
     pwa_short = st.text_input("App Short Name", biz_name[:12])
-    pwa_desc = st.text_input("App Description", "Official App")
+    pwa_desc = st.text_input("App Description", DEFAULTS["pwa_desc"])
     pwa_icon = st.text_input("App Icon (512x512 PNG)", logo_url)
 
     # --- FEATURE 5: MULTI-LANGUAGE ---
     st.subheader("🌍 Multi-Language Smart Switch")
-    st.info("Provide a second Google Sheet URL with translations. Columns: `ElementID`, `TranslatedText`.")
+    st.info("Provide a second Google Sheet URL with translations. Columns: `Key` (element ID or exact text), then one per language code, e.g. `es`, `fr`. Each page is published as `index.es.html` etc.")
     lang_sheet = st.text_input("Translation Sheet CSV URL (Optional)")
         
     st.subheader("Social Links")
@@ -194,7 +232,7 @@ with tabs[0]:
     sc4, sc5, sc6 = st.columns(3)
     li_link = sc4.text_input("LinkedIn URL")
     yt_link = sc5.text_input("YouTube URL")
-    wa_num = sc6.text_input("WhatsApp Number (No +)", "966572562151")
+    wa_num = sc6.text_input("WhatsApp Number (No +)", DEFAULTS["wa_num"])
 
 with tabs[1]:
     st.subheader("Hero Carousel (AI Editable)")
@@ -203,60 +241,62 @@ with tabs[1]:
     hero_sub = st.text_input("Hero Subtext", key="hero_sub")
     
     hc1, hc2, hc3 = st.columns(3)
-    hero_img_1 = hc1.text_input("Slide 1 Image", "https://images.unsplash.com/photo-1460925895917-afdab827c52f?q=80&w=1600")
-    hero_img_2 = hc2.text_input("Slide 2 Image", "https://images.unsplash.com/photo-1551288049-bebda4e38f71?q=80&w=1600")
-    hero_img_3 = hc3.text_input("Slide 3 Image", "https://images.unsplash.com/photo-1526374965328-7f61d4dc18c5?q=80&w=1600")
+    hero_img_1 = hc1.text_input("Slide 1 Image", DEFAULTS["hero_img_1"])
+    hero_img_2 = hc2.text_input("Slide 2 Image", DEFAULTS["hero_img_2"])
+    hero_img_3 = hc3.text_input("Slide 3 Image", DEFAULTS["hero_img_3"])
     
     st.divider()
     
     st.subheader("Trust Stats Data")
     col_s1, col_s2, col_s3 = st.columns(3)
-    stat_1 = col_s1.text_input("Stat 1", "0.1s")
-    label_1 = col_s1.text_input("Label 1", "Load Speed")
+    stat_1 = col_s1.text_input("Stat 1", DEFAULTS["stat_1"])
+    label_1 = col_s1.text_input("Label 1", DEFAULTS["label_1"])
     
-    stat_2 = col_s2.text_input("Stat 2", "$0")
-    label_2 = col_s2.text_input("Label 2", "Monthly Fees")
+    stat_2 = col_s2.text_input("Stat 2", DEFAULTS["stat_2"])
+    label_2 = col_s2.text_input("Label 2", DEFAULTS["label_2"])
     
-    stat_3 = col_s3.text_input("Stat 3", "100%")
-    label_3 = col_s3.text_input("Label 3", "Ownership")
+    stat_3 = col_s3.text_input("Stat 3", DEFAULTS["stat_3"])
+    label_3 = col_s3.text_input("Label 3", DEFAULTS["label_3"])
 
     st.divider()
     
     st.subheader("The 4 Pillars (Feature Grid)")
-    f_title = st.text_input("Features Title", "The Titan Value Pillars")
+    f_title = st.text_input("Features Title", DEFAULTS["f_title"])
     feat_data_input = st.text_area("Features List", key="feat_data", height=150)
     
     st.subheader("About Content")
     
     about_h_in = st.text_input("About Title", key="about_h")
-    about_img = st.text_input("About Side Image", "https://images.unsplash.com/photo-1543286386-713df548e9cc?q=80&w=1600")
+    about_img = st.text_input("About Side Image", DEFAULTS["about_img"])
     
     c_a1, c_a2 = st.columns(2)
     about_short_in = c_a1.text_area("Home Page Summary (Short)", key="about_short", height=200)
-    about_long = c_a2.text_area("Full About Page Content (Long)", "**The Digital Landlord Trap**\nMost business owners don't realize they are trapped in a rental cycle...", height=200)
+    about_long = c_a2.text_area("Full About Page Content (Long)", DEFAULTS["about_long"], height=200)
 
 with tabs[2]:
     st.subheader("💰 Pricing Comparison Table")
     st.info("This configures the table that compares you vs. Wix/Shopify.")
     col_p1, col_p2, col_p3 = st.columns(3)
-    titan_price = col_p1.text_input("Titan Setup Price", "$199")
-    titan_mo = col_p1.text_input("Titan Monthly", "$0")
-    wix_name = col_p2.text_input("Competitor Name", "Wix (Core Plan)")
-    wix_mo = col_p2.text_input("Competitor Monthly", "$29/mo")
-    save_val = col_p3.text_input("5-Year Savings Calculation", "$1,466")
+    titan_price = col_p1.text_input("Titan Setup Price", DEFAULTS["titan_price"])
+    titan_mo = col_p1.text_input("Titan Monthly", DEFAULTS["titan_mo"])
+    wix_name = col_p2.text_input("Competitor Name", DEFAULTS["wix_name"])
+    wix_mo = col_p2.text_input("Competitor Monthly", DEFAULTS["wix_mo"])
+    save_val = col_p3.text_input("5-Year Savings Calculation", DEFAULTS["save_val"])
 
 with tabs[3]:
     st.subheader("🛒 Store, Payment & Inventory")
     st.info("⚡ Power your portfolio with a Google Sheet. **Added Feature: Payment Links**")
     sheet_url = st.text_input("Google Sheet CSV Link", placeholder="https://docs.google.com/spreadsheets/d/e/.../pub?output=csv")
-    custom_feat = st.text_input("Default Product Image URL (Fallback)", "https://images.unsplash.com/photo-1460925895917-afdab827c52f?q=80&w=800")
+    custom_feat = st.text_input("Default Product Image URL (Fallback)", DEFAULTS["custom_feat"])
+    prerender_inventory = st.checkbox("⚡ Prerender store at build time", value=DEFAULTS["prerender_inventory"], help="Pulls the sheet once when you download the ZIP and bakes the cards into index.html plus one product/<name>.html page per row. Re-download after editing the sheet.")
+    inv_page_size = st.number_input("Products per \"Load More\" page", min_value=1, max_value=200, value=DEFAULTS["inv_page_size"])
     
     # --- FEATURE 2: PAYMENTS ---
     st.markdown("### 💳 Payment Gateways")
     st.caption("We have added a Shopping Cart (Cart.js) and direct payment links.")
     col_pay1, col_pay2 = st.columns(2)
-    paypal_link = col_pay1.text_input("PayPal.me Link", "https://paypal.me/yourid")
-    upi_id = col_pay2.text_input("UPI ID (India)", "yourname@upi")
+    paypal_link = col_pay1.text_input("PayPal.me Link", DEFAULTS["paypal_link"])
+    upi_id = col_pay2.text_input("UPI ID (India)", DEFAULTS["upi_id"])
     
     st.markdown("""
     **CSV Instruction Update:**
@@ -280,907 +320,153 @@ with tabs[4]:
     """, unsafe_allow_html=True)
     
     # Defaulting to a working demo so it never looks broken initially
-    booking_embed = st.text_area("Paste Embed Code (iframe)", height=150, value='<!-- Calendly inline widget begin -->\n<div class="calendly-inline-widget" data-url="https://calendly.com/titan-demo/30min" style="min-width:320px;height:630px;"></div>\n<script type="text/javascript" src="https://assets.calendly.com/assets/external/widget.js" async></script>\n<!-- Calendly inline widget end -->')
-    booking_title = st.text_input("Booking Page Title", "Book an Appointment")
-    booking_desc = st.text_input("Booking Page Subtext", "Select a time slot that works for you.")
+    booking_embed = st.text_area("Paste Embed Code (iframe)", height=150, value=DEFAULTS["booking_embed"])
+    booking_title = st.text_input("Booking Page Title", DEFAULTS["booking_title"])
+    booking_desc = st.text_input("Booking Page Subtext", DEFAULTS["booking_desc"])
 
 with tabs[5]:
     st.subheader("📰 Titan Blog Engine")
     st.info("Connect a Google Sheet to power your blog. Zero database required.")
     blog_sheet_url = st.text_input("Blog CSV Link", placeholder="https://docs.google.com/spreadsheets/d/e/.../pub?output=csv", help="Publish your sheet as CSV")
-    blog_hero_title = st.text_input("Blog Page Title", "Latest Insights")
-    blog_hero_sub = st.text_input("Blog Page Subtext", "Thoughts on technology, business, and freedom.")
+    blog_hero_title = st.text_input("Blog Page Title", DEFAULTS["blog_hero_title"])
+    blog_hero_sub = st.text_input("Blog Page Subtext", DEFAULTS["blog_hero_sub"])
+    bc1, bc2 = st.columns(2)
+    prerender_blog = bc1.checkbox("⚡ Prerender blog at build time", value=DEFAULTS["prerender_blog"], help="Renders blog/<post>.html for every row and a paginated blog index into the ZIP, so readers never download the whole CSV.")
+    blog_per_page = bc2.number_input("Posts per index page", min_value=1, max_value=60, value=DEFAULTS["blog_per_page"])
 
 with tabs[6]:
     st.subheader("Trust & Legal")
-    testi_data = st.text_area("Testimonials (Name | Quote)", "Rajesh Gupta, HVAC Business Owner | I was paying Wix $35/month for 3 years. Titan built me a faster site for a one-time fee. I stopped the bleeding and finally own my asset.\nSarah Jenkins, Cafe Owner | Updating my menu used to be a nightmare on WordPress. Now, I just open a Google Sheet on my phone, change the price, and it updates the website instantly.\nDavid Miller, Financial Consultant | Speed is everything for SEO. My old site took 4 seconds to load. My new Titan site loads in 0.1 seconds. My Google ranking jumped to Page 1 within a month.", height=100)
-    faq_data = st.text_area("FAQ Data (Q? ? A)", "Do I really pay $0 for hosting? ? Yes. We utilize 'Static Site Architecture' which allows your site to be hosted on Enterprise CDNs (like Netlify/Vercel) within their generous free tiers for small businesses.\nWhat about my Domain Name? ? You pay that directly to the registrar (like GoDaddy or Namecheap). It usually costs ~$15/year. We do not mark this up.\nCan I add a blog later? ? Yes. The Titan Engine is scalable. We can add a blog, gallery, or more pages for a one-time expansion fee.\nIs it secure? ? It is safer than WordPress. Because there is no database to hack, your site is virtually impenetrable to common SQL injection attacks.", height=100)
+    testi_data = st.text_area("Testimonials (Name | Quote)", DEFAULTS["testi_data"], height=100)
+    faq_data = st.text_area("FAQ Data (Q? ? A)", DEFAULTS["faq_data"], height=100)
     l1, l2 = st.columns(2)
-    priv_txt = l1.text_area("Privacy Policy Text", "**1. Introduction & Digital Sovereignty**\nAt StopWebRent.com (operated by Kaydiem Script Lab), we treat data privacy not just as a compliance requirement, but as a fundamental architectural feature...", height=200)
-    term_txt = l2.text_area("Terms of Service Text", "**1. Service Agreement**\nBy engaging StopWebRent.com (Kaydiem Script Lab) for web development services, you agree to these Terms...", height=200)
-
-# --- 5. COMPILER ENGINE ---
-
-def format_text(text):
-    if not text: return ""
-    processed_text = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', text)
-    lines = processed_text.split('\n')
-    html_out = ""
-    in_list = False
-    
-    for line in lines:
-        clean_line = line.strip()
-        if not clean_line: continue
-        if clean_line.startswith("* "):
-            if not in_list:
-                html_out += '<ul style="margin-bottom:1rem; padding-left:1.5rem;">'
-                in_list = True
-            content = clean_line[2:] 
-            html_out += f'<li style="margin-bottom:0.5rem; opacity:0.9; color:inherit;">{content}</li>'
-        elif clean_line.startswith("<strong>") and clean_line.endswith("</strong>"):
-            if in_list: 
-                html_out += "</ul>"
-                in_list = False
-            header_text = clean_line.replace("<strong>", "").replace("</strong>", "")
-            html_out += f"<h3 style='margin-top:1.5rem; margin-bottom:0.5rem; color:var(--p); font-size:1.25rem;'>{header_text}</h3>"
-        else:
-            if in_list: 
-                html_out += "</ul>"
-                in_list = False
-            html_out += f"<p style='margin-bottom:1rem; opacity:0.9; color:inherit;'>{clean_line}</p>"
-    if in_list: html_out += "</ul>"
-    return html_out
-
-def gen_schema():
-    schema = {
-        "@context": "https://schema.org",
-        "@type": "LocalBusiness",
-        "name": biz_name,
-        "image": logo_url or hero_img_1,
-        "telephone": biz_phone,
-        "email": biz_email,
-        "areaServed": seo_area,
-        "address": {"@type": "PostalAddress", "streetAddress": biz_addr},
-        "url": prod_url,
-        "description": seo_d
-    }
-    return f'<script type="application/ld+json">{json.dumps(schema)}</script>'
-
-# --- NEW: PWA GENERATORS ---
-def gen_pwa_manifest():
-    return json.dumps({
-        "name": biz_name,
-        "short_name": pwa_short,
-        "start_url": "./index.html",
-        "display": "standalone",
-        "background_color": "#ffffff",
-        "theme_color": p_color,
-        "description": pwa_desc,
-        "icons": [{"src": pwa_icon, "sizes": "512x512", "type": "image/png"}]
-    })
-
-def gen_sw():
-    return """
-    self.addEventListener('install', (e) => {
-      e.waitUntil(caches.open('titan-store').then((cache) => cache.addAll(['./index.html', './contact.html'])));
-    });
-    self.addEventListener('fetch', (e) => {
-      e.respondWith(caches.match(e.request).then((response) => response || fetch(e.request)));
-    });
-    """
-
-def get_theme_css():
-    bg_color, text_color, card_bg, glass_nav = "#ffffff", "#0f172a", "#ffffff", "rgba(255, 255, 255, 0.95)"
-    
-    if "Midnight" in theme_mode:
-        bg_color, text_color, card_bg, glass_nav = "#0f172a", "#f8fafc", "#1e293b", "rgba(15, 23, 42, 0.9)"
-    elif "Cyberpunk" in theme_mode:
-        bg_color, text_color, card_bg, glass_nav = "#050505", "#00ff9d", "#111", "rgba(0,0,0,0.8)"
-    elif "Luxury" in theme_mode:
-        bg_color, text_color, card_bg, glass_nav = "#1c1c1c", "#D4AF37", "#2a2a2a", "rgba(28,28,28,0.95)"
-    elif "Forest" in theme_mode:
-        bg_color, text_color, card_bg, glass_nav = "#f1f8e9", "#1b5e20", "#ffffff", "rgba(241,248,233,0.9)"
-    elif "Ocean" in theme_mode:
-        bg_color, text_color, card_bg, glass_nav = "#e0f7fa", "#006064", "#ffffff", "rgba(224,247,250,0.9)"
-    elif "Stark" in theme_mode:
-        bg_color, text_color, card_bg, glass_nav = "#ffffff", "#000000", "#ffffff", "rgba(255,255,255,1)"
-
-    anim_css = ""
-    if anim_type == "Fade Up":
-        anim_css = ".reveal { opacity: 0; transform: translateY(30px); transition: all 0.8s ease-out; } .reveal.active { opacity: 1; transform: translateY(0); }"
-    elif anim_type == "Zoom In":
-        anim_css = ".reveal { opacity: 0; transform: scale(0.95); transition: all 0.8s cubic-bezier(0.175, 0.885, 0.32, 1.275); } .reveal.active { opacity: 1; transform: scale(1); }"
-    
-    hero_css = """
-    .hero { position: relative; min-height: 90vh; overflow: hidden; display: flex; align-items: center; justify-content: center; text-align: center; color: white; padding-top: 80px; background-color: var(--p); }
-    .carousel-slide { position: absolute; top: 0; left: 0; width: 100%; height: 100%; background-size: cover; background-position: center; opacity: 0; transition: opacity 1.5s ease-in-out; z-index: 0; }
-    .carousel-slide.active { opacity: 1; }
-    .hero-overlay { background: rgba(0,0,0,0.5); position: absolute; top: 0; left: 0; width: 100%; height: 100%; z-index: 1; }
-    .hero-content { z-index: 2; position: relative; animation: slideUp 1s ease-out; width: 100%; padding: 0 20px; }
-    @keyframes slideUp { from { opacity:0; transform: translateY(30px); } to { opacity:1; transform: translateY(0); } }
-    """
-
-    # Added CSS for Shopping Cart Modal & SOCIAL SHARE
-    cart_css = """
-    #cart-float { position: fixed; bottom: 100px; right: 30px; background: var(--p); color: white; padding: 15px 20px; border-radius: 50px; box-shadow: 0 10px 20px rgba(0,0,0,0.2); cursor: pointer; z-index: 998; display: flex; align-items: center; gap: 10px; font-weight: bold; }
-    #cart-modal { display: none; position: fixed; top: 50%; left: 50%; transform: translate(-50%, -50%); background: var(--card); width: 90%; max-width: 500px; padding: 2rem; border-radius: 16px; box-shadow: 0 20px 50px rgba(0,0,0,0.3); z-index: 1001; border: 1px solid rgba(128,128,128,0.2); }
-    #cart-overlay { display: none; position: fixed; top: 0; left: 0; width: 100%; height: 100%; background: rgba(0,0,0,0.5); z-index: 1000; }
-    .cart-item { display: flex; justify-content: space-between; border-bottom: 1px solid #eee; padding: 10px 0; }
-    
-    /* SOCIAL SHARE STYLES */
-    .share-row { display: flex; gap: 10px; margin-top: 20px; flex-wrap: wrap; }
-    .share-label { font-weight: bold; margin-right: 5px; font-size: 0.9rem; align-self: center; }
-    .share-btn { width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; border-radius: 50%; color: white; transition: 0.3s; border: none; cursor: pointer; text-decoration: none; }
-    .share-btn:hover { transform: translateY(-3px); filter: brightness(1.1); }
-    .share-btn svg { width: 18px; height: 18px; fill: white; }
-    .bg-fb { background: #1877F2; }
-    .bg-x { background: #000000; }
-    .bg-li { background: #0A66C2; }
-    .bg-wa { background: #25D366; }
-    .bg-rd { background: #FF4500; }
-    """
-
-    return f"""
-    :root {{
-        --p: {p_color}; --s: {s_color}; --bg: {bg_color}; --txt: {text_color}; --card: {card_bg};
-        --radius: {border_rad}; --nav: {glass_nav};
-        --h-font: '{h_font}', sans-serif; --b-font: '{b_font}', sans-serif;
-    }}
-    * {{ box-sizing: border-box; }}
-    html {{ scroll-behavior: smooth; font-size: 16px; }}
-    body {{ background-color: var(--bg); color: var(--txt); font-family: var(--b-font); margin: 0; line-height: 1.6; overflow-x: hidden; }}
-    
-    p, h1, h2, h3, h4, h5, h6, span, li, div {{ color: inherit; }}
-    .legal-text {{ color: var(--txt) !important; }}
-    
-    h1, h2, h3, h4 {{ font-family: var(--h-font); color: var(--p); line-height: 1.1; margin-bottom: 1rem; }}
-    strong {{ color: var(--p); font-weight: 800; }}
-    
-    /* MOBILE OPTIMIZED TYPOGRAPHY */
-    h1 {{ font-size: clamp(2.5rem, 5vw, 4.5rem); }}
-    h2 {{ font-size: clamp(2rem, 4vw, 3rem); }}
-    
-    /* FORCE HERO TEXT WHITE */
-    .hero h1 {{ color: #ffffff !important; text-shadow: 0 4px 20px rgba(0,0,0,0.4); }}
-    .hero p {{ color: rgba(255,255,255,0.95) !important; font-size: clamp(1.1rem, 2vw, 1.3rem); max-width: 700px; margin: 0 auto 2rem auto; text-shadow: 0 2px 10px rgba(0,0,0,0.4); }}
-    
-    input, textarea, select {{ width: 100%; padding: 0.8rem; margin-bottom: 1rem; border: 1px solid #ccc; border-radius: 6px; font-family: inherit; }}
-    label {{ color: var(--txt); font-weight: bold; margin-bottom: 0.5rem; display: block; }}
-
-    .container {{ max-width: 1280px; margin: 0 auto; padding: 0 20px; }}
-    .btn {{ display: inline-block; padding: 1rem 2.5rem; border-radius: var(--radius); font-weight: 700; text-decoration: none; transition: 0.3s; text-transform: uppercase; letter-spacing: 0.5px; cursor: pointer; border: none; text-align: center; }}
-    .btn-primary {{ background: var(--p); color: white !important; }}
-    .btn-accent {{ background: var(--s); color: white !important; box-shadow: 0 10px 25px -5px var(--s); }}
-    .btn:hover {{ transform: translateY(-3px); filter: brightness(1.15); }}
-    
-    /* Nav */
-    nav {{ position: fixed; top: 0; width: 100%; z-index: 1000; background: var(--nav); backdrop-filter: blur(12px); border-bottom: 1px solid rgba(100,100,100,0.1); padding: 1rem 0; }}
-    .nav-flex {{ display: flex; justify-content: space-between; align-items: center; }}
-    .nav-links {{ display: flex; align-items: center; }}
-    .nav-links a {{ margin-left: 2rem; text-decoration: none; font-weight: 600; color: var(--txt); font-size: 0.9rem; opacity: 0.8; transition:0.2s; }}
-    .nav-links a:hover {{ opacity: 1; color: var(--s); }}
-    .mobile-menu {{ display: none; font-size: 1.5rem; cursor: pointer; }}
-    
-    {hero_css}
-    {cart_css}
-    
-    section {{ padding: clamp(3rem, 8vw, 5rem) 0; }}
-    .section-head {{ text-align: center; margin-bottom: clamp(2rem, 5vw, 4rem); }}
-    
-    /* GRIDS */
-    .grid-3 {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 2rem; }}
-    .about-grid {{ display: grid; grid-template-columns: 1fr 1fr; gap: 4rem; align-items: center; }}
-    .contact-grid {{ display: grid; grid-template-columns: 1fr 2fr; gap: 3rem; }}
-    .detail-view {{ display: grid; grid-template-columns: 1fr 1fr; gap: 4rem; align-items: start; }}
-    
-    .card {{ background: var(--card); padding: 2rem; border-radius: var(--radius); border: 1px solid rgba(100,100,100,0.1); transition: 0.3s; height: 100%; display: flex; flex-direction: column; }}
-    .card:hover {{ transform: translateY(-5px); box-shadow: 0 20px 40px -10px rgba(0,0,0,0.1); border-color: var(--s); }}
-    
-    /* DARK MODE FIX: FORCE CARD TEXT TO USE TEXT COLOR */
-    .card h1, .card h2, .card h3, .card h4, .card h5, .card h6, .card a {{ color: var(--txt) !important; text-decoration: none; }}
-    .card p {{ color: var(--txt); opacity: 0.9; }}
-    
-    .prod-img {{ width: 100%; height: 250px; object-fit: cover; border-radius: calc(var(--radius) - 4px); margin-bottom: 1.5rem; background: #f1f5f9; }}
-    
-    /* PRICING & FAQ */
-    .pricing-wrapper {{ overflow-x: auto; margin: 2rem 0; -webkit-overflow-scrolling: touch; padding-bottom: 1rem; }}
-    .pricing-table {{ width: 100%; border-collapse: collapse; min-width: 600px; }}
-    .pricing-table th {{ background: var(--p); color: white; padding: 1.5rem; text-align: left; font-size: 1.1rem; }}
-    .pricing-table td {{ padding: 1.5rem; border-bottom: 1px solid rgba(100,100,100,0.1); background: var(--card); color: var(--txt); }}
-    .pricing-table tr:last-child td {{ font-weight: bold; font-size: 1.2rem; background: rgba(var(--s), 0.1); border-bottom: none; }}
-
-    details {{ background: var(--card); border: 1px solid rgba(100,100,100,0.1); border-radius: 8px; margin-bottom: 1rem; padding: 1rem; cursor: pointer; color: var(--txt); }}
-    details summary {{ font-weight: bold; font-size: 1.1rem; color: var(--txt); }}
-    details p {{ margin-top: 1rem; margin-bottom: 0; opacity: 0.9; color: var(--txt); }}
-
-    /* Footer & Social */
-    footer {{ background: var(--p); color: white; padding: 4rem 0; margin-top: auto; }}
-    .footer-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 3rem; }}
-    footer a {{ color: rgba(255,255,255,0.8) !important; text-decoration: none; display: block; margin-bottom: 0.5rem; transition: 0.3s; }}
-    footer a:hover {{ color: #ffffff !important; text-decoration: underline; }}
-    .social-icon {{ width: 24px; height: 24px; fill: rgba(255,255,255,0.7); transition: 0.3s; }}
-    .social-icon:hover {{ fill: #ffffff; transform: scale(1.1); }}
-
-    /* BLOG & SHARE */
-    .blog-badge {{ background: var(--s); color: white; padding: 0.3rem 0.8rem; border-radius: 50px; font-size: 0.75rem; text-transform: uppercase; font-weight: bold; width: fit-content; margin-bottom: 1rem; display:inline-block; }}
-    
-    {anim_css}
-    
-    /* MOBILE OPTIMIZATIONS (FIXED) */
-    @media (max-width: 768px) {{
-        .nav-links {{ 
-            position: fixed; top: 70px; left: -100%; width: 100%; height: calc(100vh - 70px); 
-            background: var(--bg); flex-direction: column; padding: 2rem; transition: 0.3s; 
-            align-items: flex-start; justify-content: flex-start; border-top: 1px solid rgba(0,0,0,0.1); overflow-y: auto; gap: 1.5rem;
-        }}
-        .nav-links.active {{ left: 0; }}
-        .nav-links a {{ margin-left: 0; font-size: 1.2rem; }}
-        .mobile-menu {{ display: block; }}
-        
-        .hero {{ min-height: 60vh; padding-top: 100px; }}
-        .about-grid, .contact-grid, .detail-view {{ grid-template-columns: 1fr !important; gap: 2rem; }}
-        
-        /* Mobile Image Sizing Fix */
-        .prod-img, .about-grid img {{ height: auto !important; aspect-ratio: 16/9; }}
-        
-        /* Padding Fixes for Mobile */
-        .container {{ padding: 0 1.5rem; }}
-        
-        .btn {{ width: 100%; margin-bottom: 0.5rem; }}
-        .hero-content .btn {{ width: auto; }}
-        
-        /* Cart Position Adjustment */
-        #cart-float {{ bottom: 110px; right: 20px; }}
-    }}
-    """
-
-def gen_nav():
-    logo_display = f'<img src="{logo_url}" height="40" alt="{biz_name} Logo">' if logo_url else f'<span style="font-weight:900; font-size:1.5rem; color:var(--p)">{biz_name}</span>'
-    blog_link = '<a href="blog.html" onclick="toggleMenu()">Blog</a>' if show_blog else ''
-    book_link = '<a href="booking.html" onclick="toggleMenu()">Book Now</a>' if show_booking else ''
-    
-    # NEW: Lang Switch Button
-    lang_btn = f'<a href="#" onclick="toggleLang()" title="Switch Language">🌐 ES</a>' if lang_sheet else ''
-    
-    return f"""
-    <nav><div class="container nav-flex">
-        <a href="index.html" style="text-decoration:none">{logo_display}</a>
-        <div class="mobile-menu" onclick="document.querySelector('.nav-links').classList.toggle('active')">☰</div>
-        <div class="nav-links">
-            <a href="index.html" onclick="toggleMenu()">Home</a>
-            {'<a href="index.html#features" onclick="toggleMenu()">Features</a>' if show_features else ''}
-            {'<a href="index.html#pricing" onclick="toggleMenu()">Savings</a>' if show_pricing else ''}
-            {'<a href="index.html#inventory" onclick="toggleMenu()">Store</a>' if show_inventory else ''}
-            {blog_link}
-            {book_link}
-            {lang_btn}
-            <a href="contact.html" onclick="toggleMenu()">Contact</a>
-            <a href="tel:{biz_phone}" class="btn-accent" style="padding:0.6rem 1.5rem; margin-left:1.5rem; margin-bottom:0; border-radius:50px; color:white !important; width:auto; text-align:center; display:inline-block;">Call Now</a>
-        </div>
-    </div></nav>
-    <script>function toggleMenu() {{ document.querySelector('.nav-links').classList.remove('active'); }}</script>
-    """
-
-def gen_hero():
-    return f"""
-    <section class="hero">
-        <div class="hero-overlay"></div>
-        <div class="carousel-slide active" style="background-image: url('{hero_img_1}')"></div>
-        <div class="carousel-slide" style="background-image: url('{hero_img_2}')"></div>
-        <div class="carousel-slide" style="background-image: url('{hero_img_3}')"></div>
-        
-        <div class="container hero-content">
-            <h1>{hero_h}</h1>
-            <p>{hero_sub}</p>
-            <div style="display:flex; gap:1rem; justify-content:center; flex-wrap:wrap;">
-                <a href="#inventory" class="btn btn-accent">Explore Now</a>
-                <a href="contact.html" class="btn" style="background:rgba(255,255,255,0.2); backdrop-filter:blur(10px); color:white;">Contact Us</a>
-            </div>
-        </div>
-    </section>
-    <script>
-        let slides = document.querySelectorAll('.carousel-slide');
-        let currentSlide = 0;
-        setInterval(() => {{
-            slides[currentSlide].classList.remove('active');
-            currentSlide = (currentSlide + 1) % slides.length;
-            slides[currentSlide].classList.add('active');
-        }}, 4000);
-    </script>
-    """
-
-def get_simple_icon(name):
-    # (Preserved icon logic)
-    name = name.lower().strip()
-    if "code" in name: return '<svg viewBox="0 0 24 24" width="32" height="32" fill="currentColor"><path d="M9.4 16.6L4.8 12l4.6-4.6L8 6l-6 6 6 6 1.4-1.4zm5.2 0l4.6-4.6-4.6-4.6L16 6l6 6-6 6-1.4-1.4z"/></svg>'
-    if "shield" in name: return '<svg viewBox="0 0 24 24" width="32" height="32" fill="currentColor"><path d="M12 1L3 5v6c0 5.55 3.84 10.74 9 12 5.16-1.26 9-6.45 9-12V5l-9-4zm0 10.99h7c-.53 4.12-3.28 7.79-7 8.94V12H5V6.3l7-3.11v8.8z"/></svg>'
-    if "bolt" in name: return '<svg viewBox="0 0 24 24" width="32" height="32" fill="currentColor"><path d="M11 21h-1l1-7H7.5c-.58 0-.57-.32-.38-.66.19-.34.05-.08.07-.12C8.48 10.94 10.42 7.54 13 3h1l-1 7h3.5c.49 0 .56.33.47.51l-.07.15C12.96 17.55 11 21 11 21z"/></svg>'
-    if "star" in name: return '<svg viewBox="0 0 24 24" width="32" height="32" fill="currentColor"><path d="M12 17.27L18.18 21l-1.64-7.03L22 9.24l-7.19-.61L12 2 9.19 8.63 2 9.24l5.46 4.73L5.82 21z"/></svg>'
-    if "heart" in name: return '<svg viewBox="0 0 24 24" width="32" height="32" fill="currentColor"><path d="M12 21.35l-1.45-1.32C5.4 15.36 2 12.28 2 8.5 2 5.42 4.42 3 7.5 3c1.74 0 3.41.81 4.5 2.09C13.09 3.81 14.76 3 16.5 3 19.58 3 22 5.42 22 8.5c0 3.78-3.4 6.86-8.55 11.54L12 21.35z"/></svg>'
-    if "wallet" in name: return '<svg viewBox="0 0 24 24" width="32" height="32" fill="currentColor"><path d="M21 18v1c0 1.1-.9 2-2 2H5c-1.11 0-2-.9-2-2V5c0-1.1.89-2 2-2h14c1.1 0 2 .9 2 2v1h-9c-1.11 0-2 .9-2 2v8c0 1.1.89 2 2 2h9zm-9-2h10V8H12v8zm4-2.5c-.83 0-1.5-.67-1.5-1.5s.67-1.5 1.5-1.5 1.5.67 1.5 1.5-.67 1.5-1.5 1.5z"/></svg>'
-    if "table" in name: return '<svg viewBox="0 0 24 24" width="32" height="32" fill="currentColor"><path d="M19 3H5c-1.1 0-2 .9-2 2v14c0 1.1.9 2 2 2h14c1.1 0 2-.9 2-2V5c0-1.1-.9-2-2-2zM5 19V5h14v14H5zm2-2h10v-2H7v2zm0-4h10v-2H7v2zm0-4h10V7H7v2z"/></svg>'
-    return '<svg viewBox="0 0 24 24" width="32" height="32" fill="currentColor"><path d="M12 2C6.48 2 2 6.48 2 12s4.48 10 10 10 10-4.48 10-10S17.52 2 12 2zm-2 15l-5-5 1.41-1.41L10 14.17l7.59-7.59L19 8l-9 9z"/></svg>'
-
-def gen_features():
-    cards = ""
-    lines = [x for x in feat_data_input.split('\n') if x.strip()]
-    for line in lines:
-        if "|" in line:
-            parts = line.split('|')
-            if len(parts) >= 3:
-                icon_code = get_simple_icon(parts[0])
-                title = parts[1].strip()
-                desc = parts[2].strip()
-                cards += f"""<div class="card reveal"><div style="color:var(--s); margin-bottom:1rem;">{icon_code}</div><h3>{title}</h3><div>{format_text(desc)}</div></div>"""
-    return f"""<section id="features"><div class="container"><div class="section-head reveal"><h2>{f_title}</h2></div><div class="grid-3">{cards}</div></div></section>"""
-
-def gen_stats():
-    return f"""
-    <div style="background:var(--p); color:white; padding:3rem 0; text-align:center;">
-        <div class="container grid-3">
-            <div class="reveal"><h3 style="color:#ffffff; margin:0; font-size:3rem;">{stat_1}</h3><p style="color:rgba(255,255,255,0.8); margin:0;">{label_1}</p></div>
-            <div class="reveal"><h3 style="color:#ffffff; margin:0; font-size:3rem;">{stat_2}</h3><p style="color:rgba(255,255,255,0.8); margin:0;">{label_2}</p></div>
-            <div class="reveal"><h3 style="color:#ffffff; margin:0; font-size:3rem;">{stat_3}</h3><p style="color:rgba(255,255,255,0.8); margin:0;">{label_3}</p></div>
-        </div>
-    </div>
-    """
-
-def gen_pricing_table():
-    if not show_pricing: return ""
-    return f"""
-    <section id="pricing"><div class="container">
-        <div class="section-head reveal"><h2>The Cost of Ownership</h2><p>See how the "Monthly Trap" adds up over 5 years.</p></div>
-        <div class="pricing-wrapper reveal">
-            <table class="pricing-table">
-                <thead>
-                    <tr><th style="width:40%">Expense Category</th><th style="background:var(--s); font-size:1.2rem;">Titan Engine (Us)</th><th>{wix_name}</th></tr>
-                </thead>
-                <tbody>
-                    <tr><td>Initial Setup Fee</td><td><strong>{titan_price}</strong></td><td>$0</td></tr>
-                    <tr><td>Annual Costs</td><td><strong>{titan_mo}</strong></td><td>{wix_mo}</td></tr>
-                    <tr><td><strong>Your 5-Year Savings</strong></td><td style="color:var(--s); font-size:1.3rem;">You Save {save_val}</td><td>$0</td></tr>
-                </tbody>
-            </table>
-        </div>
-    </div></section>
-    """
-
-def gen_csv_parser():
-    # Preserved CSV + Markdown Parser
-    return """
-    <script>
-    function parseCSVLine(str) {
-        const res = []; let cur = ''; let inQuote = false;
-        for (let i = 0; i < str.length; i++) {
-            const c = str[i];
-            if (c === '"') { if (inQuote && str[i+1] === '"') { cur += '"'; i++; } else { inQuote = !inQuote; } }
-            else if (c === ',' && !inQuote) { res.push(cur.trim()); cur = ''; } else { cur += c; }
-        }
-        res.push(cur.trim()); return res;
-    }
-    function parseMarkdown(text) {
-        if (!text) return '';
-        let html = text.replace(/\\r\\n/g, '\\n').replace(/\\n/g, '<br>').replace(/\\*\\*(.*?)\\*\\*/g, '<strong>$1</strong>');
-        return html;
-    }
-    </script>
-    """
-
-# --- NEW: SHOPPING CART & PAYMENT JS ---
-def gen_cart_system():
-    return f"""
-    <div id="cart-float" onclick="toggleCart()" style="display:none;">
-        <span>🛒</span> <span id="cart-count">0</span>
-    </div>
-    <div id="cart-overlay" onclick="toggleCart()"></div>
-    <div id="cart-modal">
-        <h3>Your Cart</h3>
-        <div id="cart-items" style="max-height:300px; overflow-y:auto; margin:1rem 0;"></div>
-        <div style="font-weight:bold; font-size:1.2rem; margin-bottom:1rem; text-align:right;">Total: <span id="cart-total">0.00</span></div>
-        <button onclick="checkoutWhatsApp()" class="btn btn-accent" style="width:100%">Checkout via WhatsApp</button>
-    </div>
-    
-    <script>
-    let cart = JSON.parse(localStorage.getItem('titanCart')) || [];
-    const waNumber = "{wa_num}";
-    const payLinks = "UPI: {upi_id} | PayPal: {paypal_link}";
-
-    function renderCart() {{
-        const box = document.getElementById('cart-items');
-        if(!box) return;
-        box.innerHTML = '';
-        let total = 0;
-        cart.forEach((item, i) => {{
-            total += parseFloat(item.price.replace(/[^0-9.]/g, '')) || 0;
-            box.innerHTML += `<div class="cart-item"><span>${{item.name}}</span><span>${{item.price}} <span onclick="remItem(${{i}})" style="color:red;cursor:pointer;">x</span></span></div>`;
-        }});
-        document.getElementById('cart-count').innerText = cart.length;
-        document.getElementById('cart-total').innerText = total.toFixed(2);
-        document.getElementById('cart-float').style.display = cart.length > 0 ? 'flex' : 'none';
-        localStorage.setItem('titanCart', JSON.stringify(cart));
-    }}
-    
-    function addToCart(name, price) {{
-        cart.push({{name, price}});
-        renderCart();
-        alert(name + " added!");
-    }}
-    function remItem(i) {{ cart.splice(i,1); renderCart(); }}
-    function toggleCart() {{ 
-        const m = document.getElementById('cart-modal'); 
-        m.style.display = m.style.display === 'block' ? 'none' : 'block'; 
-        document.getElementById('cart-overlay').style.display = m.style.display;
-    }}
-    function checkoutWhatsApp() {{
-        let msg = "New Order:%0A";
-        let total = 0;
-        cart.forEach(i => {{ msg += `- ${{i.name}} (${{i.price}})%0A`; total += parseFloat(i.price.replace(/[^0-9.]/g,'')) || 0; }});
-        msg += `%0ATotal: ${{total.toFixed(2)}}%0A%0A${{payLinks}}`;
-        window.open(`https://wa.me/${{wa_num}}?text=${{msg}}`, '_blank');
-        cart = []; renderCart(); toggleCart();
-    }}
-    window.addEventListener('load', renderCart);
-    </script>
-    """
-
-# --- NEW: MULTI-LANGUAGE SCRIPT ---
-def gen_lang_script():
-    if not lang_sheet: return ""
-    return f"""
-    <script>
-    async function toggleLang() {{
-        try {{
-            const res = await fetch('{lang_sheet}');
-            const txt = await res.text();
-            const lines = txt.split(/\\r\\n|\\n/);
-            // Assuming col 1 = ID, col 2 = Text
-            for(let i=1; i<lines.length; i++) {{
-                const row = parseCSVLine(lines[i]);
-                if(row.length > 1) {{
-                    const el = document.getElementById(row[0]);
-                    if(el) el.innerText = row[1];
-                }}
-            }}
-            alert("Language Switched!");
-        }} catch(e) {{ console.log("Lang Error", e); }}
-    }}
-    </script>
-    """
-
-def gen_inventory_js(is_demo=False):
-    # UPDATED: Removed hardcoded color:var(--p) to fix dark mode
-    demo_flag = "const isDemo = true;" if is_demo else "const isDemo = false;"
-    return f"""
-    {gen_csv_parser()}
-    <script>
-    {demo_flag}
-    async function loadInv() {{
-        try {{
-            const res = await fetch('{sheet_url}');
-            const txt = await res.text();
-            const lines = txt.split(/\\r\\n|\\n/);
-            const box = document.getElementById('inv-grid');
-            if(!box) return;
-            box.innerHTML = '';
-            for(let i=1; i<lines.length; i++) {{
-                if(!lines[i].trim()) continue;
-                const c = parseCSVLine(lines[i]);
-                let img = c[3] && c[3].length > 5 ? c[3] : '{custom_feat}';
-                let stripe = (c.length > 4 && c[4].includes('http')) ? c[4] : '';
-                
-                if(c.length > 1) {{
-                    let btn = stripe 
-                        ? `<a href="${{stripe}}" class="btn btn-primary" style="padding:0.6rem; width:100%;">Buy Now</a>`
-                        : `<button onclick="addToCart('${{c[0]}}', '${{c[1]}}')" class="btn" style="padding:0.6rem; width:100%;">Add to Cart</button>`;
-                        
-                    box.innerHTML += `
-                    <div class="card reveal">
-                        <img src="${{img}}" class="prod-img" loading="lazy">
-                        <div>
-                            <h3>${{c[0]}}</h3>
-                            <p style="font-weight:bold; color:var(--s);">${{c[1]}}</p>
-                            <p style="font-size:0.9rem; opacity:0.8;">${{c[2]}}</p>
-                            ${{btn}}
-                        </div>
-                    </div>`;
-                }}
-            }}
-        }} catch(e) {{ console.log(e); }}
-    }}
-    if(document.getElementById('inv-grid')) window.addEventListener('load', loadInv);
-    </script>
-    """
-
-def gen_inventory():
-    if not show_inventory: return ""
-    return f"""
-    <section id="inventory" style="background:rgba(0,0,0,0.02)"><div class="container">
-        <div class="section-head reveal"><h2>Portfolio & Store</h2><p>Secure Checkout available.</p></div>
-        <div id="inv-grid" class="grid-3"><div style="text-align:center; padding:4rem;">Loading Store...</div></div>
-    </div></section>
-    {gen_inventory_js(is_demo=False)}
-    """
+    priv_txt = l1.text_area("Privacy Policy Text", DEFAULTS["priv_txt"], height=200)
+    term_txt = l2.text_area("Terms of Service Text", DEFAULTS["term_txt"], height=200)
 
-def gen_about_section():
-    formatted_about = format_text(about_short_in)
-    return f"""
-    <section id="about"><div class="container">
-        <div class="about-grid">
-            <div class="reveal">
-                <h2 style="font-size:2.5rem; margin-bottom:1.5rem;">{about_h_in}</h2>
-                <div style="font-size:1.1rem; opacity:0.9; margin-bottom:2rem; color:var(--txt);">{formatted_about}</div>
-                <a href="about.html" class="btn btn-primary" style="padding: 0.8rem 2rem; font-size:0.9rem;">Read Our Full Story</a>
-            </div>
-            <img src="{about_img}" class="reveal" loading="lazy" style="width:100%; border-radius:var(--radius); box-shadow:0 20px 50px -20px rgba(0,0,0,0.2); aspect-ratio:4/3; object-fit:cover;">
-        </div>
-    </div></section>
-    """
+editor.form_submit_button("✅ Apply Changes", type="primary")
 
-def gen_faq_section():
-    items = ""
-    for line in faq_data.split('\n'):
-        if "?" in line and not line.strip() == "":
-            parts = line.split('?', 1)
-            if len(parts) == 2: items += f"<details class='reveal'><summary>{parts[0].strip()}?</summary><p>{parts[1].replace('?', '').strip()}</p></details>"
-    return f"""<section id="faq"><div class="container" style="max-width:800px;"><div class="section-head reveal"><h2>Frequently Asked Questions</h2></div>{items}</div></section>"""
-
-def gen_footer():
-    # (Preserved Social Icons & Layout)
-    icons = ""
-    if fb_link: icons += f'<a href="{fb_link}" target="_blank"><svg class="social-icon" viewBox="0 0 24 24"><path d="M18 2h-3a5 5 0 0 0-5 5v3H7v4h3v8h4v-8h3l1-4h-4V7a1 1 0 0 1 1-1h3z"></path></svg></a>'
-    if ig_link: icons += f'<a href="{ig_link}" target="_blank" aria-label="Instagram"><svg class="social-icon" viewBox="0 0 24 24"><path d="M16.98 0a6.9 6.9 0 0 1 5.08 1.98A6.94 6.94 0 0 1 24 7.02v9.96c0 2.08-.68 3.87-1.98 5.13A7.14 7.14 0 0 1 16.94 24H7.06a7.06 7.06 0 0 1-5.03-1.89A6.96 6.96 0 0 1 0 16.94V7.02C0 2.8 2.8 0 7.02 0h9.96zM7.17 2.1c-1.4 0-2.6.48-3.46 1.33c-.85.85-1.33 2.06-1.33 3.46v10.3c0 1.3.47 2.5 1.33 3.36c.86.85 2.06 1.33 3.46 1.33h9.66c1.4 0 2.6-.48 3.46-1.33c.85-.85 1.33-2.06 1.33-3.46V6.89c0-1.4-.47-2.6-1.33-3.46c-.86-.85-2.06-1.33-3.46-1.33H7.17zm11.97 3.33c.77 0 1.4.63 1.4 1.4c0 .77-.63 1.4-1.4 1.4c-.77 0-1.4-.63-1.4-1.4c0-.77.63-1.4 1.4-1.4zM12 5.76c3.39 0 6.14 2.75 6.14 6.14c0 3.39-2.75 6.14-6.14 6.14c-3.39 0-6.14-2.75-6.14-6.14c0-3.39 2.75-6.14 6.14-6.14zm0 2.1c-2.2 0-3.99 1.79-3.99 4.04c0 2.25 1.79 4.04 3.99 4.04c2.2 0 3.99-1.79 3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04z"/></svg></a>'
-    if x_link: icons += f'<a href="{x_link}" target="_blank" aria-label="X (Twitter)"><svg class="social-icon" viewBox="0 0 24 24"><path d="M18.901 1.153h3.68l-8.04 9.19L24 22.846h-7.406l-5.8-7.584l-6.638 7.584H.474l8.6-9.83L0 1.154h7.594l5.243 6.932ZM17.61 20.644h2.039L6.486 3.24H4.298Z"></path></svg></a>'
-    if li_link: icons += f'<a href="{li_link}" target="_blank" aria-label="LinkedIn"><svg class="social-icon" viewBox="0 0 24 24"><path d="M16 8a6 6 0 0 1 6 6v7h-4v-7a2 2 0 0 0-2-2a2 2 0 0 0-2 2v7h-4v-7a6 6 0 0 1 6-6zM2 9h4v12H2zM4 2a2 2 0 1 1-2 2a2 2 0 0 1 2-2z"></path></svg></a>'
-    if yt_link: icons += f'<a href="{yt_link}" target="_blank" aria-label="YouTube"><svg class="social-icon" viewBox="0 0 24 24"><path d="M23.498 6.186a3.016 3.016 0 0 0-2.122-2.136C19.505 3.545 12 3.545 12 3.545s-7.505 0-9.377.505A3.017 3.017 0 0 0 .502 6.186C0 8.07 0 12 0 12s0 3.93.502 5.814a3.016 3.016 0 0 0 2.122 2.136c1.871.505 9.376.505 9.376.505s7.505 0 9.377-.505a3.015 3.015 0 0 0 2.122-2.136C24 15.93 24 12 24 12s0-3.93-.502-5.814zM9.545 15.568V8.432L15.818 12l-6.273 3.568z"/></svg></a>'
-
-    return f"""
-    <footer><div class="container">
-        <div class="footer-grid">
-            <div>
-                <h3 style="color:white; margin-bottom:1.5rem;">{biz_name}</h3>
-                <p style="opacity:0.8; font-size:0.9rem;">{biz_addr}</p>
-                <div style="margin-top:1.5rem; display:flex; gap:1.2rem;">{icons}</div>
-            </div>
-            <div>
-                <h4 style="color:white; font-size:0.9rem; text-transform:uppercase;">Links</h4>
-                <a href="index.html">Home</a><a href="blog.html">Blog</a><a href="booking.html">Book Now</a>
-            </div>
-            <div>
-                <h4 style="color:white; font-size:0.9rem; text-transform:uppercase;">Legal</h4>
-                <a href="privacy.html">Privacy</a><a href="terms.html">Terms</a>
-            </div>
-        </div>
-        <div style="border-top:1px solid rgba(255,255,255,0.1); margin-top:3rem; padding-top:2rem; text-align:center; opacity:0.4; font-size:0.8rem;">
-            &copy; 2026 {biz_name}. Powered by Titan Engine.
-        </div>
-    </div></footer>
-    """
-
-def gen_wa_widget():
-    if not wa_num: return ""
-    return f"""<a href="https://wa.me/{wa_num}" class="wa-float" target="_blank" style="position:fixed; bottom:30px; right:30px; background:#25d366; color:white; width:60px; height:60px; border-radius:50%; display:flex; align-items:center; justify-content:center; box-shadow:0 10px 30px rgba(37,211,102,0.4); z-index:9999;"><svg style="width:32px;height:32px" viewBox="0 0 24 24"><path fill="currentColor" d="M12.04 2c-5.46 0-9.91 4.45-9.91 9.91c0 1.75.46 3.45 1.32 4.95L2.05 22l5.25-1.38c1.45.79 3.08 1.21 4.74 1.21c5.46 0 9.91-4.45 9.91-9.91c0-2.65-1.03-5.14-2.9-7.01A9.816 9.816 0 0 0 12.04 2m.01 1.67c2.2 0 4.26.86 5.82 2.42a8.225 8.225 0 0 1 2.41 5.83c0 4.54-3.7 8.23-8.24 8.23c-1.48 0-2.93-.39-4.19-1.15l-.3-.17l-3.12.82l.83-3.04l-.2-.32a8.188 8.188 0 0 1-1.26-4.38c.01-4.54 3.7-8.24 8.25-8.24m-3.53 3.16c-.13 0-.35.05-.54.26c-.19.2-.72.7-.72 1.72s.73 2.01.83 2.14c.1.13 1.44 2.19 3.48 3.07c.49.21.87.33 1.16.43c.49.16.94.13 1.29.08c.4-.06 1.21-.5 1.38-.98c.17-.48.17-.89.12-.98c-.05-.09-.18-.13-.37-.23c-.19-.1-.1.13-.1.13s-1.13-.56-1.32-.66c-.19-.1-.32-.15-.45.05c-.13.2-.51.65-.62.78c-.11.13-.23.15-.42.05c-.19-.1-.8-.3-1.53-.94c-.57-.5-1.02-1.12-1.21-1.45c-.11-.19-.01-.29.09-.38c.09-.08.19-.23.29-.34c.1-.11.13-.19.19-.32c.06-.13.03-.24-.01-.34c-.05-.1-.45-1.08-.62-1.48c-.16-.4-.36-.34-.51-.35c-.11-.01-.25-.01-.4-.01Z"/></path></svg></a>"""
-
-def gen_scripts():
-    return """
-    <script>
-    window.addEventListener('scroll', () => {
-        var reveals = document.querySelectorAll('.reveal');
-        for (var i = 0; i < reveals.length; i++) {
-            var windowHeight = window.innerHeight;
-            var elementTop = reveals[i].getBoundingClientRect().top;
-            var elementVisible = 150;
-            if (elementTop < windowHeight - elementVisible) { reveals[i].classList.add('active'); }
-        }
-    });
-    window.dispatchEvent(new Event('scroll'));
-    </script>
-    """
-
-def build_page(title, content, extra_js=""):
-    css = get_theme_css()
-    meta_tags = f'<meta name="description" content="{seo_d}">'
-    if gsc_tag: meta_tags += f'\n<meta name="google-site-verification" content="{gsc_tag}">'
-    
-    # NEW: PWA Meta Tags
-    pwa_tags = f"""
-    <link rel="manifest" href="manifest.json">
-    <meta name="theme-color" content="{p_color}">
-    <link rel="apple-touch-icon" href="{pwa_icon}">
-    """
-    
-    # NEW: SW Registration
-    sw_script = """
-    <script>
-    if ('serviceWorker' in navigator) { navigator.serviceWorker.register('service-worker.js'); }
-    </script>
-    """
-    
-    return f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{title} | {biz_name}</title>
-        {meta_tags}
-        {pwa_tags}
-        {gen_schema()}
-        <link href="https://fonts.googleapis.com/css2?family={h_font.replace(' ', '+')}:wght@400;700;900&family={b_font.replace(' ', '+')}:wght@300;400;600&display=swap" rel="stylesheet">
-        <style>{css}</style>
-    </head>
-    <body>
-        {gen_nav()}
-        {content}
-        {gen_footer()}
-        {gen_wa_widget()}
-        {gen_cart_system()} 
-        {gen_scripts()}
-        {gen_lang_script()}
-        {sw_script}
-        {extra_js}
-    </body>
-    </html>
-    """
-
-# --- CONTENT GENERATORS (Blog, Product, Booking) ---
-
-def gen_booking_content():
-    return f"""
-    <section class="hero" style="min-height:30vh; background:var(--p);">
-        <div class="container hero-content"><h1>{booking_title}</h1><p>{booking_desc}</p></div>
-    </section>
-    <section>
-        <div class="container" style="text-align:center;">
-            <div style="background:white; border-radius:12px; overflow:hidden; box-shadow:0 10px 40px rgba(0,0,0,0.1); width:100%;">
-                {booking_embed}
-            </div>
-        </div>
-    </section>
-    """
-
-def gen_blog_index_html():
-    # UPDATED: Removed inline color style so CSS handles dark mode
-    return f"""
-    <section class="hero" style="min-height:40vh; background-image: linear-gradient(rgba(0,0,0,0.6), rgba(0,0,0,0.6)), url('{hero_img_1}'); background-size: cover;">
-        <div class="container"><h1>{blog_hero_title}</h1><p>{blog_hero_sub}</p></div>
-    </section>
-    <section><div class="container"><div id="blog-grid" class="grid-3">Loading...</div></div></section>
-    {gen_csv_parser()}
-    <script>
-    async function loadBlog() {{
-        try {{
-            const res = await fetch('{blog_sheet_url}');
-            const txt = await res.text();
-            const lines = txt.split(/\\r\\n|\\n/);
-            const box = document.getElementById('blog-grid');
-            box.innerHTML = '';
-            for(let i=1; i<lines.length; i++) {{
-                const r = parseCSVLine(lines[i]);
-                if(r.length > 4) {{
-                    box.innerHTML += `<div class="card reveal"><img src="${{r[5]}}" class="prod-img"><div><span class="blog-badge">${{r[3]}}</span><h3><a href="post.html?id=${{r[0]}}">${{r[1]}}</a></h3></div></div>`;
-                }}
-            }}
-        }} catch(e) {{}}
-    }}
-    loadBlog();
-    </script>
-    """
-
-# --- UPDATED PRODUCT PAGE WITH SOCIAL SHARE ---
-def gen_product_page_content(is_demo=False):
-    demo_flag = "const isDemo = true;" if is_demo else "const isDemo = false;"
-    return f"""
-    <section style="padding-top:150px;"><div class="container"><div id="product-detail">Loading...</div></div></section>
-    {gen_csv_parser()}
-    <script>
-    {demo_flag}
-    function shareWA(url, title) {{ window.open('https://wa.me/?text=' + encodeURIComponent(title + ' ' + url), '_blank'); }}
-    async function loadProduct() {{
-        const params = new URLSearchParams(window.location.search);
-        let targetName = params.get('item');
-        if(isDemo && !targetName) targetName = "Demo Item";
-        try {{
-            const res = await fetch('{sheet_url}');
-            const txt = await res.text();
-            const lines = txt.split(/\\r\\n|\\n/);
-            for(let i=1; i<lines.length; i++) {{
-                const clean = parseCSVLine(lines[i]);
-                if(isDemo) targetName = clean[0];
-                if(clean[0] === targetName) {{
-                    let img = clean[3] || '{custom_feat}';
-                    let stripe = (clean.length > 4 && clean[4].includes('http')) ? clean[4] : '';
-                    let btn = stripe ? `<a href="${{stripe}}" class="btn btn-primary">Buy Now</a>` : `<button onclick="addToCart('${{clean[0]}}', '${{clean[1]}}')" class="btn btn-primary">Add to Cart</button>`;
-                    
-                    const u = encodeURIComponent(window.location.href);
-                    const t = encodeURIComponent(clean[0]);
-                    
-                    document.getElementById('product-detail').innerHTML = `
-                        <div class="detail-view">
-                            <img src="${{img}}" style="width:100%; border-radius:12px;">
-                            <div>
-                                <h1 style="font-size:3rem; line-height:1.1;">${{clean[0]}}</h1>
-                                <p style="font-size:1.5rem; color:var(--s); font-weight:bold; margin-bottom:1.5rem;">${{clean[1]}}</p>
-                                <p>${{clean[2]}}</p>
-                                ${{btn}}
-                                
-                                <div style="margin-top:2rem; border-top:1px solid #eee; padding-top:1rem;">
-                                    <p style="font-size:0.9rem; font-weight:bold;">Share Product:</p>
-                                    <div class="share-row">
-                                        <a href="https://wa.me/?text=${{t}}%20${{u}}" target="_blank" class="share-btn bg-wa"><svg viewBox="0 0 24 24"><path d="M12.04 2c-5.46 0-9.91 4.45-9.91 9.91c0 1.75.46 3.45 1.32 4.95L2.05 22l5.25-1.38c1.45.79 3.08 1.21 4.74 1.21c5.46 0 9.91-4.45 9.91-9.91c0-2.65-1.03-5.14-2.9-7.01A9.816 9.816 0 0 0 12.04 2m.01 1.67c2.2 0 4.26.86 5.82 2.42a8.225 8.225 0 0 1 2.41 5.83c0 4.54-3.7 8.23-8.24 8.23c-1.48 0-2.93-.39-4.19-1.15l-.3-.17l-3.12.82l.83-3.04l-.2-.32a8.188 8.188 0 0 1-1.26-4.38c.01-4.54 3.7-8.24 8.25-8.24m-3.53 3.16c-.13 0-.35.05-.54.26c-.19.2-.72.7-.72 1.72s.73 2.01.83 2.14c.1.13 1.44 2.19 3.48 3.07c.49.21.87.33 1.16.43c.49.16.94.13 1.29.08c.4-.06 1.21-.5 1.38-.98c.17-.48.17-.89.12-.98c-.05-.09-.18-.13-.37-.23c-.19-.1-.1.13-.1.13s-1.13-.56-1.32-.66c-.19-.1-.32-.15-.45.05c-.13.2-.51.65-.62.78c-.11.13-.23.15-.42.05c-.19-.1-.8-.3-1.53-.94c-.57-.5-1.02-1.12-1.21-1.45c-.11-.19-.01-.29.09-.38c.09-.08.19-.23.29-.34c.1-.11.13-.19.19-.32c.06-.13.03-.24-.01-.34c-.05-.1-.45-1.08-.62-1.48c-.16-.4-.36-.34-.51-.35c-.11-.01-.25-.01-.4-.01Z"/></path></svg></a>
-                                        <a href="https://www.facebook.com/sharer/sharer.php?u=${{u}}" target="_blank" class="share-btn bg-fb"><svg viewBox="0 0 24 24"><path d="M18 2h-3a5 5 0 0 0-5 5v3H7v4h3v8h4v-8h3l1-4h-4V7a1 1 0 0 1 1-1h3z"></path></svg></a>
-                                        <a href="https://twitter.com/intent/tweet?url=${{u}}&text=${{t}}" target="_blank" class="share-btn bg-x"><svg viewBox="0 0 24 24"><path d="M18.901 1.153h3.68l-8.04 9.19L24 22.846h-7.406l-5.8-7.584l-6.638 7.584H.474l8.6-9.83L0 1.154h7.594l5.243 6.932ZM17.61 20.644h2.039L6.486 3.24H4.298Z"></path></svg></a>
-                                        <a href="https://www.linkedin.com/sharing/share-offsite/?url=${{u}}" target="_blank" class="share-btn bg-li"><svg viewBox="0 0 24 24"><path d="M16 8a6 6 0 0 1 6 6v7h-4v-7a2 2 0 0 0-2-2a2 2 0 0 0-2 2v7h-4v-7a6 6 0 0 1 6-6zM2 9h4v12H2zM4 2a2 2 0 1 1-2 2a2 2 0 0 1 2-2z"></path></svg></a>
-                                    </div>
-                                </div>
-                            </div>
-                        </div>
-                    `;
-                    break;
-                }}
-            }}
-        }} catch(e) {{}}
-    }}
-    loadProduct();
-    </script>
-    """
-
-# --- UPDATED BLOG POST WITH MOBILE PADDING FIX & SOCIAL SHARE ---
-def gen_blog_post_html():
-    return f"""
-    <div id="post-container" style="padding-top:70px;">Loading...</div>
-    {gen_csv_parser()}
-    <script>
-    async function loadPost() {{
-        const params = new URLSearchParams(window.location.search);
-        const slug = params.get('id');
-        try {{
-            const res = await fetch('{blog_sheet_url}');
-            const txt = await res.text();
-            const lines = txt.split(/\\r\\n|\\n/);
-            const container = document.getElementById('post-container');
-            for(let i=1; i<lines.length; i++) {{
-                const r = parseCSVLine(lines[i]);
-                if(r[0] === slug) {{
-                    const contentHtml = parseMarkdown(r[6]);
-                    const u = encodeURIComponent(window.location.href);
-                    const t = encodeURIComponent(r[1]);
-                    
-                    container.innerHTML = `
-                        <div style="background:var(--p); padding:clamp(3rem, 8vw, 6rem) 1rem; color:white; text-align:center;">
-                            <div class="container">
-                                <span class="blog-badge">${{r[3]}}</span>
-                                <h1 style="font-size:clamp(1.8rem, 5vw, 3.5rem); margin-top:1rem;">${{r[1]}}</h1>
-                            </div>
-                        </div>
-                        <div class="container" style="max-width:800px; padding:3rem 1.5rem;">
-                            <img src="${{r[5]}}" style="width:100%; border-radius:12px; margin-bottom:2rem;">
-                            <div style="line-height:1.8;">${{contentHtml}}</div>
-                            
-                            <div style="margin-top:3rem; border-top:1px solid #eee; padding-top:1.5rem;">
-                                <p style="font-weight:bold;">Share this article:</p>
-                                <div class="share-row">
-                                    <a href="https://wa.me/?text=${{t}}%20${{u}}" target="_blank" class="share-btn bg-wa"><svg viewBox="0 0 24 24"><path d="M12.04 2c-5.46 0-9.91 4.45-9.91 9.91c0 1.75.46 3.45 1.32 4.95L2.05 22l5.25-1.38c1.45.79 3.08 1.21 4.74 1.21c5.46 0 9.91-4.45 9.91-9.91c0-2.65-1.03-5.14-2.9-7.01A9.816 9.816 0 0 0 12.04 2m.01 1.67c2.2 0 4.26.86 5.82 2.42a8.225 8.225 0 0 1 2.41 5.83c0 4.54-3.7 8.23-8.24 8.23c-1.48 0-2.93-.39-4.19-1.15l-.3-.17l-3.12.82l.83-3.04l-.2-.32a8.188 8.188 0 0 1-1.26-4.38c.01-4.54 3.7-8.24 8.25-8.24m-3.53 3.16c-.13 0-.35.05-.54.26c-.19.2-.72.7-.72 1.72s.73 2.01.83 2.14c.1.13 1.44 2.19 3.48 3.07c.49.21.87.33 1.16.43c.49.16.94.13 1.29.08c.4-.06 1.21-.5 1.38-.98c.17-.48.17-.89.12-.98c-.05-.09-.18-.13-.37-.23c-.19-.1-.1.13-.1.13s-1.13-.56-1.32-.66c-.19-.1-.32-.15-.45.05c-.13.2-.51.65-.62.78c-.11.13-.23.15-.42.05c-.19-.1-.8-.3-1.53-.94c-.57-.5-1.02-1.12-1.21-1.45c-.11-.19-.01-.29.09-.38c.09-.08.19-.23.29-.34c.1-.11.13-.19.19-.32c.06-.13.03-.24-.01-.34c-.05-.1-.45-1.08-.62-1.48c-.16-.4-.36-.34-.51-.35c-.11-.01-.25-.01-.4-.01Z"/></path></svg></a>
-                                    <a href="https://www.facebook.com/sharer/sharer.php?u=${{u}}" target="_blank" class="share-btn bg-fb"><svg viewBox="0 0 24 24"><path d="M18 2h-3a5 5 0 0 0-5 5v3H7v4h3v8h4v-8h3l1-4h-4V7a1 1 0 0 1 1-1h3z"></path></svg></a>
-                                    <a href="https://twitter.com/intent/tweet?url=${{u}}&text=${{t}}" target="_blank" class="share-btn bg-x"><svg viewBox="0 0 24 24"><path d="M18.901 1.153h3.68l-8.04 9.19L24 22.846h-7.406l-5.8-7.584l-6.638 7.584H.474l8.6-9.83L0 1.154h7.594l5.243 6.932ZM17.61 20.644h2.039L6.486 3.24H4.298Z"></path></svg></a>
-                                    <a href="https://www.linkedin.com/sharing/share-offsite/?url=${{u}}" target="_blank" class="share-btn bg-li"><svg viewBox="0 0 24 24"><path d="M16 8a6 6 0 0 1 6 6v7h-4v-7a2 2 0 0 0-2-2a2 2 0 0 0-2 2v7h-4v-7a6 6 0 0 1 6-6zM2 9h4v12H2zM4 2a2 2 0 1 1-2 2a2 2 0 0 1 2-2z"></path></svg></a>
-                                    <a href="https://reddit.com/submit?url=${{u}}&title=${{t}}" target="_blank" class="share-btn bg-rd"><svg viewBox="0 0 24 24"><path d="M12 0A12 12 0 0 0 0 12a12 12 0 0 0 12 12 12 12 0 0 0 12-12A12 12 0 0 0 12 0zm5.01 4.744c.688 0 1.25.561 1.25 1.249a1.25 1.25 0 0 1-2.498.056l-2.597-.547-.8 3.747c1.824.07 3.48.632 4.674 1.488.308-.309.73-.491 1.207-.491.968 0 1.754.786 1.754 1.754 0 .716-.435 1.333-1.01 1.614a3.111 3.111 0 0 1 .042.52c0 2.694-3.13 4.87-7.004 4.87-3.874 0-7.004-2.176-7.004-4.87 0-.183.015-.366.043-.534A1.748 1.748 0 0 1 4.028 12c0-.968.786-1.754 1.754-1.754.463 0 .898.196 1.207.49 1.207-.883 2.878-1.43 4.744-1.487l.885-4.182a.342.342 0 0 1 .14-.197.35.35 0 0 1 .238-.042l2.906.617a1.214 1.214 0 0 1 1.108-.701zM9.25 12C8.561 12 8 12.562 8 13.25c0 .687.561 1.248 1.25 1.248.687 0 1.248-.561 1.248-1.249 0-.688-.561-1.249-1.249-1.249zm5.5 0c-.687 0-1.248.561-1.248 1.25 0 .687.561 1.248 1.249 1.248.688 0 1.249-.561 1.249-1.249 0-.687-.562-1.249-1.25-1.249zm-5.466 3.99a.327.327 0 0 0-.231.094.33.33 0 0 0 0 .463c.842.842 2.484.913 2.961.913.477 0 2.105-.056 2.961-.913a.361.361 0 0 0 .029-.463.33.33 0 0 0-.464 0c-.547.533-1.684.73-2.512.73-.828 0-1.979-.196-2.512-.73a.326.326 0 0 0-.232-.095z"/></path></svg></a>
-                                </div>
-                            </div>
-                            <a href="blog.html" class="btn btn-primary" style="margin-top:2rem;">&larr; Back to Blog</a>
-                        </div>
-                    `;
-                    break;
-                }}
-            }}
-        }} catch(e) {{}}
-    }}
-    loadPost();
-    </script>
-    """
-
-def gen_inner_header(title):
-    return f"""<section class="hero" style="min-height: 40vh; background:var(--p);"><div class="container"><h1>{title}</h1></div></section>"""
-
-# --- 6. PAGE ASSEMBLY ---
-home_content = ""
-if show_hero: home_content += gen_hero()
-if show_stats: home_content += gen_stats()
-if show_features: home_content += gen_features()
-if show_pricing: home_content += gen_pricing_table()
-if show_inventory: home_content += gen_inventory()
-if show_gallery: home_content += gen_about_section()
-if show_testimonials: 
-    t_cards = "".join([f'<div class="card reveal" style="text-align:center;"><i>"{x.split("|")[1]}"</i><br><b>- {x.split("|")[0]}</b></div>' for x in testi_data.split('\n') if "|" in x])
-    home_content += f'<section style="background:#f8fafc"><div class="container"><div class="section-head reveal"><h2>Client Stories</h2></div><div class="grid-3">{t_cards}</div></div></section>'
-if show_faq: home_content += gen_faq_section()
-if show_cta: home_content += f'<section style="background:var(--s); color:white; text-align:center;"><div class="container reveal"><h2>Start Owning Your Future</h2><p style="margin-bottom:2rem;">Stop paying rent.</p><a href="contact.html" class="btn" style="background:white; color:var(--s);">Get Started</a></div></section>'
-
-# --- 7. DEPLOYMENT & RESTORED PREVIEW ---
-st.divider()
-st.subheader("🚀 Launchpad")
-
-# RESTORED RADIO BUTTONS FOR PREVIEW
-preview_mode = st.radio(
-    "Preview Page:", 
-    ["Home", "About", "Contact", "Blog Index", "Blog Post (Demo)", "Privacy", "Terms", "Product Detail (Demo)", "Booking Page"], 
-    horizontal=True
-)
+# --- 5. COMPILER ENGINE ---
+# All generators live in titan_compiler.py; the editor only snapshots its widgets into a site config.
+site_cfg = make_config({
+    "theme_mode": theme_mode, "p_color": p_color, "s_color": s_color, "h_font": h_font, "b_font": b_font,
+    "border_rad": border_rad, "anim_type": anim_type, "asset_mode": asset_mode, "minify": minify, "critical_css": critical_css, "sheet_cache_ttl": sheet_cache_ttl,
+    "image_dir": image_dir, "image_formats": image_formats, "font_dir": font_dir,
+    "show_hero": show_hero, "show_stats": show_stats, "show_features": show_features, "show_pricing": show_pricing,
+    "show_inventory": show_inventory, "show_blog": show_blog, "show_gallery": show_gallery,
+    "show_testimonials": show_testimonials, "show_faq": show_faq, "show_cta": show_cta, "show_booking": show_booking, "show_search": show_search,
+    "seo_area": seo_area, "seo_kw": seo_kw, "gsc_tag": gsc_tag, "ga_tag": ga_tag, "og_image": og_image,
+    "biz_name": biz_name, "biz_tagline": biz_tagline, "biz_phone": biz_phone, "biz_email": biz_email,
+    "prod_url": prod_url, "biz_addr": biz_addr, "map_iframe": map_iframe, "seo_d": seo_d, "logo_url": logo_url,
+    "pwa_short": pwa_short, "pwa_desc": pwa_desc, "pwa_icon": pwa_icon, "lang_sheet": lang_sheet,
+    "fb_link": fb_link, "ig_link": ig_link, "x_link": x_link, "li_link": li_link, "yt_link": yt_link, "wa_num": wa_num,
+    "hero_h": hero_h, "hero_sub": hero_sub, "hero_img_1": hero_img_1, "hero_img_2": hero_img_2, "hero_img_3": hero_img_3,
+    "stat_1": stat_1, "label_1": label_1, "stat_2": stat_2, "label_2": label_2, "stat_3": stat_3, "label_3": label_3,
+    "f_title": f_title, "feat_data": feat_data_input, "about_h": about_h_in, "about_img": about_img,
+    "about_short": about_short_in, "about_long": about_long,
+    "titan_price": titan_price, "titan_mo": titan_mo, "wix_name": wix_name, "wix_mo": wix_mo, "save_val": save_val,
+    "sheet_url": sheet_url, "custom_feat": custom_feat, "paypal_link": paypal_link, "upi_id": upi_id,
+    "prerender_inventory": prerender_inventory, "inv_page_size": inv_page_size,
+    "booking_embed": booking_embed, "booking_title": booking_title, "booking_desc": booking_desc,
+    "blog_sheet_url": blog_sheet_url, "blog_hero_title": blog_hero_title, "blog_hero_sub": blog_hero_sub,
+    "prerender_blog": prerender_blog, "blog_per_page": blog_per_page,
+    "testi_data": testi_data, "faq_data": faq_data, "priv_txt": priv_txt, "term_txt": term_txt,
+})
+
+# --- 6. DEPLOYMENT & RESTORED PREVIEW ---
+PREVIEW_PAGES = {
+    "Home": lambda c: build_page(c, "Home", gen_home_content(c)),
+    "About": lambda c: build_page(c, "About", gen_text_page("About", c["about_long"])),
+    "Contact": lambda c: build_page(c, "Contact", gen_contact_content(c)),
+    "Blog Index": lambda c: build_page(c, "Blog", gen_blog_index_html(c)),
+    "Blog Post (Demo)": lambda c: build_page(c, "Article", gen_blog_post_html(c)),
+    "Privacy": lambda c: build_page(c, "Privacy", gen_text_page("Privacy", c["priv_txt"])),
+    "Terms": lambda c: build_page(c, "Terms", gen_text_page("Terms", c["term_txt"])),
+    "Product Detail (Demo)": lambda c: build_page(c, "Product Name", gen_product_page_content(c, is_demo=True)),
+    "Booking Page": lambda c: build_page(c, "Book Now", gen_booking_content(c)),
+}
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def render_preview(cfg_key, page, _cfg):
+    # Keyed on the config hash (Streamlit skips hashing _cfg), shared by every session on this server
+    return PREVIEW_PAGES[page](_cfg)
+
+@st.fragment
+def launchpad(cfg):
+    # Switching preview pages or downloading reruns only this fragment, not the editor above
+    st.divider()
+    st.subheader("🚀 Launchpad")
 
-contact_content = f"""
-{gen_inner_header("Contact Us")}
-<section>
-    <div class="container">
-        <div class="contact-grid">
-            <div>
-                <div style="background:var(--card); padding:2rem; border-radius:12px; border:1px solid #eee;">
-                    <h3 style="color:var(--p);">Get In Touch</h3>
-                    <p style="margin-top:1rem;"><strong>📍 Address:</strong><br>{biz_addr.replace(chr(10),'<br>')}</p>
-                    <p style="margin-top:1rem;"><strong>📞 Phone:</strong><br><a href="tel:{biz_phone}" style="color:var(--s);">{biz_phone}</a></p>
-                    <p style="margin-top:1rem;"><strong>📧 Email:</strong><br><a href="mailto:{biz_email}">{biz_email}</a></p>
-                    <br>
-                    <a href="https://wa.me/{wa_num}" target="_blank" class="btn btn-accent" style="width:100%; text-align:center;">Chat on WhatsApp</a>
-                </div>
-            </div>
-            
-            <div class="card">
-                <h3 style="margin-bottom:1.5rem;">Send a Message</h3>
-                <form action="https://formsubmit.co/{biz_email}" method="POST">
-                    <div style="display:grid; grid-template-columns:1fr 1fr; gap:1rem;">
-                        <div><label>Name</label><input type="text" name="name" required placeholder="Your Name"></div>
-                        <div><label>Email</label><input type="email" name="email" required placeholder="Your Email"></div>
-                    </div>
-                    <label>Message</label><textarea name="message" rows="5" required placeholder="How can we help you?"></textarea>
-                    <button type="submit" class="btn btn-primary" style="width:100%;">Send Message</button>
-                    <input type="hidden" name="_captcha" value="false">
-                    <input type="hidden" name="_next" value="{prod_url}/contact.html">
-                </form>
-            </div>
-        </div>
-        <br><br>
-        <div style="border-radius:12px; overflow:hidden; box-shadow:0 10px 30px rgba(0,0,0,0.1);">{map_iframe}</div>
-    </div>
-</section>
-"""
+    # RESTORED RADIO BUTTONS FOR PREVIEW
+    preview_mode = st.radio("Preview Page:", list(PREVIEW_PAGES), horizontal=True)
 
-c1, c2 = st.columns([3, 1])
-with c1:
-    if preview_mode == "Home": 
-        st.components.v1.html(build_page("Home", home_content), height=600, scrolling=True)
-    elif preview_mode == "About": 
-        st.components.v1.html(build_page("About", f"{gen_inner_header('About')}<div class='container'>{format_text(about_long)}</div>"), height=600, scrolling=True)
-    elif preview_mode == "Contact": 
-        st.components.v1.html(build_page("Contact", contact_content), height=600, scrolling=True)
-    elif preview_mode == "Privacy": 
-        st.components.v1.html(build_page("Privacy", f"{gen_inner_header('Privacy')}<div class='container'>{format_text(priv_txt)}</div>"), height=600, scrolling=True)
-    elif preview_mode == "Terms": 
-        st.components.v1.html(build_page("Terms", f"{gen_inner_header('Terms')}<div class='container'>{format_text(term_txt)}</div>"), height=600, scrolling=True)
-    elif preview_mode == "Blog Index": 
-        st.components.v1.html(build_page("Blog", gen_blog_index_html()), height=600, scrolling=True)
-    elif preview_mode == "Blog Post (Demo)": 
-        st.components.v1.html(build_page("Article", gen_blog_post_html()), height=600, scrolling=True)
-    elif preview_mode == "Product Detail (Demo)":
-        st.info("ℹ️ Demo Mode Active: Showing the first available product from your CSV.")
-        st.components.v1.html(build_page("Product Name", gen_product_page_content(is_demo=True)), height=600, scrolling=True)
-    elif preview_mode == "Booking Page":
-        st.components.v1.html(build_page("Book Now", gen_booking_content()), height=600, scrolling=True)
+    # The preview iframe cannot fetch sibling files, so it always renders with inlined assets
+    preview_cfg = {**cfg, "asset_mode": "inline"}
 
-with c2:
-    st.success("System Ready.")
-    if st.button("DOWNLOAD WEBSITE ZIP", type="primary"):
-        z_b = io.BytesIO()
-        with zipfile.ZipFile(z_b, "a", zipfile.ZIP_DEFLATED, False) as zf:
-            zf.writestr("index.html", build_page("Home", home_content))
-            zf.writestr("about.html", build_page("About", f"{gen_inner_header('About')}<div class='container'>{format_text(about_long)}</div>"))
-            zf.writestr("contact.html", build_page("Contact", contact_content))
-            zf.writestr("privacy.html", build_page("Privacy", f"{gen_inner_header('Privacy')}<div class='container'>{format_text(priv_txt)}</div>"))
-            zf.writestr("terms.html", build_page("Terms", f"{gen_inner_header('Terms')}<div class='container'>{format_text(term_txt)}</div>"))
-            zf.writestr("booking.html", build_page("Book Now", gen_booking_content()))
-            zf.writestr("product.html", build_page("Product Details", gen_product_page_content(is_demo=False)))
-            
-            if show_blog: 
-                zf.writestr("blog.html", build_page("Blog", gen_blog_index_html()))
-                zf.writestr("post.html", build_page("Article", gen_blog_post_html()))
-            
-            zf.writestr("manifest.json", gen_pwa_manifest())
-            zf.writestr("service-worker.js", gen_sw())
+    c1, c2 = st.columns([3, 1])
+    with c1:
+        if preview_mode == "Product Detail (Demo)":
+            st.info("ℹ️ Demo Mode Active: Showing the first available product from your CSV.")
+        st.components.v1.html(render_preview(config_hash(preview_cfg), preview_mode, preview_cfg), height=600, scrolling=True)
 
-        st.download_button("📥 Click to Save", z_b.getvalue(), f"{biz_name.lower().replace(' ','_')}_site.zip", "application/zip")
+    with c2:
+        st.success("System Ready.")
+        if st.button("DOWNLOAD WEBSITE ZIP", type="primary"):
+            try:
+                # Previous build lives in the session, so a second click only re-renders pages whose inputs changed
+                build = compile_site(cfg, previous=st.session_state.get("last_build"))
+                st.session_state["last_build"] = build
+                st.caption(f"Compiled {len(build.files)} files in {build.seconds * 1000:.0f} ms · rebuilt {len(build.rebuilt)}, reused {len(build.files) - len(build.rebuilt)} · section cache {build.cache_hits} hits / {build.cache_misses} misses")
+                if build.rebuilt:
+                    with st.expander(f"Rebuilt files ({len(build.rebuilt)})"):
+                        st.dataframe([{"File": f, "Why": why} for f, why in build.rebuilt.items()], hide_index=True)
+                st.download_button("📥 Click to Save", zip_site(build.files), f"{site_slug(cfg)}_site.zip", "application/zip")
+                if build.size_report:
+                    before, after = sum(r[1] for r in build.size_report), sum(r[2] for r in build.size_report)
+                    st.caption(f"Minified: {before / 1024:.1f} KB → {after / 1024:.1f} KB (-{(1 - after / max(before, 1)) * 100:.0f}%)")
+                    st.dataframe([{"File": f, "Before": b, "After": n, "Saved": f"{(1 - n / max(b, 1)) * 100:.0f}%"} for f, b, n in build.size_report], hide_index=True)
+            except Exception as e:
+                st.error(f"Build Error: {e}")
+        if st.button("🔎 Audit Build"):
+            try:
+                st.session_state["last_build"] = compile_site(cfg, previous=st.session_state.get("last_build"))
+            except Exception as e:
+                st.error(f"Build Error: {e}")
+
+    # --- PERFORMANCE BUDGET AUDIT ---
+    # Pure analysis of the compiled files: works offline and audits exactly what the ZIP contains
+    build = st.session_state.get("last_build")
+    with st.expander("📊 Performance Budget Audit", expanded=build is not None):
+        cols = st.columns(len(DEFAULT_BUDGETS))
+        budgets = {k: cols[i].number_input(BUDGET_LABELS[k], min_value=0, value=v, key=f"budget_{k}") for i, (k, v) in enumerate(DEFAULT_BUDGETS.items())}
+        if build is None:
+            st.info("Click **Audit Build** or **Download** to audit the compiled pages.")
+        else:
+            show_audit(build, cfg["prod_url"], budgets)
+
+def show_audit(build, site_url, budgets):
+    rows, origins = audit_site(build.files, site_url, budgets)
+    over = [r for r in rows if r["violations"]]
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Pages audited", len(rows))
+    m2.metric("Over budget", len(over))
+    m3.metric("Third-party origins", len({o for o, _, _ in origins}))
+    if over:
+        st.error(f"{len(over)} page(s) over budget: " + ", ".join(sorted({BUDGET_LABELS[k] for r in over for k in r["violations"]})))
+    else:
+        st.success("Every page is within budget.")
+    rows.sort(key=lambda r: (-len(r["violations"]), r["page"]))
+    table = pd.DataFrame([{"Page": r["page"], **{BUDGET_LABELS[k]: v for k, v in r["values"].items()}} for r in rows])
+    limits = {BUDGET_LABELS[k]: v for k, v in budgets.items()}
+    red = lambda col: ["color: #dc2626; font-weight: 700" if col.name in limits and v > limits[col.name] else "" for v in col]
+    st.dataframe(table.style.apply(red).format(precision=1), hide_index=True)
+    if origins:
+        st.caption("Third-party requests by origin")
+        st.dataframe([{"Origin": o, "Host": h, "Type": kind, "Requests": s["requests"], "Pages": s["pages"]}
+                      for (o, h, kind), s in sorted(origins.items(), key=lambda i: -i[1]["requests"])], hide_index=True)
+    blocking = {}
+    for r in rows:
+        for url in r["blocking"]: blocking[url] = blocking.get(url, 0) + 1
+    if blocking:
+        st.caption(f"Render-blocking resources ({len(blocking)})")
+        st.dataframe([{"Resource": url, "Pages": n} for url, n in blocking.items()], hide_index=True)
+
+launchpad(site_cfg)
@@ -0,0 +1,99 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from titan_ai import AIError, GroqClient, ResponseCache
+
+# --- LOCAL STAND-IN SERVER ---
+# Plays back a script of (status, headers, delay) responses, one per POST; once the script runs out
+# every request gets a normal chat completion. hits records when each request arrived.
+
+def completion(content="hello"):
+    return {"choices": [{"message": {"content": content}}]}
+
+@pytest.fixture
+def server():
+    script, hits = [], []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            hits.append(time.monotonic())
+            status, headers, delay = script.pop(0) if script else (200, {}, 0)
+            if delay: time.sleep(delay)
+            body = json.dumps(completion() if status == 200 else {"error": "busy"}).encode("utf-8")
+            try:
+                self.send_response(status)
+                for k, v in headers.items(): self.send_header(k, v)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except OSError:
+                pass  # client already gave up (timeout test)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", script, hits
+    httpd.shutdown()
+    httpd.server_close()
+
+def make_client(base_url, **kwargs):
+    return GroqClient("test-key", base_url=base_url, backoff=0, cache_dir=None, **kwargs)
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_retries_then_succeeds(server, status):
+    url, script, hits = server
+    script += [(status, {}, 0), (status, {}, 0)]
+    assert make_client(url, max_retries=3).chat([{"role": "user", "content": "hi"}]) == "hello"
+    assert len(hits) == 3
+
+def test_honours_retry_after(server):
+    url, script, hits = server
+    script.append((429, {"Retry-After": "0.5"}, 0))
+    make_client(url).chat([{"role": "user", "content": "hi"}])
+    assert len(hits) == 2
+    assert hits[1] - hits[0] >= 0.45  # backoff=0, so only Retry-After accounts for the wait
+
+def test_gives_up_after_max_retries(server):
+    url, script, hits = server
+    script += [(503, {}, 0)] * 10
+    with pytest.raises(AIError, match="HTTP 503"):
+        make_client(url, max_retries=2).chat([{"role": "user", "content": "hi"}])
+    assert len(hits) == 3
+
+def test_timeout(server):
+    url, script, hits = server
+    script.append((200, {}, 1.0))
+    client = make_client(url, timeout=(1, 0.2), max_retries=0)
+    t0 = time.monotonic()
+    with pytest.raises(AIError, match="Request failed"):
+        client.chat([{"role": "user", "content": "hi"}])
+    assert time.monotonic() - t0 < 0.9
+
+def test_cache_hit_skips_network(server, tmp_path):
+    url, script, hits = server
+    client = GroqClient("test-key", base_url=url, backoff=0, cache_dir=str(tmp_path))
+    messages = [{"role": "user", "content": "hi"}]
+    assert client.chat(messages) == "hello"
+    assert client.cached(messages) == "hello"
+    assert client.chat(messages) == "hello"
+    assert len(hits) == 1
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_entries=2)
+    for key in ("a", "b"):
+        cache.set(key, key)
+        time.sleep(0.02)  # distinct mtimes
+    assert cache.get("a") == "a"  # a is now more recent than b
+    time.sleep(0.02)
+    cache.set("c", "c")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("a", "c")
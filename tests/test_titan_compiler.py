@@ -0,0 +1,102 @@
+import re
+
+import pytest
+
+import titan_fonts
+from titan_compiler import (
+    SECTION_CACHE, compile_site, critical_css, load_build_state, minify_js, save_build_state,
+)
+
+ASSET_REF = re.compile(r'(?:href|src)="((?:styles|app)\.[0-9a-f]+\.(?:css|js))"')
+
+def test_external_assets_with_fonts_are_linked(tmp_path, monkeypatch):
+    # Without fontTools the faces are bundled as-is, so placeholder bytes are enough
+    monkeypatch.setattr(titan_fonts, "ft_subset", None)
+    for name in ("Montserrat-Bold.ttf", "Inter-Regular.ttf"):
+        (tmp_path / name).write_bytes(b"\0\1\0\0font")
+    build = compile_site({"asset_mode": "external", "font_dir": str(tmp_path)})
+    assert any(name.startswith("fonts/") for name in build.files)
+    pages = {name: body for name, body in build.files.items() if name.endswith(".html")}
+    for name, body in pages.items():
+        refs = ASSET_REF.findall(body)
+        assert refs, name
+        assert all(ref in build.files for ref in refs), (name, refs)
+    for ref in re.findall(r"^/(\S+)", build.files["_headers"], re.M):
+        assert ref in build.files
+
+# --- INCREMENTAL BUILDS ---
+
+@pytest.fixture
+def site(tmp_path):
+    inv = tmp_path / "inv.csv"
+    inv.write_text('name,price,desc,image,StripeLink\nTee,$20,"Soft, ""classic"" fit",https://img.example/tee.jpg,\n'
+                   "Mug,$9,Holds coffee,https://img.example/mug.jpg,\nCap,$15,Shade,https://img.example/cap.jpg,\n", encoding="utf-8")
+    blog = tmp_path / "blog.csv"
+    blog.write_text("id,title,date,category,excerpt,image,body\n1,First Post,2024-01-01,News,Hello,https://img.example/1.jpg,Body one\n"
+                    "2,Second Post,2024-02-01,Tips,Again,https://img.example/2.jpg,Body two\n", encoding="utf-8")
+    lang = tmp_path / "lang.csv"
+    lang.write_text("key,es\nContact,Contacto\n", encoding="utf-8")
+    return {"prerender_inventory": True, "sheet_url": str(inv), "inv_page_size": 2, "prerender_blog": True,
+            "blog_sheet_url": str(blog), "blog_per_page": 1, "lang_sheet": str(lang)}
+
+def full_build(cfg):
+    SECTION_CACHE.clear()  # nothing carried over from the incremental run
+    return compile_site(cfg)
+
+@pytest.mark.parametrize("overrides", [{}, {"asset_mode": "external", "minify": True}])
+def test_noop_rebuild_matches_full_build(site, overrides):
+    cfg = {**site, **overrides}
+    first = compile_site(cfg)
+    again = compile_site(cfg, previous=first)
+    assert again.rebuilt == {}
+    assert again.files == full_build(cfg).files
+
+def test_rebuild_after_state_round_trip(site, tmp_path):
+    first = compile_site(site)
+    save_build_state(first, str(tmp_path / "state.json"))
+    cfg = {**site, "biz_name": "Other Co"}
+    again = compile_site(cfg, previous=load_build_state(str(tmp_path / "state.json")))
+    assert again.files == full_build(cfg).files
+
+def test_changed_field_rebuilds_only_dependents(site):
+    first = compile_site(site)
+    cfg = {**site, "term_txt": "New terms"}
+    again = compile_site(cfg, previous=first)
+    dependents = {name for name, deps in first.deps.items() if "term_txt" in deps}
+    assert dependents == {"terms.html", "terms.es.html"}
+    # The worker hashes every other output, so it follows any change
+    assert set(again.rebuilt) == dependents | {"service-worker.js"}
+    assert again.files == full_build(cfg).files
+
+# --- MINIFIER / CRITICAL CSS / TRANSLATIONS ---
+
+def test_minify_js_keeps_strings_regexes_and_asi_newlines():
+    src = r"""
+    const s = "a  //  b", t = 'it\'s  /* not */ a comment';  // trailing
+    const re = /[/"']+\/\/ x/g, half = 4 / 2 / 1;
+    let a = 1
+    let b = a
+    ++b
+    /* block */
+    const tpl = `x  ${ a +  b }  y`
+    """
+    out = minify_js(src)
+    assert '"a  //  b"' in out and r"'it\'s  /* not */ a comment'" in out
+    assert r"""/[/"']+\/\/ x/g""" in out and "half=4/2/1" in out
+    assert "let b=a\n++b" in out  # a newline before ++ decides which statement it belongs to
+    assert "trailing" not in out and "block" not in out
+    assert "`x  ${a+b}  y`" in out
+
+def test_critical_css_keeps_only_used_rules():
+    css = ".a{color:red}.b{color:blue}@media (max-width:5px){.a{x:1}.zz{y:2}}"
+    out = critical_css(css, '<div class="a"></div>')
+    assert ".a" in out and "@media" in out
+    assert ".b" not in out and ".zz" not in out
+
+def test_translations_baked_into_pages(site):
+    build = compile_site(site)
+    page = build.files["index.es.html"]
+    assert '<html lang="es">' in page and ">Contacto<" in page
+    assert 'href="contact.es.html"' in page and 'href="contact.html"' not in page
+    assert 'hreflang="en"' in page and 'hreflang="x-default"' in page
+    assert ">Contacto<" not in build.files["index.html"]
@@ -0,0 +1,295 @@
+import argparse
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# --- TITAN AI CLIENT ---
+# One pooled HTTP session per client, bounded timeouts, jittered retries on 429/5xx and a disk
+# cache keyed by model + prompt, so re-running the same business description costs nothing.
+
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+DEFAULT_MODEL = "llama3-8b-8192"
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+COPY_PROMPT = """
+Act as a copywriter. Return a JSON object with these keys for a '{biz_desc}' business:
+hero_h (Catchy headline), hero_sub (2 sentences), about_h (Title), about_short (3 sentences),
+feat_data (4 lines. Format: iconname | Title | Description. Icons: bolt, wallet, shield, star, heart).
+"""
+
+class AIError(Exception):
+    pass
+
+class ResponseCache:
+    # One JSON file per response; least recently used files are deleted past max_entries
+    def __init__(self, path, max_entries=1000):
+        self.path, self.max_entries = path, max_entries
+        self.lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    def key(self, payload):
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        file = os.path.join(self.path, f"{key}.json")
+        try:
+            with open(file, encoding="utf-8") as f:
+                value = json.load(f)["content"]
+        except (OSError, ValueError, KeyError):
+            return None
+        try: os.utime(file)  # mtime doubles as last-used time for eviction
+        except OSError: pass
+        return value
+
+    def set(self, key, content):
+        file = os.path.join(self.path, f"{key}.json")
+        with self.lock:
+            with open(file + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"content": content, "at": time.time()}, f)
+            os.replace(file + ".tmp", file)
+            self.evict()
+
+    def evict(self):
+        entries = [e for e in os.scandir(self.path) if e.name.endswith(".json")]
+        if len(entries) <= self.max_entries: return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for e in entries[:len(entries) - self.max_entries]:
+            try: os.remove(e.path)
+            except OSError: pass
+
+class GroqClient:
+    def __init__(self, api_key, base_url=GROQ_BASE_URL, model=DEFAULT_MODEL, timeout=(5, 60),
+                 max_retries=4, backoff=0.5, max_backoff=20, pool_size=10,
+                 cache_dir=".titan_ai_cache", cache_entries=1000):
+        self.base_url = base_url.rstrip("/")
+        self.model, self.timeout = model, timeout
+        self.max_retries, self.backoff, self.max_backoff = max_retries, backoff, max_backoff
+        self.cache = ResponseCache(cache_dir, cache_entries) if cache_dir else None
+        self.session = requests.Session()
+        self.session.headers.update({"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def retry_delay(self, attempt, resp=None):
+        # Honour Retry-After when the server sends one, otherwise exponential backoff with full jitter
+        if resp is not None and resp.headers.get("Retry-After", "").replace(".", "", 1).isdigit():
+            return min(float(resp.headers["Retry-After"]), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def post(self, path, payload):
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        for attempt in range(self.max_retries + 1):
+            try:
+                resp = self.session.post(url, json=payload, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries: raise AIError(f"Request failed: {e}") from e
+                time.sleep(self.retry_delay(attempt))
+                continue
+            if resp.status_code in RETRY_STATUS and attempt < self.max_retries:
+                time.sleep(self.retry_delay(attempt, resp))
+                continue
+            if resp.status_code >= 400:
+                raise AIError(f"HTTP {resp.status_code}: {resp.text[:200]}")
+            try:
+                return resp.json()
+            except ValueError as e:
+                raise AIError("Response was not JSON") from e
+
+    def payload(self, messages, model=None, response_format=None):
+        payload = {"messages": messages, "model": model or self.model}
+        if response_format: payload["response_format"] = response_format
+        return payload
+
+    def cached(self, messages, model=None, response_format=None):
+        # Cache lookup without touching the network (None on a miss)
+        return self.cache.get(self.cache.key(self.payload(messages, model, response_format))) if self.cache else None
+
+    def chat(self, messages, model=None, response_format=None, use_cache=True):
+        payload = self.payload(messages, model, response_format)
+        key = self.cache.key(payload) if self.cache and use_cache else None
+        if key:
+            hit = self.cache.get(key)
+            if hit is not None: return hit
+        data = self.post("chat/completions", payload)
+        try:
+            content = data["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError) as e:
+            raise AIError(f"Unexpected response: {str(data)[:200]}") from e
+        if key: self.cache.set(key, content)
+        return content
+
+    def chat_json(self, prompt, **kwargs):
+        content = self.chat([{"role": "user", "content": prompt}], response_format={"type": "json_object"}, **kwargs)
+        try:
+            return json.loads(content)
+        except ValueError as e:
+            raise AIError("Model did not return valid JSON") from e
+
+    def generate_copy(self, biz_desc):
+        return self.chat_json(COPY_PROMPT.format(biz_desc=biz_desc))
+
+    def close(self):
+        self.session.close()
+
+# --- BULK ENRICHMENT ---
+# Fills the description column of an inventory sheet (name, price, desc, image, StripeLink) or the
+# excerpt column of a blog sheet (id, title, date, category, excerpt, image, body) for every row at once.
+# Requests run on worker threads behind a semaphore and a token bucket; finished rows are appended to a
+# progress file so an interrupted run picks up where it stopped, and cached prompts never hit the API.
+
+PRODUCT_PROMPT = """
+Write a persuasive product description (2 sentences, plain text, no quotes or markdown) for an online store.
+Product: {name}
+Price: {price}
+"""
+
+EXCERPT_PROMPT = """
+Write a one-sentence teaser (max 30 words, plain text, no quotes or markdown) for this blog post.
+Title: {title}
+Article: {body}
+"""
+
+# kind -> (column to fill, prompt builder)
+ENRICH_KINDS = {
+    "inventory": (2, lambda r: PRODUCT_PROMPT.format(name=r[0], price=r[1] if len(r) > 1 else "")),
+    "blog": (4, lambda r: EXCERPT_PROMPT.format(title=r[1], body=(r[6] if len(r) > 6 else "")[:3000])),
+}
+
+class TokenBucket:
+    # `rate` requests per second on average, bursts of up to `capacity`
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+def row_key(kind, row):
+    return hashlib.sha256(json.dumps([kind, row]).encode("utf-8")).hexdigest()[:20]
+
+def load_progress(path):
+    done = {}
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                    done[item["key"]] = item["text"]
+                except (ValueError, KeyError):
+                    continue  # torn last line from a killed run
+    return done
+
+async def enrich_rows(client, rows, kind="inventory", concurrency=8, rpm=60, overwrite=False,
+                      progress_path=None, on_progress=None):
+    # rows excludes the header; returns (enriched rows, stats). Rows that fail keep their original value.
+    col, build_prompt = ENRICH_KINDS[kind]
+    done = load_progress(progress_path)
+    out = [list(r) for r in rows]
+    stats = {"rows": len(rows), "skipped": 0, "resumed": 0, "cached": 0, "generated": 0, "failed": 0}
+    todo = []
+    for i, row in enumerate(out):
+        if len(row) <= col: row.extend([""] * (col + 1 - len(row)))
+        if not row[0].strip() or (row[col].strip() and not overwrite):
+            stats["skipped"] += 1
+            continue
+        key = row_key(kind, rows[i])
+        if key in done:
+            row[col] = done[key]
+            stats["resumed"] += 1
+            continue
+        todo.append((i, key))
+
+    bucket, gate = TokenBucket(rpm / 60.0), asyncio.Semaphore(concurrency)
+    log = open(progress_path, "a", encoding="utf-8") if progress_path else None
+    finished = 0
+
+    async def work(i, key):
+        nonlocal finished
+        messages = [{"role": "user", "content": build_prompt(out[i])}]
+        text = client.cached(messages)
+        if text is not None:
+            stats["cached"] += 1
+        else:
+            async with gate:
+                await bucket.acquire()
+                try:
+                    text = await asyncio.to_thread(client.chat, messages)
+                    stats["generated"] += 1
+                except AIError:
+                    stats["failed"] += 1
+        if text is not None:
+            out[i][col] = " ".join(text.split()).strip('"')
+            if log:
+                log.write(json.dumps({"key": key, "text": out[i][col]}) + "\n")
+                log.flush()
+        finished += 1
+        if on_progress: on_progress(finished, len(todo))
+
+    try:
+        await asyncio.gather(*(work(i, key) for i, key in todo))
+    finally:
+        if log: log.close()
+    return out, stats
+
+def enrich_csv_text(client, text, kind="inventory", **kwargs):
+    # Whole-file helper for the editor: CSV text in, enriched CSV text + stats out
+    rows = list(csv.reader(io.StringIO(text.lstrip("\ufeff"))))
+    header, body = (rows[0], rows[1:]) if rows else ([], [])
+    enriched, stats = asyncio.run(enrich_rows(client, body, kind, **kwargs))
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerows([header] + enriched)
+    return buf.getvalue(), stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Titan AI bulk enrichment: fill product descriptions or blog excerpts for a whole sheet.")
+    parser.add_argument("csv", help="Inventory or blog CSV (first row is the header)")
+    parser.add_argument("-o", "--out", help="Enriched CSV path (default: <name>.enriched.csv)")
+    parser.add_argument("-k", "--kind", choices=sorted(ENRICH_KINDS), default="inventory")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="Requests in flight at once")
+    parser.add_argument("--rpm", type=float, default=30, help="Requests per minute budget (token bucket)")
+    parser.add_argument("--overwrite", action="store_true", help="Regenerate cells that already have text")
+    parser.add_argument("--key", default=os.environ.get("GROQ_API_KEY"), help="API key (default: $GROQ_API_KEY)")
+    parser.add_argument("--base-url", default=os.environ.get("TITAN_AI_BASE_URL", GROQ_BASE_URL))
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    args = parser.parse_args(argv)
+    if not args.key: parser.error("an API key is required (--key or GROQ_API_KEY)")
+
+    out_path = args.out or os.path.splitext(args.csv)[0] + ".enriched.csv"
+    client = GroqClient(args.key, base_url=args.base_url, model=args.model, pool_size=max(10, args.concurrency))
+    with open(args.csv, encoding="utf-8-sig", newline="") as f:
+        text = f.read()
+    t0 = time.perf_counter()
+    progress = lambda n, total: print(f"\r  {n}/{total} rows", end="", flush=True)
+    result, stats = enrich_csv_text(client, text, args.kind, concurrency=args.concurrency, rpm=args.rpm,
+                                    overwrite=args.overwrite, progress_path=out_path + ".progress.jsonl", on_progress=progress)
+    with open(out_path, "w", encoding="utf-8", newline="") as f:
+        f.write(result)
+    print(f"\nWrote {out_path} in {time.perf_counter() - t0:.1f}s | " + " ".join(f"{k} {v}" for k, v in stats.items()))
+    if not stats["failed"] and os.path.exists(out_path + ".progress.jsonl"):
+        os.remove(out_path + ".progress.jsonl")  # complete: nothing left to resume
+    return 1 if stats["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
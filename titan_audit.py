@@ -0,0 +1,145 @@
+import functools
+import re
+import urllib.parse
+from html.parser import HTMLParser
+
+# --- TITAN PERFORMANCE AUDIT ---
+# Offline per-page audit of compiled output: no browser, no network, just the HTML (and the local CSS/JS/
+# images it references) from SiteBuild.files. Budgets flag pages that are too heavy or too chatty.
+
+DEFAULT_BUDGETS = {
+    "total_kb": 150,  # page HTML + local CSS/JS/images it loads
+    "inline_css_kb": 40,  # <style> blocks + style="" attributes
+    "inline_js_kb": 60,  # inline <script> code (JSON-LD excluded)
+    "third_party": 6,  # requests to other origins
+    "render_blocking": 1,  # external stylesheets / sync scripts the first paint waits for
+    "unsized_images": 0,  # <img> without width + height (layout shift)
+    "eager_images": 2,  # <img> without loading="lazy" (fetchpriority="high" is intentional and not counted)
+}
+BUDGET_LABELS = {
+    "total_kb": "Total KB", "inline_css_kb": "Inline CSS KB", "inline_js_kb": "Inline JS KB", "third_party": "3rd-party requests",
+    "render_blocking": "Render-blocking", "unsized_images": "Unsized images", "eager_images": "Eager images",
+}
+KNOWN_ORIGINS = {
+    "fonts.googleapis.com": "Google Fonts", "fonts.gstatic.com": "Google Fonts", "assets.calendly.com": "Calendly",
+    "calendly.com": "Calendly", "images.unsplash.com": "Unsplash", "docs.google.com": "Google Sheets",
+    "formsubmit.co": "FormSubmit", "www.googletagmanager.com": "Google Analytics", "www.google.com": "Google Maps",
+    "buy.stripe.com": "Stripe",
+}
+
+_CSS_URL = re.compile(r'url\(\s*[\'"]?([^\'")]+)')
+_JS_FETCH = re.compile(r'(?:fetch|TitanData\.rows)\(\s*[\'"]([^\'"]+)[\'"]')
+_NON_CODE_SCRIPTS = ("application/ld+json", "application/json", "text/template")
+
+class _PageScan(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.in_head, self.capture, self.noscript = True, None, 0
+        self.css = self.js = 0
+        self.requests = []  # (url, kind, blocking)
+        self.unsized = self.eager = 0
+
+    def request(self, url, kind, blocking=False):
+        # <noscript> fallbacks only load with JavaScript off
+        if url and not self.noscript and not url.startswith(("data:", "blob:", "#", "javascript:")): self.requests.append((url.strip(), kind, blocking))
+
+    def handle_starttag(self, tag, attrs):
+        a = {k: (v or "") for k, v in attrs}
+        if a.get("style"):
+            self.css += len(a["style"].encode("utf-8"))
+            for url in _CSS_URL.findall(a["style"]): self.request(url, "image")
+        if a.get("data-bg"): self.request(a["data-bg"], "image")
+        if tag == "body": self.in_head = False
+        elif tag == "noscript": self.noscript += 1
+        elif tag == "script":
+            if a.get("src"):
+                self.request(a["src"], "script", "async" not in a and "defer" not in a and a.get("type") != "module")
+            elif a.get("type", "").lower() not in _NON_CODE_SCRIPTS:
+                self.capture = "js"
+        elif tag == "style": self.capture = "css"
+        elif tag == "link":
+            rel = a.get("rel", "").lower().split()
+            if "stylesheet" in rel: self.request(a.get("href"), "stylesheet", self.in_head and a.get("media", "all") in ("all", "screen", ""))
+            elif "preload" in rel: self.request(a.get("href"), a.get("as") or "preload")
+            elif rel and rel[0] in ("icon", "apple-touch-icon", "manifest"): self.request(a.get("href"), rel[0])
+        elif tag == "img":
+            self.request(a.get("src"), "image")
+            if not (a.get("width") and a.get("height")): self.unsized += 1
+            if a.get("loading") != "lazy" and a.get("fetchpriority") != "high": self.eager += 1
+        elif tag in ("iframe", "video", "audio", "embed"): self.request(a.get("src"), tag)
+        elif tag == "form" and a.get("action", "").startswith(("http:", "https:", "//")): self.request(a["action"], "form (on submit)")
+
+    def handle_endtag(self, tag):
+        if tag == "head": self.in_head = False
+        if tag == "noscript": self.noscript = max(0, self.noscript - 1)
+        if tag in ("script", "style"): self.capture = None
+
+    def handle_data(self, data):
+        if self.capture == "css":
+            self.css += len(data.encode("utf-8"))
+            for url in _CSS_URL.findall(data): self.request(url, "image")
+        elif self.capture == "js":
+            self.js += len(data.encode("utf-8"))
+            for url in _JS_FETCH.findall(data): self.request(url, "data")
+
+@functools.lru_cache(maxsize=4096)
+def scan_page(html):
+    # Reused pages of an incremental build are the same strings, so re-auditing them is free
+    scan = _PageScan()
+    scan.feed(html)
+    scan.close()
+    return scan.css, scan.js, tuple(scan.requests), scan.unsized, scan.eager
+
+def origin_label(host):
+    return KNOWN_ORIGINS.get(host) or KNOWN_ORIGINS.get(host.split(".", 1)[-1]) or host
+
+def audit_page(name, files, site_url):
+    body = files[name]
+    html = body if isinstance(body, str) else body.decode("utf-8", "replace")
+    css, js, requests, unsized, eager = scan_page(html)
+    page_url = urllib.parse.urljoin(site_url.rstrip("/") + "/", name)
+    base = re.search(r'<base href="([^"]+)"', html)
+    if base: page_url = urllib.parse.urljoin(page_url, base.group(1))
+    own_host = urllib.parse.urlsplit(site_url).netloc
+    html_bytes = len(html.encode("utf-8"))
+    total, origins, third_party, blocking, seen = html_bytes, {}, [], [], set()
+    for url, kind, blocks in requests:
+        full = urllib.parse.urljoin(page_url, url)
+        parts = urllib.parse.urlsplit(full)
+        if blocks: blocking.append(url)
+        if parts.netloc and parts.netloc != own_host:
+            third_party.append({"url": url, "kind": kind, "origin": origin_label(parts.netloc), "host": parts.netloc})
+            origins[origin_label(parts.netloc)] = origins.get(origin_label(parts.netloc), 0) + 1
+            continue
+        local = parts.path.lstrip("/")
+        if local in files and local != name and local not in seen:
+            # Same-origin files the page pulls in count towards its weight once each
+            seen.add(local)
+            total += len(files[local]) if isinstance(files[local], bytes) else len(files[local].encode("utf-8"))
+    return {
+        "page": name, "html_bytes": html_bytes, "total_bytes": total, "inline_css": css, "inline_js": js,
+        "third_party": third_party, "origins": origins, "blocking": blocking, "unsized_images": unsized, "eager_images": eager,
+    }
+
+def over_budget(report, budgets):
+    # Budget keys whose measured value exceeds the limit
+    values = {
+        "total_kb": report["total_bytes"] / 1024, "inline_css_kb": report["inline_css"] / 1024, "inline_js_kb": report["inline_js"] / 1024,
+        "third_party": len([r for r in report["third_party"] if not r["kind"].startswith("form")]),
+        "render_blocking": len(report["blocking"]), "unsized_images": report["unsized_images"], "eager_images": report["eager_images"],
+    }
+    return values, [k for k, limit in budgets.items() if k in values and values[k] > limit]
+
+def audit_site(files, site_url, budgets=None):
+    # -> (one row per HTML page, third-party summary by origin); rows carry "values" and "violations"
+    budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+    rows, summary = [], {}
+    for name in sorted(n for n in files if n.endswith(".html")):
+        report = audit_page(name, files, site_url)
+        report["values"], report["violations"] = over_budget(report, budgets)
+        rows.append(report)
+        for r in report["third_party"]:
+            s = summary.setdefault((r["origin"], r["host"], r["kind"]), {"requests": 0, "pages": 0})
+            s["requests"] += 1
+        for key in {(r["origin"], r["host"], r["kind"]) for r in report["third_party"]}: summary[key]["pages"] += 1
+    return rows, summary
@@ -0,0 +1,313 @@
+import argparse
+import csv
+import fnmatch
+import inspect
+import json
+import os
+import platform
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import titan_compiler as tc
+from titan_search import build_index
+
+# --- TITAN BENCHMARKS ---
+# Headless timings for the compiler on a synthetic worst-case site: 100 KB legal pages, 50 feature rows,
+# hundreds of testimonials/FAQs and 10k-row inventory + blog sheets read from local CSV files.
+# Results (seconds, peak bytes, output bytes) go to a JSON file; pass an earlier one as --baseline to fail
+# on regressions. Run: python titan_bench.py -o bench.json [--baseline old.json]
+
+def legacy_format_text(text):
+    # format_text as it shipped before the single-pass renderer, kept as the comparison baseline
+    if not text: return ""
+    processed_text = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', text)
+    lines = processed_text.split('\n')
+    html_out = ""
+    in_list = False
+    for line in lines:
+        clean_line = line.strip()
+        if not clean_line: continue
+        if clean_line.startswith("* "):
+            if not in_list:
+                html_out += '<ul style="margin-bottom:1rem; padding-left:1.5rem;">'
+                in_list = True
+            content = clean_line[2:]
+            html_out += f'<li style="margin-bottom:0.5rem; opacity:0.9; color:inherit;">{content}</li>'
+        elif clean_line.startswith("<strong>") and clean_line.endswith("</strong>"):
+            if in_list:
+                html_out += "</ul>"
+                in_list = False
+            header_text = clean_line.replace("<strong>", "").replace("</strong>", "")
+            html_out += f"<h3 style='margin-top:1.5rem; margin-bottom:0.5rem; color:var(--p); font-size:1.25rem;'>{header_text}</h3>"
+        else:
+            if in_list:
+                html_out += "</ul>"
+                in_list = False
+            html_out += f"<p style='margin-bottom:1rem; opacity:0.9; color:inherit;'>{clean_line}</p>"
+    if in_list: html_out += "</ul>"
+    return html_out
+
+WORDS = ("website hosting monthly fees ownership speed data privacy contract service agreement client "
+         "payment refund domain security cookies analytics update support license warranty").split()
+
+def synthetic_markdown(size, seed=7):
+    # Legal-page shaped text: bold headings, paragraphs with inline bold, bullet lists
+    rng = random.Random(seed)
+    out, n, section = [], 0, 0
+    def sentence(k):
+        words = [rng.choice(WORDS) for _ in range(k)]
+        if rng.random() < 0.3: words[rng.randrange(k)] = f"**{rng.choice(WORDS)}**"
+        return " ".join(words).capitalize() + "."
+    while n < size:
+        section += 1
+        block = [f"**{section}. {sentence(4)[:-1]}**", " ".join(sentence(rng.randint(8, 20)) for _ in range(rng.randint(2, 6)))]
+        if rng.random() < 0.5: block += [f"* {sentence(rng.randint(4, 10))}" for _ in range(rng.randint(2, 5))]
+        block.append("")
+        out += block
+        n += sum(len(line) + 1 for line in block)
+    return "\n".join(out)[:size]
+
+def timed(fn, *args, repeat=5, setup=None):
+    # Best of `repeat` runs, in seconds; setup() runs untimed before each one
+    best = float("inf")
+    for _ in range(repeat):
+        if setup: setup()
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def peak_memory(fn, *args):
+    # (result, peak bytes allocated while fn ran) - traced separately because tracemalloc slows everything down
+    reset_caches()
+    tracemalloc.start()
+    try:
+        out = fn(*args)
+        return out, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def reset_caches():
+    tc.SECTION_CACHE.clear()
+    for fn in (tc.format_text, tc.parse_css, tc.minify_js, tc.minify_css): fn.cache_clear()
+
+# --- SYNTHETIC SITE ---
+def write_sheets(folder, rows, seed=7):
+    # Inventory (name, price, desc, image, stripe) and blog (id, title, date, category, excerpt, image, body) CSVs
+    rng = random.Random(seed)
+    words = lambda k: " ".join(rng.choice(WORDS) for _ in range(k))
+    inv, blog = os.path.join(folder, "inventory.csv"), os.path.join(folder, "blog.csv")
+    with open(inv, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["Name", "Price", "Description", "Image", "StripeLink"])
+        for i in range(rows):
+            stripe = f"https://buy.stripe.com/test_{i}" if i % 5 == 0 else ""
+            w.writerow([f"{words(2).title()} {i}", f"${rng.randint(5, 500)}", words(rng.randint(10, 40)), f"https://images.example.com/p{i}.jpg", stripe])
+    with open(blog, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["ID", "Title", "Date", "Category", "Excerpt", "Image", "Body"])
+        for i in range(rows):
+            w.writerow([f"post-{i}", f"{words(5).capitalize()} {i}", f"2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}", rng.choice(WORDS).title(),
+                        words(25), f"https://images.example.com/b{i}.jpg", synthetic_markdown(rng.randint(800, 3000), seed=i)])
+    return inv, blog
+
+def synthetic_config(folder, rows=10_000, text_kb=100):
+    inv, blog = write_sheets(folder, rows)
+    icons = ["bolt", "wallet", "table", "shield", "layers", "star"]
+    return tc.make_config({
+        "asset_mode": "external",  # a 10k-product site with everything inlined is ~0.5 GB of HTML
+        "sheet_url": inv, "prerender_inventory": True,
+        "blog_sheet_url": blog, "prerender_blog": True, "show_search": True,
+        "priv_txt": synthetic_markdown(text_kb * 1000, seed=1),
+        "term_txt": synthetic_markdown(text_kb * 1000, seed=2),
+        "about_long": synthetic_markdown(text_kb * 1000 // 4, seed=3),
+        "feat_data": "\n".join(f"{icons[i % 6]} | Pillar {i} | {synthetic_markdown(300, seed=i)}".replace("\n", " ") for i in range(50)),
+        "testi_data": "\n".join(f"Client {i}, Owner | {synthetic_markdown(240, seed=i).replace(chr(10), ' ')}" for i in range(300)),
+        "faq_data": "\n".join(f"Question number {i}? ? {synthetic_markdown(240, seed=i).replace(chr(10), ' ')}" for i in range(300)),
+    })
+
+def bench_format_text(size=100_000, repeat=5):
+    text = synthetic_markdown(size)
+    if tc.format_text(text) != legacy_format_text(text): raise AssertionError("format_text output differs from the legacy renderer")
+    render = tc.format_text.__wrapped__  # uncached
+    result = {
+        "bytes": len(text),
+        "legacy_s": timed(legacy_format_text, text, repeat=repeat),
+        "single_pass_s": timed(render, text, repeat=repeat),
+        "memoized_s": timed(tc.format_text, text, repeat=repeat),
+    }
+    result["speedup"] = result["legacy_s"] / result["single_pass_s"]
+    return result
+
+# --- GENERATORS, BUILD, ZIP ---
+def generator_calls(cfg, products, posts, search):
+    # name -> zero-arg call for every gen_* in the compiler; ones taking only cfg are found automatically
+    calls = {}
+    for name, fn in vars(tc).items():
+        if not name.startswith("gen_") or not callable(fn): continue
+        params = [p for p in inspect.signature(fn).parameters.values() if p.default is p.empty]
+        if not params: calls[name] = fn
+        elif [p.name for p in params] == ["cfg"]: calls[name] = lambda fn=fn: fn(cfg)
+    slug, row = products[0]
+    post_slug, post = posts[0]
+    per_page = int(cfg["blog_per_page"])
+    calls.update({
+        "gen_inventory": lambda: tc.gen_inventory(cfg, products),
+        "gen_home_content": lambda: tc.gen_home_content(cfg, products),
+        "gen_product_card": lambda: tc.gen_product_card(cfg, row, slug),
+        "gen_product_detail": lambda: tc.gen_product_detail(cfg, row, slug),
+        "gen_store_page": lambda: tc.gen_store_page(cfg, products[:int(cfg["inv_page_size"])], 2, 2),
+        "gen_blog_index_static": lambda: tc.gen_blog_index_static(cfg, posts[:per_page], 1, -(-len(posts) // per_page)),
+        "gen_blog_post_static": lambda: tc.gen_blog_post_static(cfg, post, post_slug),
+        "gen_post_redirect": lambda: tc.gen_post_redirect(posts),
+        "gen_search_content": lambda: tc.gen_search_content(cfg, search),
+        "gen_search_js": lambda: tc.gen_search_js(search),
+        "gen_text_page": lambda: tc.gen_text_page("Privacy", cfg["priv_txt"]),
+        "gen_blog_pager": lambda: tc.gen_blog_pager(1, 10),
+        "gen_share_links": lambda: tc.gen_share_links("https://example.com/p", "Title"),
+        "gen_inner_header": lambda: tc.gen_inner_header("Privacy"),
+        "gen_headers": lambda: tc.gen_headers(tc.gen_asset_names(cfg)),
+        "build_page": lambda: tc.build_page(cfg, "Privacy", tc.gen_text_page("Privacy", cfg["priv_txt"])),
+    })
+    calls.pop("gen_sw", None)  # needs the finished file set; covered by the full build
+    return dict(sorted(calls.items()))
+
+def file_group(name):
+    # Thousands of product/, blog/ and search/ files are summarised per folder instead of listed
+    return name.split("/", 1)[0] + "/" if "/" in name else None
+
+def output_bytes(files):
+    per_file, groups = {}, {}
+    for name, body in files.items():
+        size = tc.byte_len(body)
+        group = file_group(name)
+        if group is None:
+            per_file[name] = size
+            continue
+        g = groups.setdefault(group, {"files": 0, "total": 0, "max": 0})
+        g["files"] += 1
+        g["total"] += size
+        g["max"] = max(g["max"], size)
+    return per_file, groups
+
+def run_suite(rows=10_000, text_kb=100, repeat=5, log=print):
+    results = {
+        "meta": {"when": datetime.now(timezone.utc).isoformat(timespec="seconds"), "python": platform.python_version(),
+                 "platform": platform.platform(), "compiler": tc.COMPILER_VERSION, "rows": rows, "text_kb": text_kb, "repeat": repeat},
+        "timings": {}, "memory": {}, "bytes": {},
+    }
+    timings, memory = results["timings"], results["memory"]
+
+    ft = bench_format_text(text_kb * 1000, repeat)
+    timings.update({f"format_text.{k[:-2]}": ft[k] for k in ("legacy_s", "single_pass_s", "memoized_s")})
+    log(f"format_text {text_kb} KB: legacy {ft['legacy_s'] * 1000:.2f} ms | single pass {ft['single_pass_s'] * 1000:.2f} ms | memoized {ft['memoized_s'] * 1e6:.1f} µs")
+
+    with tempfile.TemporaryDirectory(prefix="titan-bench-") as folder:
+        t0 = time.perf_counter()
+        cfg = synthetic_config(folder, rows, text_kb)
+        log(f"synthetic site: {rows} products + {rows} posts written in {time.perf_counter() - t0:.1f}s")
+
+        timings["sheets.load_products"] = timed(tc.load_products, cfg, repeat=min(repeat, 3))
+        timings["sheets.load_posts"] = timed(tc.load_posts, cfg, repeat=min(repeat, 3))
+        products, posts = tc.load_products(cfg), tc.load_posts(cfg)
+        docs = tc.search_documents(cfg, products, posts)
+        timings["search.build_index"] = timed(build_index, docs, repeat=min(repeat, 3))
+        search, _ = build_index(docs)
+
+        for name, call in generator_calls(cfg, products, posts, search).items():
+            timings[f"gen.{name}.cold"] = timed(call, repeat=repeat, setup=reset_caches)
+            timings[f"gen.{name}.warm"] = timed(call, repeat=repeat)
+        slowest = sorted((v, k) for k, v in timings.items() if k.endswith(".cold"))[-3:]
+        log("generators (cold, slowest): " + ", ".join(f"{k[4:-5]} {v * 1000:.1f} ms" for v, k in reversed(slowest)))
+
+        reset_caches()
+        t0 = time.perf_counter()
+        build = tc.compile_site(cfg)
+        timings["build.full"] = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        tc.compile_site(cfg, build)
+        timings["build.noop_incremental"] = time.perf_counter() - t0
+        log(f"full build: {len(build.files)} files in {timings['build.full']:.2f}s | no-op incremental {timings['build.noop_incremental']:.2f}s")
+
+        t0 = time.perf_counter()
+        archive = tc.zip_site(build.files)
+        timings["zip.write"] = time.perf_counter() - t0
+
+        build, memory["build.full.peak"] = peak_memory(tc.compile_site, cfg)
+        archive, memory["zip.write.peak"] = peak_memory(tc.zip_site, build.files)
+        log(f"ZIP: {len(archive) / 1e6:.1f} MB in {timings['zip.write']:.2f}s | peak memory: build {memory['build.full.peak'] / 1e6:.0f} MB, zip {memory['zip.write.peak'] / 1e6:.0f} MB")
+
+    per_file, groups = output_bytes(build.files)
+    results["bytes"] = {"total": build.total_bytes(), "zip": len(archive), "files": per_file, "groups": groups}
+    return results
+
+# --- REGRESSION CHECK ---
+DEFAULT_THRESHOLDS = {"timings": 1.25, "memory": 1.20, "bytes": 1.05}  # max new/baseline ratio per section
+
+def flatten(tree, prefix=""):
+    out = {}
+    for k, v in tree.items():
+        if isinstance(v, dict): out.update(flatten(v, f"{prefix}{k}."))
+        elif isinstance(v, (int, float)): out[f"{prefix}{k}"] = v
+    return out
+
+def find_regressions(results, baseline, thresholds=None, min_seconds=0.001):
+    # thresholds: section defaults plus optional glob overrides, e.g. {"timings.build.*": 1.10}
+    # Timing deltas under min_seconds are ignored as noise
+    limits = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    patterns = [(k, v) for k, v in limits.items() if k not in DEFAULT_THRESHOLDS]
+    found = []
+    for section in DEFAULT_THRESHOLDS:
+        old_values = flatten(baseline.get(section, {}))
+        for key, new in flatten(results.get(section, {})).items():
+            old, metric = old_values.get(key), f"{section}.{key}"
+            if not old or old <= 0: continue
+            if section == "timings" and new - old < min_seconds: continue
+            limit = next((v for k, v in patterns if fnmatch.fnmatchcase(metric, k)), limits[section])
+            if new / old > limit:
+                found.append({"metric": metric, "baseline": old, "value": new, "ratio": round(new / old, 3), "limit": limit})
+    return found
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Titan compiler benchmarks on a synthetic large site.")
+    parser.add_argument("-o", "--out", default="titan-bench.json", help="Results file (default: titan-bench.json)")
+    parser.add_argument("--rows", type=int, default=10_000, help="Inventory and blog sheet rows (default: 10000)")
+    parser.add_argument("--text-kb", type=int, default=100, help="Legal page / format_text input size in KB (default: 100)")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Runs per generator/format_text measurement; the best is kept")
+    parser.add_argument("--baseline", help="Earlier results file to compare against; exits 1 on regressions")
+    parser.add_argument("--max-time-ratio", type=float, default=DEFAULT_THRESHOLDS["timings"])
+    parser.add_argument("--max-memory-ratio", type=float, default=DEFAULT_THRESHOLDS["memory"])
+    parser.add_argument("--max-bytes-ratio", type=float, default=DEFAULT_THRESHOLDS["bytes"])
+    parser.add_argument("--thresholds", help='JSON file of per-metric glob limits, e.g. {"timings.build.*": 1.1}')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.rows, args.text_kb, args.repeat)
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        old_meta = baseline.get("meta", {})
+        if (old_meta.get("rows"), old_meta.get("text_kb")) != (args.rows, args.text_kb):
+            print(f"  warning: baseline was run with --rows {old_meta.get('rows')} --text-kb {old_meta.get('text_kb')}; numbers are not comparable")
+        thresholds = {"timings": args.max_time_ratio, "memory": args.max_memory_ratio, "bytes": args.max_bytes_ratio}
+        if args.thresholds:
+            with open(args.thresholds, encoding="utf-8") as f:
+                thresholds.update(json.load(f))
+        results["baseline"] = {"file": args.baseline, "when": baseline.get("meta", {}).get("when"), "thresholds": thresholds}
+        results["regressions"] = find_regressions(results, baseline, thresholds)
+        for r in results["regressions"]:
+            print(f"  REGRESSION {r['metric']}: {r['baseline']:.6g} -> {r['value']:.6g} ({r['ratio']:.2f}x > {r['limit']}x)")
+        print(f"{len(results['regressions'])} regression(s) against {args.baseline}")
+        status = 1 if results["regressions"] else 0
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results -> {args.out}")
+    sys.exit(status)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2377 @@
+import argparse
+import base64
+import concurrent.futures
+import csv
+import functools
+import hashlib
+import html
+import io
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.parse
+import zipfile
+from collections import OrderedDict
+
+import requests
+from dataclasses import dataclass, field
+
+from titan_fonts import FONT_EXTENSIONS, closest_face, find_fonts, font_face_css, render_font, used_glyphs
+from titan_images import process_images
+from titan_search import build_index
+
+# --- TITAN COMPILER (HEADLESS) ---
+# Pure site compiler: every generator takes a site-config dict instead of reading
+# Streamlit widgets, so the same engine powers the editor preview and batch builds.
+
+DEFAULTS = {
+    # Visual DNA
+    "theme_mode": "Clean Corporate (Light)",
+    "p_color": "#0F172A",
+    "s_color": "#EF4444",
+    "h_font": "Montserrat",
+    "b_font": "Inter",
+    "border_rad": "12px",
+    "anim_type": "Fade Up",
+    "asset_mode": "inline",  # "external" writes styles.<hash>.css + app.<hash>.js shared by every page
+    "minify": False,  # strip whitespace/comments from HTML, CSS and JS in the ZIP
+    "critical_css": False,  # inline only the rules each page uses; full sheet deferred (external) or dropped (inline)
+    "sw_max_images": 60,  # service worker image cache size (LRU)
+    "sheet_cache_ttl": 300,  # seconds before cached Google Sheet rows are revalidated in the browser
+    "image_dir": "",  # local folder: image fields naming a file in it (or any local path) get responsive variants in img/; sheet rows only resolve inside it
+    "image_widths": [480, 960, 1600],
+    "image_formats": ["avif", "webp"],  # modern encodes next to the JPEG/PNG fallback; AVIF skipped if Pillow lacks it
+    "font_dir": "",  # local folder of h_font/b_font files: subset into fonts/ (WOFF2) instead of loading Google Fonts
+    # Section Manager
+    "show_hero": True,
+    "show_stats": True,
+    "show_features": True,
+    "show_pricing": True,
+    "show_inventory": True,
+    "show_blog": True,
+    "show_gallery": True,
+    "show_testimonials": True,
+    "show_faq": True,
+    "show_cta": True,
+    "show_booking": True,
+    "show_search": False,  # search.html + a sharded index of the store/blog sheets, built at download time
+    # SEO & Analytics
+    "seo_area": "Global / Online",
+    "seo_kw": "web design, no monthly fees, one time payment website, stop web rent",
+    "gsc_tag": "",
+    "ga_tag": "",
+    "og_image": "",
+    # Identity & PWA
+    "biz_name": "StopWebRent.com",
+    "biz_tagline": "Stop Renting. Start Owning.",
+    "biz_phone": "966572562151",
+    "biz_email": "hello@kaydiemscriptlab.com",
+    "prod_url": "https://www.stopwebrent.com",
+    "biz_addr": "Kaydiem Script Lab\nKanishka’s House, Garia Station Rd\nKolkata, West Bengal 700084, India",
+    "map_iframe": "",
+    "seo_d": "Stop paying monthly fees for Wix or Shopify. The Titan Engine builds ultra-fast (0.1s) websites with $0 hosting costs. Pay once, own your code forever.",
+    "logo_url": "",
+    "pwa_short": None,  # falls back to biz_name[:12]
+    "pwa_desc": "Official App",
+    "pwa_icon": None,  # falls back to logo_url
+    "lang_sheet": "",
+    "fb_link": "",
+    "ig_link": "",
+    "x_link": "",
+    "li_link": "",
+    "yt_link": "",
+    "wa_num": "966572562151",
+    # Content Blocks
+    "hero_h": "Stop Paying Rent for Your Website.",
+    "hero_sub": "The Titan Engine is the world’s first 0.1s website architecture that runs on $0 monthly fees. Pay once. Own it forever.",
+    "hero_img_1": "https://images.unsplash.com/photo-1460925895917-afdab827c52f?q=80&w=1600",
+    "hero_img_2": "https://images.unsplash.com/photo-1551288049-bebda4e38f71?q=80&w=1600",
+    "hero_img_3": "https://images.unsplash.com/photo-1526374965328-7f61d4dc18c5?q=80&w=1600",
+    "stat_1": "0.1s",
+    "label_1": "Load Speed",
+    "stat_2": "$0",
+    "label_2": "Monthly Fees",
+    "stat_3": "100%",
+    "label_3": "Ownership",
+    "f_title": "The Titan Value Pillars",
+    "feat_data": "bolt | The Performance Pillar | **0.1s High-Velocity Loading**. While traditional sites take 3–5s, Titan loads instantly.\nwallet | The Economic Pillar | **$0 Monthly Fees**. We eliminated hosting subscriptions.\ntable | The Functional Pillar | **Google Sheets CMS**. Update prices and photos directly from a simple spreadsheet.\nshield | The Authority Pillar | **Unhackable Security**. Zero-DB Architecture removes the hacker's primary entry point.\nlayers | The Reliability Pillar | **Global Edge Deployment**. Distributed across 100+ servers worldwide.\nstar | The Conversion Pillar | **One-Tap WhatsApp**. Direct-to-Chat technology.",
+    "about_h": "Control Your Empire from a Spreadsheet",
+    "about_img": "https://images.unsplash.com/photo-1543286386-713df548e9cc?q=80&w=1600",
+    "about_short": "No WordPress dashboard. No plugins to update. Just open your private Google Sheet, change a text, and watch your site update globally in seconds.",
+    "about_long": "**The Digital Landlord Trap**\nMost business owners don't realize they are trapped in a rental cycle...",
+    # Pricing Logic
+    "titan_price": "$199",
+    "titan_mo": "$0",
+    "wix_name": "Wix (Core Plan)",
+    "wix_mo": "$29/mo",
+    "save_val": "$1,466",
+    # Store & Payments
+    "sheet_url": "",
+    "custom_feat": "https://images.unsplash.com/photo-1460925895917-afdab827c52f?q=80&w=800",
+    "paypal_link": "https://paypal.me/yourid",
+    "upi_id": "yourname@upi",
+    "prerender_inventory": False,  # bake sheet rows into index.html + product/<slug>.html at build time
+    # Booking
+    "booking_embed": '<!-- Calendly inline widget begin -->\n<div class="calendly-inline-widget" data-url="https://calendly.com/titan-demo/30min" style="min-width:320px;height:630px;"></div>\n<script type="text/javascript" src="https://assets.calendly.com/assets/external/widget.js" async></script>\n<!-- Calendly inline widget end -->',
+    "booking_title": "Book an Appointment",
+    "booking_desc": "Select a time slot that works for you.",
+    # Blog Engine
+    "blog_sheet_url": "",
+    "blog_hero_title": "Latest Insights",
+    "blog_hero_sub": "Thoughts on technology, business, and freedom.",
+    "prerender_blog": False,  # render blog/<slug>.html + paginated blog.html at build time
+    "blog_per_page": 9,
+    "inv_page_size": 24,  # store cards rendered per "Load More" page
+    # Legal & Footer
+    "testi_data": "Rajesh Gupta, HVAC Business Owner | I was paying Wix $35/month for 3 years. Titan built me a faster site for a one-time fee. I stopped the bleeding and finally own my asset.\nSarah Jenkins, Cafe Owner | Updating my menu used to be a nightmare on WordPress. Now, I just open a Google Sheet on my phone, change the price, and it updates the website instantly.\nDavid Miller, Financial Consultant | Speed is everything for SEO. My old site took 4 seconds to load. My new Titan site loads in 0.1 seconds. My Google ranking jumped to Page 1 within a month.",
+    "faq_data": "Do I really pay $0 for hosting? ? Yes. We utilize 'Static Site Architecture' which allows your site to be hosted on Enterprise CDNs (like Netlify/Vercel) within their generous free tiers for small businesses.\nWhat about my Domain Name? ? You pay that directly to the registrar (like GoDaddy or Namecheap). It usually costs ~$15/year. We do not mark this up.\nCan I add a blog later? ? Yes. The Titan Engine is scalable. We can add a blog, gallery, or more pages for a one-time expansion fee.\nIs it secure? ? It is safer than WordPress. Because there is no database to hack, your site is virtually impenetrable to common SQL injection attacks.",
+    "priv_txt": "**1. Introduction & Digital Sovereignty**\nAt StopWebRent.com (operated by Kaydiem Script Lab), we treat data privacy not just as a compliance requirement, but as a fundamental architectural feature...",
+    "term_txt": "**1. Service Agreement**\nBy engaging StopWebRent.com (Kaydiem Script Lab) for web development services, you agree to these Terms...",
+}
+
+def make_config(overrides=None):
+    cfg = dict(DEFAULTS)
+    cfg.update(overrides or {})
+    if not cfg.get("pwa_short"): cfg["pwa_short"] = cfg["biz_name"][:12]
+    if cfg.get("pwa_icon") is None: cfg["pwa_icon"] = cfg["logo_url"]
+    return cfg
+
+def config_hash(cfg):
+    # Stable fingerprint of a full site config, used to key cached previews/builds
+    blob = json.dumps(make_config(cfg), sort_keys=True, default=str)
+    return hashlib.blake2b(blob.encode("utf-8"), digest_size=16).hexdigest()
+
+# --- NEW: SECTION CACHE ---
+# Shared chrome (theme CSS, nav, footer, cart, scripts...) is identical on every page of a build and
+# usually across builds, so it is memoized on a hash of the config keys each generator actually read.
+class _InputRecorder:
+    def __init__(self, cfg):
+        self.cfg, self.read = cfg, set()
+
+    def __getitem__(self, key):
+        self.read.add(key)
+        return self.cfg[key]
+
+    def get(self, key, default=None):
+        self.read.add(key)
+        return self.cfg.get(key, default)
+
+    def __contains__(self, key):
+        self.read.add(key)
+        return key in self.cfg
+
+class SectionCache:
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.inputs = {}  # generator name -> config keys it has been seen to read
+        self.hits = self.misses = 0
+        self.per_section = {}
+        self.lock = threading.Lock()
+
+    def key(self, name, cfg, keys, args):
+        values = [(k, cfg.get(k)) for k in sorted(keys)]
+        return hashlib.blake2b(repr((name, args, values)).encode("utf-8"), digest_size=16).hexdigest()
+
+    def count(self, name, hit):
+        stats = self.per_section.setdefault(name, [0, 0])
+        stats[0 if hit else 1] += 1
+        if hit: self.hits += 1
+        else: self.misses += 1
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries),
+                "sections": {name: {"hits": h, "misses": m} for name, (h, m) in self.per_section.items()}}
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.inputs.clear()
+
+SECTION_CACHE = SectionCache()
+
+def cached_section(fn):
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(cfg=None, *args):
+        cache = SECTION_CACHE
+        src = cfg if cfg is not None else {}
+        keys = cache.inputs.get(name)
+        if keys is not None:
+            key = cache.key(name, src, keys, args)
+            with cache.lock:
+                out = cache.entries.get(key)
+                if out is not None:
+                    cache.entries.move_to_end(key)
+                    cache.count(name, True)
+                    return out
+        recorder = _InputRecorder(src)
+        out = fn(recorder, *args) if cfg is not None else fn(*args)
+        with cache.lock:
+            keys = cache.inputs[name] = frozenset(recorder.read) | (keys or frozenset())
+            cache.entries[cache.key(name, src, keys, args)] = out
+            cache.count(name, False)
+            while len(cache.entries) > cache.max_entries: cache.entries.popitem(last=False)
+        return out
+    return wrapper
+
+_MD_BOLD = re.compile(r'\*\*(.*?)\*\*')
+_MD_LINK = re.compile(r'\[([^\]\n]+)\]\(([^)\s]+)\)')
+_MD_UL = '<ul style="margin-bottom:1rem; padding-left:1.5rem;">'
+_MD_LI = '<li style="margin-bottom:0.5rem; opacity:0.9; color:inherit;">'
+_MD_H = "style='margin-top:1.5rem; margin-bottom:0.5rem; color:var(--p); font-size:1.25rem;'"
+_MD_P = "<p style='margin-bottom:1rem; opacity:0.9; color:inherit;'>"
+
+def _md_link(m):
+    return f'<a href="{attr(m.group(2))}">{m.group(1)}</a>'
+
+@functools.lru_cache(maxsize=256)
+def format_text(text):
+    # Inline markup in one regex pass over the whole text, then one pass over the lines; output parts are
+    # joined once. Memoized: the same about/legal/feature text is rendered for every preview rerun and
+    # again for every page of the ZIP.
+    # Blocks: "* " / "- " lists, "#" headings, a line that is all **bold** is a heading, otherwise a paragraph.
+    # Inline: **bold**, [text](url).
+    if not text: return ""
+    if "](" in text: text = _MD_LINK.sub(_md_link, text)
+    if "**" in text: text = _MD_BOLD.sub(r"<strong>\1</strong>", text)
+    parts, in_list = [], False
+    add = parts.append
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line: continue
+        if line[1:2] == " " and line[0] in "*-":
+            if not in_list:
+                add(_MD_UL)
+                in_list = True
+            add(f"{_MD_LI}{line[2:]}</li>")
+            continue
+        if in_list:
+            add("</ul>")
+            in_list = False
+        if line[0] == "#":
+            level = len(line) - len(line.lstrip("#"))
+            if level <= 6 and line[level:level + 1] == " ":
+                tag = f"h{min(level + 1, 4)}"
+                add(f"<{tag} {_MD_H}>{line[level + 1:].strip()}</{tag}>")
+                continue
+        if line.startswith("<strong>") and line.endswith("</strong>"):
+            add(f"<h3 {_MD_H}>{line.replace('<strong>', '').replace('</strong>', '')}</h3>")
+        else:
+            add(f"{_MD_P}{line}</p>")
+    if in_list: add("</ul>")
+    return "".join(parts)
+
+@cached_section
+def gen_schema(cfg):
+    schema = {
+        "@context": "https://schema.org",
+        "@type": "LocalBusiness",
+        "name": cfg["biz_name"],
+        "image": cfg["logo_url"] or image_url(cfg, cfg["hero_img_1"]),
+        "telephone": cfg["biz_phone"],
+        "email": cfg["biz_email"],
+        "areaServed": cfg["seo_area"],
+        "address": {"@type": "PostalAddress", "streetAddress": cfg["biz_addr"]},
+        "url": cfg["prod_url"],
+        "description": cfg["seo_d"]
+    }
+    return f'<script type="application/ld+json">{json.dumps(schema)}</script>'
+
+# --- NEW: PWA GENERATORS ---
+def gen_pwa_manifest(cfg):
+    return json.dumps({
+        "name": cfg["biz_name"],
+        "short_name": cfg["pwa_short"],
+        "start_url": "./index.html",
+        "display": "standalone",
+        "background_color": "#ffffff",
+        "theme_color": cfg["p_color"],
+        "description": cfg["pwa_desc"],
+        "icons": [{"src": cfg["pwa_icon"], "sizes": "512x512", "type": "image/png"}]
+    })
+
+def gen_sw(cfg, files):
+    # Built from the files actually in the ZIP: the version is a hash of their contents, so every deploy
+    # installs a fresh shell cache and activate() deletes the old ones (including the legacy 'titan-store').
+    names = sorted(n for n in files if n not in ("service-worker.js", "_headers"))
+    version = content_hash("".join(f"{n}:{content_hash(files[n])}" for n in names))
+    # Precache only the app shell; blog pages, translations, search and detail pages go through networkFirst
+    shell = [f"./{n}" for n in names if n in ("index.html", "contact.html", "manifest.json") or ("/" not in n and n.endswith((".css", ".js")))]
+    sheets = [u for u in (cfg["sheet_url"], cfg["blog_sheet_url"]) if u]
+    return f"""
+    const VERSION = '{version}';
+    const SHELL_CACHE = 'titan-shell-' + VERSION;
+    const PAGE_CACHE = 'titan-pages-' + VERSION;
+    const IMG_CACHE = 'titan-img';
+    const KEEP = [SHELL_CACHE, PAGE_CACHE, IMG_CACHE];  // the old 'titan-data' sheet cache is dropped too
+    const SHELL = {json.dumps(shell)};
+    const SHEETS = {json.dumps(sheets)}.map((u) => new URL(u, self.location).href);
+    const MAX_IMAGES = {int(cfg["sw_max_images"])};
+
+    self.addEventListener('install', (e) => {{
+      e.waitUntil(caches.open(SHELL_CACHE).then((cache) => cache.addAll(SHELL)).then(() => self.skipWaiting()));
+    }});
+    self.addEventListener('activate', (e) => {{
+      e.waitUntil(caches.keys()
+        .then((keys) => Promise.all(keys.filter((k) => !KEEP.includes(k)).map((k) => caches.delete(k))))
+        .then(() => self.clients.claim()));
+    }});
+
+    // Images: cache-first, LRU-trimmed to MAX_IMAGES entries (re-inserting on hit keeps recency order)
+    async function cacheFirstImage(req) {{
+      const cache = await caches.open(IMG_CACHE);
+      const cached = await cache.match(req);
+      if (cached) {{
+        const copy = cached.clone();  // before respondWith starts reading the body
+        cache.delete(req).then(() => cache.put(req, copy));
+        return cached;
+      }}
+      const res = await fetch(req);
+      if (res.ok || res.type === 'opaque') {{
+        await cache.put(req, res.clone());
+        const keys = await cache.keys();
+        for (let i = 0; i < keys.length - MAX_IMAGES; i++) await cache.delete(keys[i]);
+      }}
+      return res;
+    }}
+    // Pages outside the shell (product/blog detail): network-first so nobody is stuck on a stale copy
+    async function networkFirst(req) {{
+      const cache = await caches.open(PAGE_CACHE);
+      try {{
+        const res = await fetch(req);
+        if (res.ok) cache.put(req, res.clone());
+        return res;
+      }} catch (err) {{
+        return (await cache.match(req)) || caches.match('./index.html');
+      }}
+    }}
+
+    self.addEventListener('fetch', (e) => {{
+      const req = e.request;
+      if (req.method !== 'GET') return;
+      const url = new URL(req.url);
+      if (SHEETS.includes(req.url) || url.searchParams.get('output') === 'csv') return;  // TitanData caches sheet rows itself; revalidation must reach the network
+      if (req.destination === 'image') {{ e.respondWith(cacheFirstImage(req)); return; }}
+      if (url.origin !== location.origin) return;
+      // Shell pages read their own ?item= / ?id= params, so navigations ignore the query string
+      const shellReq = url.pathname.endsWith('/') ? './index.html' : req;
+      e.respondWith(caches.match(shellReq, {{ cacheName: SHELL_CACHE, ignoreSearch: req.mode === 'navigate' }})
+        .then((hit) => hit || networkFirst(req)));
+    }});
+    """
+
+@cached_section
+def get_theme_css(cfg):
+    theme_mode = cfg["theme_mode"]
+    anim_type = cfg["anim_type"]
+    p_color = cfg["p_color"]
+    s_color = cfg["s_color"]
+    border_rad = cfg["border_rad"]
+    h_font = cfg["h_font"]
+    b_font = cfg["b_font"]
+    bg_color, text_color, card_bg, glass_nav = "#ffffff", "#0f172a", "#ffffff", "rgba(255, 255, 255, 0.95)"
+    
+    if "Midnight" in theme_mode:
+        bg_color, text_color, card_bg, glass_nav = "#0f172a", "#f8fafc", "#1e293b", "rgba(15, 23, 42, 0.9)"
+    elif "Cyberpunk" in theme_mode:
+        bg_color, text_color, card_bg, glass_nav = "#050505", "#00ff9d", "#111", "rgba(0,0,0,0.8)"
+    elif "Luxury" in theme_mode:
+        bg_color, text_color, card_bg, glass_nav = "#1c1c1c", "#D4AF37", "#2a2a2a", "rgba(28,28,28,0.95)"
+    elif "Forest" in theme_mode:
+        bg_color, text_color, card_bg, glass_nav = "#f1f8e9", "#1b5e20", "#ffffff", "rgba(241,248,233,0.9)"
+    elif "Ocean" in theme_mode:
+        bg_color, text_color, card_bg, glass_nav = "#e0f7fa", "#006064", "#ffffff", "rgba(224,247,250,0.9)"
+    elif "Stark" in theme_mode:
+        bg_color, text_color, card_bg, glass_nav = "#ffffff", "#000000", "#ffffff", "rgba(255,255,255,1)"
+
+    anim_css = ""
+    if anim_type == "Fade Up":
+        anim_css = ".reveal { opacity: 0; transform: translateY(30px); transition: all 0.8s ease-out; } .reveal.active { opacity: 1; transform: translateY(0); }"
+    elif anim_type == "Zoom In":
+        anim_css = ".reveal { opacity: 0; transform: scale(0.95); transition: all 0.8s cubic-bezier(0.175, 0.885, 0.32, 1.275); } .reveal.active { opacity: 1; transform: scale(1); }"
+    if anim_css: anim_css += " @media (prefers-reduced-motion: reduce) { .reveal { opacity: 1; transform: none; transition: none; } }"
+    
+    hero_css = """
+    .hero { position: relative; min-height: 90vh; overflow: hidden; display: flex; align-items: center; justify-content: center; text-align: center; color: white; padding-top: 80px; background-color: var(--p); }
+    .carousel-slide { position: absolute; top: 0; left: 0; width: 100%; height: 100%; background-size: cover; background-position: center; opacity: 0; transition: opacity 1.5s ease-in-out; z-index: 0; }
+    .carousel-slide.active { opacity: 1; }
+    .slide-img { width: 100%; height: 100%; object-fit: cover; }
+    .hero-overlay { background: rgba(0,0,0,0.5); position: absolute; top: 0; left: 0; width: 100%; height: 100%; z-index: 1; }
+    .hero-content { z-index: 2; position: relative; animation: slideUp 1s ease-out; width: 100%; padding: 0 20px; }
+    @keyframes slideUp { from { opacity:0; transform: translateY(30px); } to { opacity:1; transform: translateY(0); } }
+    """
+
+    # Added CSS for Shopping Cart Modal & SOCIAL SHARE
+    cart_css = """
+    #cart-float { position: fixed; bottom: 100px; right: 30px; background: var(--p); color: white; padding: 15px 20px; border-radius: 50px; box-shadow: 0 10px 20px rgba(0,0,0,0.2); cursor: pointer; z-index: 998; display: flex; align-items: center; gap: 10px; font-weight: bold; }
+    #cart-modal { display: none; position: fixed; top: 50%; left: 50%; transform: translate(-50%, -50%); background: var(--card); width: 90%; max-width: 500px; padding: 2rem; border-radius: 16px; box-shadow: 0 20px 50px rgba(0,0,0,0.3); z-index: 1001; border: 1px solid rgba(128,128,128,0.2); }
+    #cart-overlay { display: none; position: fixed; top: 0; left: 0; width: 100%; height: 100%; background: rgba(0,0,0,0.5); z-index: 1000; }
+    .cart-item { display: flex; justify-content: space-between; border-bottom: 1px solid #eee; padding: 10px 0; }
+    
+    /* SOCIAL SHARE STYLES */
+    .share-row { display: flex; gap: 10px; margin-top: 20px; flex-wrap: wrap; }
+    .share-label { font-weight: bold; margin-right: 5px; font-size: 0.9rem; align-self: center; }
+    .share-btn { width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; border-radius: 50%; color: white; transition: 0.3s; border: none; cursor: pointer; text-decoration: none; }
+    .share-btn:hover { transform: translateY(-3px); filter: brightness(1.1); }
+    .share-btn svg { width: 18px; height: 18px; fill: white; }
+    .bg-fb { background: #1877F2; }
+    .bg-x { background: #000000; }
+    .bg-li { background: #0A66C2; }
+    .bg-wa { background: #25D366; }
+    .bg-rd { background: #FF4500; }
+    """
+
+    faces_css = font_face_css(cfg.get("@fonts") or [])
+    return f"""
+    {faces_css}
+    :root {{
+        --p: {p_color}; --s: {s_color}; --bg: {bg_color}; --txt: {text_color}; --card: {card_bg};
+        --radius: {border_rad}; --nav: {glass_nav};
+        --h-font: '{h_font}', sans-serif; --b-font: '{b_font}', sans-serif;
+    }}
+    * {{ box-sizing: border-box; }}
+    [hidden] {{ display: none !important; }}
+    html {{ scroll-behavior: smooth; font-size: 16px; }}
+    body {{ background-color: var(--bg); color: var(--txt); font-family: var(--b-font); margin: 0; line-height: 1.6; overflow-x: hidden; }}
+    
+    p, h1, h2, h3, h4, h5, h6, span, li, div {{ color: inherit; }}
+    .legal-text {{ color: var(--txt) !important; }}
+    
+    h1, h2, h3, h4 {{ font-family: var(--h-font); color: var(--p); line-height: 1.1; margin-bottom: 1rem; }}
+    strong {{ color: var(--p); font-weight: 800; }}
+    
+    /* MOBILE OPTIMIZED TYPOGRAPHY */
+    h1 {{ font-size: clamp(2.5rem, 5vw, 4.5rem); }}
+    h2 {{ font-size: clamp(2rem, 4vw, 3rem); }}
+    
+    /* FORCE HERO TEXT WHITE */
+    .hero h1 {{ color: #ffffff !important; text-shadow: 0 4px 20px rgba(0,0,0,0.4); }}
+    .hero p {{ color: rgba(255,255,255,0.95) !important; font-size: clamp(1.1rem, 2vw, 1.3rem); max-width: 700px; margin: 0 auto 2rem auto; text-shadow: 0 2px 10px rgba(0,0,0,0.4); }}
+    
+    input, textarea, select {{ width: 100%; padding: 0.8rem; margin-bottom: 1rem; border: 1px solid #ccc; border-radius: 6px; font-family: inherit; }}
+    label {{ color: var(--txt); font-weight: bold; margin-bottom: 0.5rem; display: block; }}
+
+    .container {{ max-width: 1280px; margin: 0 auto; padding: 0 20px; }}
+    .btn {{ display: inline-block; padding: 1rem 2.5rem; border-radius: var(--radius); font-weight: 700; text-decoration: none; transition: 0.3s; text-transform: uppercase; letter-spacing: 0.5px; cursor: pointer; border: none; text-align: center; }}
+    .btn-primary {{ background: var(--p); color: white !important; }}
+    .btn-accent {{ background: var(--s); color: white !important; box-shadow: 0 10px 25px -5px var(--s); }}
+    .btn:hover {{ transform: translateY(-3px); filter: brightness(1.15); }}
+    
+    /* Nav */
+    nav {{ position: fixed; top: 0; width: 100%; z-index: 1000; background: var(--nav); backdrop-filter: blur(12px); border-bottom: 1px solid rgba(100,100,100,0.1); padding: 1rem 0; }}
+    .nav-flex {{ display: flex; justify-content: space-between; align-items: center; }}
+    .nav-links {{ display: flex; align-items: center; }}
+    .nav-links a {{ margin-left: 2rem; text-decoration: none; font-weight: 600; color: var(--txt); font-size: 0.9rem; opacity: 0.8; transition:0.2s; }}
+    .nav-links a:hover {{ opacity: 1; color: var(--s); }}
+    .mobile-menu {{ display: none; font-size: 1.5rem; cursor: pointer; }}
+    
+    {hero_css}
+    {cart_css}
+    
+    section {{ padding: clamp(3rem, 8vw, 5rem) 0; }}
+    .section-head {{ text-align: center; margin-bottom: clamp(2rem, 5vw, 4rem); }}
+    
+    /* GRIDS */
+    .grid-3 {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 2rem; }}
+    .about-grid {{ display: grid; grid-template-columns: 1fr 1fr; gap: 4rem; align-items: center; }}
+    .contact-grid {{ display: grid; grid-template-columns: 1fr 2fr; gap: 3rem; }}
+    .detail-view {{ display: grid; grid-template-columns: 1fr 1fr; gap: 4rem; align-items: start; }}
+    
+    .card {{ background: var(--card); padding: 2rem; border-radius: var(--radius); border: 1px solid rgba(100,100,100,0.1); transition: 0.3s; height: 100%; display: flex; flex-direction: column; }}
+    .card:hover {{ transform: translateY(-5px); box-shadow: 0 20px 40px -10px rgba(0,0,0,0.1); border-color: var(--s); }}
+    
+    /* DARK MODE FIX: FORCE CARD TEXT TO USE TEXT COLOR */
+    .card h1, .card h2, .card h3, .card h4, .card h5, .card h6, .card a {{ color: var(--txt) !important; text-decoration: none; }}
+    .card p {{ color: var(--txt); opacity: 0.9; }}
+    
+    .prod-img {{ width: 100%; height: 250px; object-fit: cover; border-radius: calc(var(--radius) - 4px); margin-bottom: 1.5rem; background: #f1f5f9; }}
+    
+    /* PRICING & FAQ */
+    .pricing-wrapper {{ overflow-x: auto; margin: 2rem 0; -webkit-overflow-scrolling: touch; padding-bottom: 1rem; }}
+    .pricing-table {{ width: 100%; border-collapse: collapse; min-width: 600px; }}
+    .pricing-table th {{ background: var(--p); color: white; padding: 1.5rem; text-align: left; font-size: 1.1rem; }}
+    .pricing-table td {{ padding: 1.5rem; border-bottom: 1px solid rgba(100,100,100,0.1); background: var(--card); color: var(--txt); }}
+    .pricing-table tr:last-child td {{ font-weight: bold; font-size: 1.2rem; background: rgba(var(--s), 0.1); border-bottom: none; }}
+
+    details {{ background: var(--card); border: 1px solid rgba(100,100,100,0.1); border-radius: 8px; margin-bottom: 1rem; padding: 1rem; cursor: pointer; color: var(--txt); }}
+    details summary {{ font-weight: bold; font-size: 1.1rem; color: var(--txt); }}
+    details p {{ margin-top: 1rem; margin-bottom: 0; opacity: 0.9; color: var(--txt); }}
+
+    /* Footer & Social */
+    footer {{ background: var(--p); color: white; padding: 4rem 0; margin-top: auto; }}
+    .footer-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 3rem; }}
+    footer a {{ color: rgba(255,255,255,0.8) !important; text-decoration: none; display: block; margin-bottom: 0.5rem; transition: 0.3s; }}
+    footer a:hover {{ color: #ffffff !important; text-decoration: underline; }}
+    .social-icon {{ width: 24px; height: 24px; fill: rgba(255,255,255,0.7); transition: 0.3s; }}
+    .social-icon:hover {{ fill: #ffffff; transform: scale(1.1); }}
+
+    /* BLOG & SHARE */
+    .blog-badge {{ background: var(--s); color: white; padding: 0.3rem 0.8rem; border-radius: 50px; font-size: 0.75rem; text-transform: uppercase; font-weight: bold; width: fit-content; margin-bottom: 1rem; display:inline-block; }}
+    
+    {anim_css}
+    
+    /* MOBILE OPTIMIZATIONS (FIXED) */
+    @media (max-width: 768px) {{
+        .nav-links {{ 
+            position: fixed; top: 70px; left: -100%; width: 100%; height: calc(100vh - 70px); 
+            background: var(--bg); flex-direction: column; padding: 2rem; transition: 0.3s; 
+            align-items: flex-start; justify-content: flex-start; border-top: 1px solid rgba(0,0,0,0.1); overflow-y: auto; gap: 1.5rem;
+        }}
+        .nav-links.active {{ left: 0; }}
+        .nav-links a {{ margin-left: 0; font-size: 1.2rem; }}
+        .mobile-menu {{ display: block; }}
+        
+        .hero {{ min-height: 60vh; padding-top: 100px; }}
+        .about-grid, .contact-grid, .detail-view {{ grid-template-columns: 1fr !important; gap: 2rem; }}
+        
+        /* Mobile Image Sizing Fix */
+        .prod-img, .about-grid img {{ height: auto !important; aspect-ratio: 16/9; }}
+        
+        /* Padding Fixes for Mobile */
+        .container {{ padding: 0 1.5rem; }}
+        
+        .btn {{ width: 100%; margin-bottom: 0.5rem; }}
+        .hero-content .btn {{ width: auto; }}
+        
+        /* Cart Position Adjustment */
+        #cart-float {{ bottom: 110px; right: 20px; }}
+    }}
+    """
+
+@cached_section
+def gen_nav(cfg):
+    logo_url = cfg["logo_url"]
+    show_blog = cfg["show_blog"]
+    show_booking = cfg["show_booking"]
+    lang_sheet = cfg["lang_sheet"]
+    biz_phone = cfg["biz_phone"]
+    biz_name = cfg["biz_name"]
+    show_features = cfg["show_features"]
+    show_pricing = cfg["show_pricing"]
+    show_inventory = cfg["show_inventory"]
+    show_search = cfg["show_search"]
+    logo_display = f'<img src="{logo_url}" height="40" alt="{biz_name} Logo">' if logo_url else f'<span style="font-weight:900; font-size:1.5rem; color:var(--p)">{biz_name}</span>'
+    blog_link = '<a href="blog.html" onclick="toggleMenu()">Blog</a>' if show_blog else ''
+    book_link = '<a href="booking.html" onclick="toggleMenu()">Book Now</a>' if show_booking else ''
+    
+    # NEW: Lang Switch - filled in per page by localize_page()
+    lang_btn = '<!--lang-switch-->' if lang_sheet else ''
+    
+    return f"""
+    <nav><div class="container nav-flex">
+        <a href="index.html" style="text-decoration:none">{logo_display}</a>
+        <div class="mobile-menu" onclick="document.querySelector('.nav-links').classList.toggle('active')">☰</div>
+        <div class="nav-links">
+            <a href="index.html" onclick="toggleMenu()">Home</a>
+            {'<a href="index.html#features" onclick="toggleMenu()">Features</a>' if show_features else ''}
+            {'<a href="index.html#pricing" onclick="toggleMenu()">Savings</a>' if show_pricing else ''}
+            {'<a href="index.html#inventory" onclick="toggleMenu()">Store</a>' if show_inventory else ''}
+            {blog_link}
+            {book_link}
+            {'<a href="search.html" onclick="toggleMenu()">Search</a>' if show_search else ''}
+            {lang_btn}
+            <a href="contact.html" onclick="toggleMenu()">Contact</a>
+            <a href="tel:{biz_phone}" class="btn-accent" style="padding:0.6rem 1.5rem; margin-left:1.5rem; margin-bottom:0; border-radius:50px; color:white !important; width:auto; text-align:center; display:inline-block;">Call Now</a>
+        </div>
+    </div></nav>
+    """
+
+# --- NEW: RESPONSIVE IMAGES ---
+def local_image_path(cfg, ref, sheet=False):
+    # Image fields may name a file in image_dir or any local path; URLs are left alone. Sheet cells are remote
+    # data, so they only resolve inside image_dir - never to an arbitrary file on the build machine.
+    if not ref or ref.startswith(("http://", "https://", "//", "data:")): return None
+    if cfg["image_dir"]:
+        base = os.path.realpath(cfg["image_dir"])
+        path = os.path.realpath(os.path.join(base, ref))
+        if os.path.commonpath([base, path]) == base and os.path.isfile(path): return path
+    return ref if not sheet and os.path.isfile(ref) else None
+
+def build_images(cfg, products=None):
+    # ref -> variant info for every local image the site uses, plus the encoded files for the ZIP
+    refs = [cfg["hero_img_1"], cfg["hero_img_2"], cfg["hero_img_3"], cfg["about_img"], cfg["custom_feat"]]
+    paths = {ref: local_image_path(cfg, ref) for ref in dict.fromkeys(refs)}
+    for ref in dict.fromkeys(product_fields(cfg, row)[3] for _, row in products or []):
+        paths[ref] = paths.get(ref) or local_image_path(cfg, ref, sheet=True)
+    paths = {ref: path for ref, path in paths.items() if path}
+    if not paths: return {}, {}
+    done = process_images(paths.values(), widths=tuple(cfg["image_widths"]), formats=tuple(cfg["image_formats"]))
+    images, files = {}, {}
+    for ref, path in paths.items():
+        if not done[path]: continue  # not a decodable image: the page keeps the raw ref
+        images[ref], variant_files = done[path]
+        files.update(variant_files)
+    return images, files
+
+def image_src(cfg, ref):
+    # Largest fallback variant for processed images (CSS backgrounds, schema), the ref itself otherwise
+    info = (cfg.get("@images") or {}).get(ref)
+    return info["src"] if info else ref
+
+def image_url(cfg, ref):
+    info = (cfg.get("@images") or {}).get(ref)
+    return f"{cfg['prod_url'].rstrip('/')}/{info['src']}" if info else ref
+
+def picture(cfg, ref, sizes, attrs):
+    # <picture> with AVIF/WebP sources, srcset and intrinsic size for processed images; a plain <img> otherwise
+    info = (cfg.get("@images") or {}).get(ref)
+    if not info: return f'<img src="{attr(ref)}" {attrs}>'
+    sources = "".join(f'<source type="{mime}" srcset="{srcset}" sizes="{sizes}">' for mime, srcset in info["sources"].items() if mime != info["fallback"])
+    return (f'<picture>{sources}<img src="{info["src"]}" srcset="{info["sources"][info["fallback"]]}" sizes="{sizes}" '
+            f'width="{info["width"]}" height="{info["height"]}" {attrs}></picture>')
+
+def gen_hero(cfg):
+    hero_h = cfg["hero_h"]
+    hero_sub = cfg["hero_sub"]
+    images = cfg.get("@images") or {}
+    def slide(ref, first):
+        if first:
+            # LCP element: rendered eagerly, high priority, and preloaded from <head> by build_page
+            if ref in images: return '<div class="carousel-slide active">' + picture(cfg, ref, "100vw", 'alt="" class="slide-img" fetchpriority="high"') + '</div>'
+            return f'<div class="carousel-slide active" style="background-image: url(\'{ref}\')"></div>'
+        # Later slides stay out of the first paint; the carousel script wakes them after load
+        if ref in images: return '<div class="carousel-slide"><template>' + picture(cfg, ref, "100vw", 'alt="" class="slide-img"') + '</template></div>'
+        return f'<div class="carousel-slide" data-bg="{attr(ref)}"></div>'
+    return f"""
+    <section class="hero">
+        <div class="hero-overlay"></div>
+        {slide(cfg["hero_img_1"], True)}
+        {slide(cfg["hero_img_2"], False)}
+        {slide(cfg["hero_img_3"], False)}
+        
+        <div class="container hero-content">
+            <h1>{hero_h}</h1>
+            <p>{hero_sub}</p>
+            <div style="display:flex; gap:1rem; justify-content:center; flex-wrap:wrap;">
+                <a href="#inventory" class="btn btn-accent">Explore Now</a>
+                <a href="contact.html" class="btn" style="background:rgba(255,255,255,0.2); backdrop-filter:blur(10px); color:white;">Contact Us</a>
+            </div>
+        </div>
+    </section>
+    <script>
+    (() => {{
+        const slides = document.querySelectorAll('.carousel-slide');
+        let currentSlide = 0, timer = null;
+        function wake(slide) {{
+            const tpl = slide.querySelector('template');
+            if (tpl) slide.replaceChildren(tpl.content);
+            if (slide.dataset.bg) {{ slide.style.backgroundImage = `url('${{slide.dataset.bg}}')`; delete slide.dataset.bg; }}
+        }}
+        function nextSlide() {{
+            slides[currentSlide].classList.remove('active');
+            currentSlide = (currentSlide + 1) % slides.length;
+            wake(slides[currentSlide]);
+            slides[currentSlide].classList.add('active');
+        }}
+        function start() {{ if (!timer && slides.length > 1) timer = setInterval(nextSlide, 4000); }}
+        function stop() {{ clearInterval(timer); timer = null; }}
+        // Slides 2-3 only start downloading once slide 1 (the LCP image) and the page are done
+        window.addEventListener('load', () => setTimeout(() => slides.forEach(wake), 0));
+        // No rotating (or decoding) while the tab is in the background
+        document.addEventListener('visibilitychange', () => document.hidden ? stop() : start());
+        if (!document.hidden) start();
+    }})();
+    </script>
+    """
+
+def gen_hero_preload(cfg):
+    # Hero slide 1 is a CSS background or a <picture>: either way the browser finds it late without a hint
+    ref = cfg["hero_img_1"]
+    info = (cfg.get("@images") or {}).get(ref)
+    if not info: return f'<link rel="preload" as="image" href="{attr(ref)}" fetchpriority="high">'
+    mime, srcset = next(iter(info["sources"].items()))  # the <source> the <picture> prefers when supported
+    href = f' href="{info["src"]}"' if mime == info["fallback"] else ""
+    return f'<link rel="preload" as="image" type="{mime}"{href} imagesrcset="{srcset}" imagesizes="100vw" fetchpriority="high">'
+
+def get_simple_icon(name):
+    # (Preserved icon logic)
+    name = name.lower().strip()
+    if "code" in name: return '<svg viewBox="0 0 24 24" width="32" height="32" fill="currentColor"><path d="M9.4 16.6L4.8 12l4.6-4.6L8 6l-6 6 6 6 1.4-1.4zm5.2 0l4.6-4.6-4.6-4.6L16 6l6 6-6 6-1.4-1.4z"/></svg>'
+    if "shield" in name: return '<svg viewBox="0 0 24 24" width="32" height="32" fill="currentColor"><path d="M12 1L3 5v6c0 5.55 3.84 10.74 9 12 5.16-1.26 9-6.45 9-12V5l-9-4zm0 10.99h7c-.53 4.12-3.28 7.79-7 8.94V12H5V6.3l7-3.11v8.8z"/></svg>'
+    if "bolt" in name: return '<svg viewBox="0 0 24 24" width="32" height="32" fill="currentColor"><path d="M11 21h-1l1-7H7.5c-.58 0-.57-.32-.38-.66.19-.34.05-.08.07-.12C8.48 10.94 10.42 7.54 13 3h1l-1 7h3.5c.49 0 .56.33.47.51l-.07.15C12.96 17.55 11 21 11 21z"/></svg>'
+    if "star" in name: return '<svg viewBox="0 0 24 24" width="32" height="32" fill="currentColor"><path d="M12 17.27L18.18 21l-1.64-7.03L22 9.24l-7.19-.61L12 2 9.19 8.63 2 9.24l5.46 4.73L5.82 21z"/></svg>'
+    if "heart" in name: return '<svg viewBox="0 0 24 24" width="32" height="32" fill="currentColor"><path d="M12 21.35l-1.45-1.32C5.4 15.36 2 12.28 2 8.5 2 5.42 4.42 3 7.5 3c1.74 0 3.41.81 4.5 2.09C13.09 3.81 14.76 3 16.5 3 19.58 3 22 5.42 22 8.5c0 3.78-3.4 6.86-8.55 11.54L12 21.35z"/></svg>'
+    if "wallet" in name: return '<svg viewBox="0 0 24 24" width="32" height="32" fill="currentColor"><path d="M21 18v1c0 1.1-.9 2-2 2H5c-1.11 0-2-.9-2-2V5c0-1.1.89-2 2-2h14c1.1 0 2 .9 2 2v1h-9c-1.11 0-2 .9-2 2v8c0 1.1.89 2 2 2h9zm-9-2h10V8H12v8zm4-2.5c-.83 0-1.5-.67-1.5-1.5s.67-1.5 1.5-1.5 1.5.67 1.5 1.5-.67 1.5-1.5 1.5z"/></svg>'
+    if "table" in name: return '<svg viewBox="0 0 24 24" width="32" height="32" fill="currentColor"><path d="M19 3H5c-1.1 0-2 .9-2 2v14c0 1.1.9 2 2 2h14c1.1 0 2-.9 2-2V5c0-1.1-.9-2-2-2zM5 19V5h14v14H5zm2-2h10v-2H7v2zm0-4h10v-2H7v2zm0-4h10V7H7v2z"/></svg>'
+    return '<svg viewBox="0 0 24 24" width="32" height="32" fill="currentColor"><path d="M12 2C6.48 2 2 6.48 2 12s4.48 10 10 10 10-4.48 10-10S17.52 2 12 2zm-2 15l-5-5 1.41-1.41L10 14.17l7.59-7.59L19 8l-9 9z"/></svg>'
+
+def gen_features(cfg):
+    f_title = cfg["f_title"]
+    feat_data = cfg["feat_data"]
+    cards = ""
+    lines = [x for x in feat_data.split('\n') if x.strip()]
+    for line in lines:
+        if "|" in line:
+            parts = line.split('|')
+            if len(parts) >= 3:
+                icon_code = get_simple_icon(parts[0])
+                title = parts[1].strip()
+                desc = parts[2].strip()
+                cards += f"""<div class="card reveal"><div style="color:var(--s); margin-bottom:1rem;">{icon_code}</div><h3>{title}</h3><div>{format_text(desc)}</div></div>"""
+    return f"""<section id="features"><div class="container"><div class="section-head reveal"><h2>{f_title}</h2></div><div class="grid-3">{cards}</div></div></section>"""
+
+def gen_stats(cfg):
+    stat_1 = cfg["stat_1"]
+    label_1 = cfg["label_1"]
+    stat_2 = cfg["stat_2"]
+    label_2 = cfg["label_2"]
+    stat_3 = cfg["stat_3"]
+    label_3 = cfg["label_3"]
+    return f"""
+    <div style="background:var(--p); color:white; padding:3rem 0; text-align:center;">
+        <div class="container grid-3">
+            <div class="reveal"><h3 style="color:#ffffff; margin:0; font-size:3rem;">{stat_1}</h3><p style="color:rgba(255,255,255,0.8); margin:0;">{label_1}</p></div>
+            <div class="reveal"><h3 style="color:#ffffff; margin:0; font-size:3rem;">{stat_2}</h3><p style="color:rgba(255,255,255,0.8); margin:0;">{label_2}</p></div>
+            <div class="reveal"><h3 style="color:#ffffff; margin:0; font-size:3rem;">{stat_3}</h3><p style="color:rgba(255,255,255,0.8); margin:0;">{label_3}</p></div>
+        </div>
+    </div>
+    """
+
+def gen_pricing_table(cfg):
+    show_pricing = cfg["show_pricing"]
+    wix_name = cfg["wix_name"]
+    titan_price = cfg["titan_price"]
+    titan_mo = cfg["titan_mo"]
+    wix_mo = cfg["wix_mo"]
+    save_val = cfg["save_val"]
+    if not show_pricing: return ""
+    return f"""
+    <section id="pricing"><div class="container">
+        <div class="section-head reveal"><h2>The Cost of Ownership</h2><p>See how the "Monthly Trap" adds up over 5 years.</p></div>
+        <div class="pricing-wrapper reveal">
+            <table class="pricing-table">
+                <thead>
+                    <tr><th style="width:40%">Expense Category</th><th style="background:var(--s); font-size:1.2rem;">Titan Engine (Us)</th><th>{wix_name}</th></tr>
+                </thead>
+                <tbody>
+                    <tr><td>Initial Setup Fee</td><td><strong>{titan_price}</strong></td><td>$0</td></tr>
+                    <tr><td>Annual Costs</td><td><strong>{titan_mo}</strong></td><td>{wix_mo}</td></tr>
+                    <tr><td><strong>Your 5-Year Savings</strong></td><td style="color:var(--s); font-size:1.3rem;">You Save {save_val}</td><td>$0</td></tr>
+                </tbody>
+            </table>
+        </div>
+    </div></section>
+    """
+
+def data_in_app_js(cfg):
+    # The parser + TitanData ride in the shared app script for external builds
+    return cfg["asset_mode"] == "external"
+
+def gen_csv_parser(cfg):
+    if data_in_app_js(cfg): return ""
+    return f"<script>{gen_csv_parser_js(cfg)}</script>"
+
+def gen_csv_parser_js(cfg):
+    # Streaming RFC 4180 CSV engine + Markdown parser. csvStream() is fed text chunks and returns finished
+    # rows; quoted fields may hold commas, "" escapes and line breaks. csvWorker() runs it on a fetch
+    # stream inside a Web Worker and posts row batches back (header and blank rows dropped).
+    return """
+    function csvStream() {
+        let buf = '', pos = 0, inQuote = false;
+        function splitRow(line) {
+            const out = [];
+            let i = 0;
+            while (i <= line.length) {
+                let s = i, val = '';
+                while (line[s] === ' ') s++;
+                if (line[s] === '"') {
+                    let j = s + 1;
+                    for (;;) {
+                        const k = line.indexOf('"', j);
+                        if (k < 0) { val += line.slice(j); i = line.length; break; }
+                        val += line.slice(j, k);
+                        if (line[k + 1] === '"') { val += '"'; j = k + 2; } else { i = k + 1; break; }
+                    }
+                }
+                const comma = line.indexOf(',', i);
+                val += comma < 0 ? line.slice(i) : line.slice(i, comma);
+                i = comma < 0 ? line.length + 1 : comma + 1;
+                out.push(val.trim());
+            }
+            return out;
+        }
+        return {
+            push(chunk) {
+                buf += chunk;
+                const rows = [];
+                let start = 0;
+                for (let i = pos; i < buf.length; i++) {
+                    const c = buf.charCodeAt(i);
+                    if (c === 34) inQuote = !inQuote;
+                    else if (c === 10 && !inQuote) {
+                        rows.push(splitRow(buf.slice(start, buf.charCodeAt(i - 1) === 13 ? i - 1 : i)));
+                        start = i + 1;
+                    }
+                }
+                buf = buf.slice(start); pos = buf.length;
+                return rows;
+            },
+            end() {
+                const rows = buf.trim() ? [splitRow(buf.replace(/\\r$/, ''))] : [];
+                buf = ''; pos = 0; inQuote = false;
+                return rows;
+            },
+        };
+    }
+    function csvWorker() {
+        self.onmessage = async (e) => {
+            const { url, batch } = e.data;
+            try {
+                const res = await fetch(url, { cache: 'no-cache' });  // TitanData already holds the stale copy
+                if (!res.ok || !res.body) throw new Error('HTTP ' + res.status);
+                const parser = csvStream(), decoder = new TextDecoder(), reader = res.body.getReader();
+                let header = true, pending = [];
+                const take = (rows) => {
+                    for (const r of rows) {
+                        if (header) { header = false; continue; }
+                        if (r.some((c) => c)) pending.push(r);
+                    }
+                    if (pending.length >= batch) { self.postMessage({ rows: pending }); pending = []; }
+                };
+                for (;;) {
+                    const { done, value } = await reader.read();
+                    if (done) break;
+                    take(parser.push(decoder.decode(value, { stream: true })));
+                }
+                take(parser.push(decoder.decode()));
+                take(parser.end());
+                self.postMessage({ rows: pending, done: true });
+            } catch (err) { self.postMessage({ error: String(err) }); }
+        };
+    }
+    function parseMarkdown(text) {
+        if (!text) return '';
+        let html = text.replace(/\\r\\n/g, '\\n').replace(/\\n/g, '<br>').replace(/\\*\\*(.*?)\\*\\*/g, '<strong>$1</strong>');
+        return html;
+    }
+    """ + gen_data_js(cfg)
+
+def gen_data_js(cfg):
+    # Shared sheet access: parsed rows cached in IndexedDB (sessionStorage fallback), served instantly,
+    # revalidated in the background once older than sheet_cache_ttl. onUpdate re-renders with fresh rows.
+    ttl = max(0, int(cfg["sheet_cache_ttl"]))
+    return f"""
+    const TitanData = (() => {{
+        const TTL = {ttl} * 1000;
+        const mem = {{}}, inflight = {{}};
+        let dbp = null;
+        function db() {{
+            if (!dbp) dbp = new Promise((ok, fail) => {{
+                if (!window.indexedDB) return fail(new Error('no indexedDB'));
+                const r = indexedDB.open('titan-data', 1);
+                r.onupgradeneeded = () => r.result.createObjectStore('sheets');
+                r.onsuccess = () => ok(r.result);
+                r.onerror = () => fail(r.error);
+            }});
+            return dbp;
+        }}
+        async function load(url) {{
+            if (mem[url]) return mem[url];
+            try {{
+                const d = await db();
+                return await new Promise((ok) => {{
+                    const q = d.transaction('sheets').objectStore('sheets').get(url);
+                    q.onsuccess = () => ok(q.result || null);
+                    q.onerror = () => ok(null);
+                }});
+            }} catch (e) {{
+                try {{ return JSON.parse(sessionStorage.getItem('titan:' + url)); }} catch (e2) {{ return null; }}
+            }}
+        }}
+        async function save(url, entry) {{
+            mem[url] = entry;
+            try {{ (await db()).transaction('sheets', 'readwrite').objectStore('sheets').put(entry, url); }}
+            catch (e) {{ try {{ sessionStorage.setItem('titan:' + url, JSON.stringify(entry)); }} catch (e2) {{}} }}
+        }}
+        function parse(txt) {{
+            const p = csvStream();
+            return p.push(txt.replace(/^\\uFEFF/, '')).concat(p.end()).slice(1).filter((r) => r.some((c) => c));
+        }}
+        let workerURL = null;
+        function stream(url, onBatch) {{
+            // Download + parse off the main thread; onBatch(rowsSoFar) fires as each batch lands
+            return new Promise((resolve, reject) => {{
+                if (!window.Worker || !window.Blob) return reject(new Error('no workers'));
+                workerURL = workerURL || URL.createObjectURL(new Blob([csvStream.toString(), ';(', csvWorker.toString(), ')();'], {{ type: 'text/javascript' }}));
+                const worker = new Worker(workerURL), all = [];
+                const fail = (err) => {{ worker.terminate(); reject(err); }};
+                worker.onerror = fail;
+                worker.onmessage = (e) => {{
+                    if (e.data.error) return fail(new Error(e.data.error));
+                    for (const r of e.data.rows) all.push(r);
+                    if (e.data.done) {{ worker.terminate(); resolve(all); }}
+                    else if (onBatch) onBatch(all);
+                }};
+                worker.postMessage({{ url: new URL(url, location.href).href, batch: 200 }});
+            }});
+        }}
+        function refresh(url, onBatch) {{
+            if (!inflight[url]) inflight[url] = stream(url, onBatch)
+                .catch(() => fetch(url, {{ cache: 'no-cache' }}).then((res) => {{ if (!res.ok) throw new Error(res.status); return res.text(); }}).then(parse))
+                .then((rows) => {{ const entry = {{ at: Date.now(), rows }}; save(url, entry); return entry; }})
+                .finally(() => {{ delete inflight[url]; }});
+            return inflight[url];
+        }}
+        async function rows(url, onUpdate, onBatch) {{
+            // Cache hit: rows now, revalidate in the background. Miss: stream, onBatch renders early rows.
+            const hit = await load(url);
+            if (!hit) return (await refresh(url, onBatch)).rows;
+            mem[url] = hit;
+            if (Date.now() - hit.at > TTL) refresh(url).then((fresh) => {{
+                if (onUpdate && JSON.stringify(fresh.rows) !== JSON.stringify(hit.rows)) onUpdate(fresh.rows);
+            }}).catch(() => {{}});
+            return hit.rows;
+        }}
+        return {{ rows, parse }};
+    }})();
+    """
+
+# --- NEW: SHOPPING CART & PAYMENT JS ---
+@cached_section
+def gen_cart_system(cfg):
+    return """
+    <div id="cart-float" onclick="toggleCart()" style="display:none;">
+        <span>🛒</span> <span id="cart-count">0</span>
+    </div>
+    <div id="cart-overlay" onclick="toggleCart()"></div>
+    <div id="cart-modal">
+        <h3>Your Cart</h3>
+        <div id="cart-items" style="max-height:300px; overflow-y:auto; margin:1rem 0;"></div>
+        <div style="font-weight:bold; font-size:1.2rem; margin-bottom:1rem; text-align:right;">Total: <span id="cart-total">0.00</span></div>
+        <button onclick="checkoutWhatsApp()" class="btn btn-accent" style="width:100%">Checkout via WhatsApp</button>
+    </div>
+    """
+
+@cached_section
+def gen_cart_js(cfg):
+    wa_num = cfg["wa_num"]
+    upi_id = cfg["upi_id"]
+    paypal_link = cfg["paypal_link"]
+    # Cart lines keyed by item name with a quantity; prices are parsed to cents once per line and the
+    # running count/total are kept in step, so adding or removing touches one row and two counters.
+    return f"""
+    const waNumber = "{wa_num}";
+    const payLinks = "UPI: {upi_id} | PayPal: {paypal_link}";
+    const cartRows = new Map();
+    let cart = loadCart(), cartCount = 0, cartTotal = 0, saveTimer = null;
+
+    function parsePrice(price) {{ return Math.round((parseFloat(String(price).replace(/[^0-9.]/g, '')) || 0) * 100); }}
+    function loadCart() {{
+        let saved = null;
+        try {{ saved = JSON.parse(localStorage.getItem('titanCart')); }} catch(e) {{}}
+        const lines = new Map();
+        // Older builds stored one array entry per click; those fold into quantities here
+        for (const it of Array.isArray(saved) ? saved : []) {{
+            const line = lines.get(it.name) || {{ name: it.name, price: it.price, unit: parsePrice(it.price), qty: 0 }};
+            line.qty += it.qty || 1;
+            lines.set(it.name, line);
+        }}
+        return lines;
+    }}
+    function flushCart() {{
+        clearTimeout(saveTimer); saveTimer = null;
+        localStorage.setItem('titanCart', JSON.stringify(Array.from(cart.values(), ({{ name, price, qty }}) => ({{ name, price, qty }}))));
+    }}
+    function saveCart() {{ clearTimeout(saveTimer); saveTimer = setTimeout(flushCart, 300); }}
+    window.addEventListener('pagehide', () => {{ if (saveTimer) flushCart(); }});
+
+    function syncRow(line, box) {{
+        let row = cartRows.get(line.name);
+        if (!line.qty) {{ if (row) {{ row.remove(); cartRows.delete(line.name); }} return; }}
+        if (!row) {{
+            row = document.createElement('div');
+            row.className = 'cart-item';
+            row.innerHTML = '<span></span><span><span class="ci-qty"></span><span class="ci-price"></span> <span class="ci-rem" style="color:red;cursor:pointer;">x</span></span>';
+            row.firstChild.textContent = line.name;
+            row.querySelector('.ci-rem').onclick = () => remItem(line.name);
+            cartRows.set(line.name, row);
+            (box || document.getElementById('cart-items')).appendChild(row);
+        }}
+        row.querySelector('.ci-qty').textContent = line.qty > 1 ? line.qty + ' × ' : '';
+        row.querySelector('.ci-price').textContent = line.price;
+    }}
+    function syncTotals() {{
+        document.getElementById('cart-count').innerText = cartCount;
+        document.getElementById('cart-total').innerText = (cartTotal / 100).toFixed(2);
+        document.getElementById('cart-float').style.display = cartCount > 0 ? 'flex' : 'none';
+    }}
+    function renderCart() {{
+        // Full render, only on page load and after checkout
+        const box = document.getElementById('cart-items');
+        if(!box) return;
+        box.textContent = ''; cartRows.clear(); cartCount = 0; cartTotal = 0;
+        const frag = document.createDocumentFragment();
+        for (const line of cart.values()) {{ cartCount += line.qty; cartTotal += line.qty * line.unit; syncRow(line, frag); }}
+        box.appendChild(frag);
+        syncTotals();
+    }}
+    function changeQty(name, price, delta) {{
+        let line = cart.get(name);
+        if (!line) {{
+            if (delta <= 0) return;
+            line = {{ name, price, unit: parsePrice(price), qty: 0 }};
+            cart.set(name, line);
+        }}
+        delta = Math.max(delta, -line.qty);
+        line.qty += delta; cartCount += delta; cartTotal += delta * line.unit;
+        if (!line.qty) cart.delete(name);
+        if (document.getElementById('cart-items')) {{ syncRow(line); syncTotals(); }}
+        saveCart();
+    }}
+    
+    function addToCart(name, price) {{
+        changeQty(name, price, 1);
+        alert(name + " added!");
+    }}
+    function remItem(name) {{ const line = cart.get(name); if (line) changeQty(name, line.price, -1); }}
+    function toggleCart() {{ 
+        const m = document.getElementById('cart-modal'); 
+        m.style.display = m.style.display === 'block' ? 'none' : 'block'; 
+        document.getElementById('cart-overlay').style.display = m.style.display;
+    }}
+    function checkoutWhatsApp() {{
+        const lines = Array.from(cart.values(), (i) => `- ${{i.name}}${{i.qty > 1 ? ' x' + i.qty : ''}} (${{i.price}})`);
+        const msg = `New Order:\\n${{lines.join('\\n')}}\\n\\nTotal: ${{(cartTotal / 100).toFixed(2)}}\\n\\n${{payLinks}}`;
+        window.open(`https://wa.me/${{waNumber}}?text=${{encodeURIComponent(msg)}}`, '_blank');
+        cart.clear(); renderCart(); flushCart(); toggleCart();
+    }}
+    window.addEventListener('load', renderCart);
+    """
+
+# --- NEW: BUILD-TIME SHEET LOADER (PRERENDER) ---
+def fetch_sheet_text(url, timeout=30):
+    # Published Google Sheet CSV, any http(s) stand-in, a file:// URL or a plain local path
+    if url.startswith("file://"): url = urllib.parse.unquote(urllib.parse.urlparse(url).path)
+    if not url.startswith(("http://", "https://")):
+        with open(url, encoding="utf-8-sig") as f:
+            return f.read()
+    resp = requests.get(url, timeout=timeout)
+    resp.raise_for_status()
+    return resp.content.decode("utf-8-sig")
+
+def load_sheet_rows(url):
+    # Header row dropped, cells trimmed - same shape the browser-side TitanData.parse sees
+    rows = csv.reader(io.StringIO(fetch_sheet_text(url)))
+    next(rows, None)
+    return [[c.strip() for c in r] for r in rows if any(c.strip() for c in r)]
+
+def slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-') or "item"
+
+def unique_slugs(names):
+    seen, slugs = {}, []
+    for name in names:
+        base = slugify(name)
+        seen[base] = seen.get(base, 0) + 1
+        slugs.append(base if seen[base] == 1 else f"{base}-{seen[base]}")
+    return slugs
+
+def attr(value):
+    return html.escape(value, quote=True)
+
+def js_call_args(*values):
+    # Safe inline onclick arguments, e.g. addToCart("Bob's Tee", "$20")
+    return attr(", ".join(json.dumps(v) for v in values))
+
+def product_fields(cfg, row):
+    name, price, desc = (row + ["", "", ""])[:3]
+    img = row[3] if len(row) > 3 and len(row[3]) > 5 else cfg["custom_feat"]
+    stripe = row[4] if len(row) > 4 and "http" in row[4] else ""
+    return name, price, desc, img, stripe
+
+def load_products(cfg):
+    rows = [r for r in load_sheet_rows(cfg["sheet_url"]) if len(r) > 1]
+    return list(zip(unique_slugs(r[0] for r in rows), rows))
+
+# --- NEW: SITE SEARCH ---
+def search_documents(cfg, products, posts):
+    # One entry per product/post, linked to its prerendered page when the build has one
+    docs = []
+    for slug, row in products:
+        name, price, desc, _, _ = product_fields(cfg, row)
+        url = f"product/{slug}.html" if cfg["prerender_inventory"] else "product.html?item=" + urllib.parse.quote(name)
+        docs.append({"title": name, "url": url, "meta": price, "text": desc})
+    for slug, row in posts:
+        url = f"blog/{slug}.html" if cfg["prerender_blog"] else "post.html?id=" + urllib.parse.quote(row[0])
+        docs.append({"title": row[1], "url": url, "meta": " · ".join(c for c in (row[3], row[2]) if c),
+                     "text": " ".join(row[3:5] + row[6:7])})
+    return docs
+
+def gen_search_js(manifest):
+    return f"""
+    const SEARCH = {json.dumps(manifest)};
+    const searchShards = new Set(SEARCH.shards), searchCache = new Map();
+    function searchTokens(text) {{
+        // Same rules as titan_search.tokenize()
+        return (text.toLowerCase().normalize('NFKD').replace(/\\p{{M}}/gu, '').match(/[\\p{{L}}\\p{{N}}]+/gu) || [])
+            .filter((t) => t.length > 1 || /^\\p{{N}}$/u.test(t));
+    }}
+    function searchFetch(path) {{
+        if (!searchCache.has(path)) searchCache.set(path, fetch(path + '?v=' + SEARCH.v).then((r) => r.ok ? r.json() : null).catch(() => null));
+        return searchCache.get(path);
+    }}
+    function shardFile(prefix) {{
+        return [...prefix].map((c) => /^[a-z0-9]$/.test(c) ? c : '_' + c.codePointAt(0).toString(16)).join('');
+    }}
+    async function matchToken(tok) {{
+        // doc id -> best score over indexed terms starting with tok; an exact term scores double
+        const prefix = [...tok].slice(0, SEARCH.prefix).join(''), hits = new Map();
+        if (!searchShards.has(prefix)) return hits;
+        const shard = await searchFetch('search/' + shardFile(prefix) + '.json');
+        if (!shard) return hits;
+        let lo = 0, hi = shard.terms.length;
+        while (lo < hi) {{ const mid = (lo + hi) >> 1; if (shard.terms[mid] < tok) lo = mid + 1; else hi = mid; }}
+        for (let i = lo; i < shard.terms.length && shard.terms[i].startsWith(tok); i++) {{
+            const post = shard.post[i], boost = shard.terms[i] === tok ? 2 : 1;
+            for (let j = 0, doc = 0; j < post.length; j += 2) {{
+                doc += post[j];
+                const score = post[j + 1] * boost;
+                if (score > (hits.get(doc) || 0)) hits.set(doc, score);
+            }}
+        }}
+        return hits;
+    }}
+    async function siteSearch(q, limit = 20) {{
+        const toks = [...new Set(searchTokens(q))];
+        if (!toks.length) return {{ total: 0, results: [] }};
+        const lists = (await Promise.all(toks.map(matchToken))).sort((a, b) => a.size - b.size);
+        // Every word has to match; scores add up
+        let scores = lists[0];
+        for (const list of lists.slice(1)) {{
+            const next = new Map();
+            for (const [doc, score] of scores) if (list.has(doc)) next.set(doc, score + list.get(doc));
+            scores = next;
+        }}
+        const top = [...scores].sort((a, b) => b[1] - a[1] || a[0] - b[0]).slice(0, limit);
+        const chunks = await Promise.all(top.map(([doc]) => searchFetch('search/docs-' + Math.floor(doc / SEARCH.chunk) + '.json')));
+        const results = top.map(([doc, score], i) => {{
+            const d = (chunks[i] || [])[doc % SEARCH.chunk] || [];
+            return {{ title: d[0], url: d[1], meta: d[2], score }};
+        }});
+        return {{ total: scores.size, results }};
+    }}
+    (() => {{
+        const input = document.getElementById('search-q'), out = document.getElementById('search-results'), status = document.getElementById('search-status');
+        if (!input) return;
+        const esc = (s) => String(s || '').replace(/[&<>"']/g, (c) => '&#' + c.charCodeAt(0) + ';');
+        let seq = 0, timer;
+        async function run() {{
+            const q = input.value.trim(), mine = ++seq, t0 = performance.now();
+            const {{ total, results }} = await siteSearch(q);
+            if (mine !== seq) return;  // a newer query has been typed since
+            out.innerHTML = results.map((r) => `<div class="card" style="margin-bottom:1rem;"><h3><a href="${{esc(r.url)}}">${{esc(r.title)}}</a></h3><p style="opacity:0.8;">${{esc(r.meta)}}</p></div>`).join('');
+            status.textContent = q ? `${{total}} result${{total === 1 ? '' : 's'}} (${{Math.round(performance.now() - t0)}} ms)` : '';
+            history.replaceState(null, '', q ? '?q=' + encodeURIComponent(q) : location.pathname);
+        }}
+        input.addEventListener('input', () => {{ clearTimeout(timer); timer = setTimeout(run, 120); }});
+        input.value = new URLSearchParams(location.search).get('q') || '';
+        if (input.value) run();
+    }})();
+    """
+
+def gen_search_content(cfg, manifest):
+    return f"""
+    <section style="padding-top:150px;"><div class="container" style="max-width:800px;">
+        <div class="section-head"><h2>Search</h2></div>
+        <input id="search-q" type="search" placeholder="Search products and articles..." autocomplete="off" aria-label="Search" style="width:100%; padding:1rem; font-size:1.1rem; border-radius:var(--radius); border:1px solid rgba(100,100,100,0.3);">
+        <p id="search-status" style="opacity:0.7; font-size:0.9rem; margin:0.8rem 0;"></p>
+        <div id="search-results"></div>
+    </div></section>
+    <script>{gen_search_js(manifest)}</script>
+    """
+
+# --- NEW: BUILD-TIME TRANSLATIONS ---
+BASE_LANG = "en"  # build_page's <html lang>
+_LANG_CODE = re.compile(r"^[a-z]{2,3}(-[a-z0-9]{2,8})?$", re.I)
+_HTML_TOKEN = re.compile(r"<(script|style|textarea)\b.*?</\1\s*>|<!--.*?-->|<[^>]*>", re.S | re.I)
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+def load_translations(cfg):
+    # Key column, then one column per language named by the header (key,es,fr). A legacy two-column sheet
+    # (ElementID,TranslatedText) is Spanish. Keys are element ids or exact visible text.
+    rows = list(csv.reader(io.StringIO(fetch_sheet_text(cfg["lang_sheet"]))))
+    if not rows: return {}
+    header = [c.strip().lower() for c in rows[0][1:]]
+    langs = header if header and all(_LANG_CODE.match(c) for c in header) else ["es"]
+    table = {lang: {} for lang in langs}
+    for r in rows[1:]:
+        key = r[0].strip() if r else ""
+        if not key: continue
+        for lang, text in zip(langs, r[1:]):
+            if text.strip(): table[lang][key] = text.strip()
+    table.pop(BASE_LANG, None)
+    return table
+
+def translate_html(page, strings):
+    # Outside <script>/<style>: an element whose id is a key gets its whole content swapped (what the old
+    # runtime innerText did), a text node equal to a key is replaced wherever it appears
+    tokens = list(_HTML_TOKEN.finditer(page))
+    out, pos, i = [], 0, 0
+    while i < len(tokens):
+        m = tokens[i]
+        chunk = page[pos:m.start()]
+        key = html.unescape(chunk.strip())
+        out.append(chunk.replace(chunk.strip(), attr(strings[key]), 1) if key in strings else chunk)
+        out.append(m.group(0))
+        pos, i = m.end(), i + 1
+        tag = re.match(r'<([a-zA-Z][\w-]*)[^>]*?\sid="([^"]+)"', m.group(0))
+        if not tag or tag.group(2) not in strings or tag.group(1).lower() in _VOID_TAGS: continue
+        name, depth, j = tag.group(1).lower(), 1, i
+        while j < len(tokens):
+            t = tokens[j].group(0).lower()
+            if re.match(rf"<{name}\b", t) and not t.endswith("/>"): depth += 1
+            elif re.match(rf"</{name}\s*>", t): depth -= 1
+            if not depth: break
+            j += 1
+        if depth: continue
+        out.append(attr(strings[tag.group(2)]))
+        pos, i = tokens[j].start(), j
+    out.append(page[pos:])
+    return "".join(out)
+
+def localized_name(name, lang):
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{lang}{ext}" if lang else name
+
+def localize_page(cfg, body, name, lang):
+    # lang=None is the base-language page; every variant gets hreflang alternates and a plain-link switcher
+    langs = [None] + list(cfg["@lang"])
+    if lang:
+        body = translate_html(body, cfg["@lang"][lang])
+        pages = set(cfg["@pages"])
+        body = re.sub(r'(\shref=")([^":#?]+\.html)(?=[#?"])',
+                      lambda m: m.group(1) + (localized_name(m.group(2), lang) if m.group(2) in pages else m.group(2)), body)
+        body = body.replace(f'<html lang="{BASE_LANG}">', f'<html lang="{lang}">', 1)
+    root = cfg["prod_url"].rstrip("/")
+    alternates = "".join(f'\n        <link rel="alternate" hreflang="{l or BASE_LANG}" href="{root}/{localized_name(name, l)}">' for l in langs)
+    alternates += f'\n        <link rel="alternate" hreflang="x-default" href="{root}/{name}">'
+    switch = "".join(f'<a href="{localized_name(name, l)}" hreflang="{l or BASE_LANG}" title="Switch Language">🌐 {(l or BASE_LANG).upper()}</a>'
+                     for l in langs if l != lang)
+    return body.replace("<!--lang-switch-->", switch, 1).replace("</head>", alternates + "\n    </head>", 1)
+
+def gen_product_card(cfg, row, slug):
+    name, price, desc, img, stripe = product_fields(cfg, row)
+    btn = (f'<a href="{attr(stripe)}" class="btn btn-primary" style="padding:0.6rem; width:100%;">Buy Now</a>' if stripe
+           else f'<button onclick="addToCart({js_call_args(name, price)})" class="btn" style="padding:0.6rem; width:100%;">Add to Cart</button>')
+    return f"""
+                    <div class="card reveal">
+                        <a href="product/{slug}.html">{picture(cfg, img, "(max-width: 768px) 100vw, 33vw", f'class="prod-img" loading="lazy" alt="{attr(name)}"')}</a>
+                        <div>
+                            <h3><a href="product/{slug}.html">{name}</a></h3>
+                            <p style="font-weight:bold; color:var(--s);">{price}</p>
+                            <p style="font-size:0.9rem; opacity:0.8;">{desc}</p>
+                            {btn}
+                        </div>
+                    </div>"""
+
+def gen_inventory_js(cfg, is_demo=False):
+    # UPDATED: Removed hardcoded color:var(--p) to fix dark mode
+    sheet_url = cfg["sheet_url"]
+    custom_feat = cfg["custom_feat"]
+    demo_flag = "const isDemo = true;" if is_demo else "const isDemo = false;"
+    page_size = max(1, int(cfg["inv_page_size"]))
+    return f"""
+    {gen_csv_parser(cfg)}
+    <script>
+    {demo_flag}
+    const INV_PAGE = {page_size};
+    let invRows = [], invShown = 0;
+    function invCard(c) {{
+        let img = c[3] && c[3].length > 5 ? c[3] : '{custom_feat}';
+        let stripe = (c.length > 4 && c[4].includes('http')) ? c[4] : '';
+        let btn = stripe 
+            ? `<a href="${{stripe}}" class="btn btn-primary" style="padding:0.6rem; width:100%;">Buy Now</a>`
+            : `<button onclick="addToCart('${{c[0]}}', '${{c[1]}}')" class="btn" style="padding:0.6rem; width:100%;">Add to Cart</button>`;
+        return `
+                <div class="card reveal">
+                    <img src="${{img}}" class="prod-img" loading="lazy">
+                    <div>
+                        <h3>${{c[0]}}</h3>
+                        <p style="font-weight:bold; color:var(--s);">${{c[1]}}</p>
+                        <p style="font-size:0.9rem; opacity:0.8;">${{c[2]}}</p>
+                        ${{btn}}
+                    </div>
+                </div>`;
+    }}
+    function moreInv(count = INV_PAGE) {{
+        // One parse per page of cards instead of one full-grid re-parse per product
+        const box = document.getElementById('inv-grid');
+        const batch = invRows.slice(invShown, invShown + Math.max(0, count));
+        box.insertAdjacentHTML('beforeend', batch.map(invCard).join(''));
+        invShown += batch.length;
+        document.getElementById('inv-more').hidden = invShown >= invRows.length;
+    }}
+    function renderInv(rows) {{
+        const box = document.getElementById('inv-grid');
+        if(!box) return;
+        const fresh = rows.filter((c) => c.length > 1);
+        // Same leading cards (a later stream batch or an unchanged revalidation): keep the DOM, top up the page
+        const keep = invShown > 0 && JSON.stringify(fresh.slice(0, invShown)) === JSON.stringify(invRows.slice(0, invShown));
+        invRows = fresh;
+        if (!keep) {{ invShown = 0; box.innerHTML = ''; }}
+        moreInv(INV_PAGE - invShown);
+    }}
+    async function loadInv() {{
+        try {{ renderInv(await TitanData.rows('{sheet_url}', renderInv, renderInv)); }} catch(e) {{ console.log(e); }}
+    }}
+    if(document.getElementById('inv-grid')) window.addEventListener('load', loadInv);
+    </script>
+    """
+
+def gen_inventory(cfg, products=None):
+    # products=None keeps the runtime loadInv() fetch; prerendered builds pass [(slug, row), ...]
+    show_inventory = cfg["show_inventory"]
+    if not show_inventory: return ""
+    more_hidden = " hidden"
+    if products is None:
+        grid = '<div style="text-align:center; padding:4rem;">Loading Store...</div>'
+        loader = gen_inventory_js(cfg, is_demo=False)
+    else:
+        # First page is live markup; later pages are static store/page-N.html fragments fetched on "Load More"
+        page_size = max(1, int(cfg["inv_page_size"]))
+        grid = "".join(gen_product_card(cfg, row, slug) for slug, row in products[:page_size])
+        loader = ""
+        if len(products) > page_size:
+            more_hidden = ""
+            grid += store_next_link(2)
+            loader = f"<script>{gen_inventory_pager_js()}</script>"
+    return f"""
+    <section id="inventory" style="background:rgba(0,0,0,0.02)"><div class="container">
+        <div class="section-head reveal"><h2>Portfolio & Store</h2><p>Secure Checkout available.</p></div>
+        <div id="inv-grid" class="grid-3">{grid}</div>
+        <div style="text-align:center; margin-top:2rem;"><button id="inv-more" class="btn btn-primary" onclick="moreInv()"{more_hidden}>Load More</button></div>
+    </div></section>
+    {loader}
+    """
+
+def store_page_name(n):
+    return f"store/page-{n}.html"
+
+def store_next_link(n):
+    # Hidden pointer to the next fragment; a plain href so translated builds rewrite it like any page link
+    return f'<a class="inv-next" href="{store_page_name(n)}" hidden></a>'
+
+def gen_store_page(cfg, chunk, n, count):
+    # Bare card fragment for "Load More" page n (n >= 2), inserted into the home page grid as-is
+    cards = "".join(gen_product_card(cfg, row, slug) for slug, row in chunk)
+    return cards + (store_next_link(n + 1) if n < count else "")
+
+def gen_inventory_pager_js():
+    return """
+    async function moreInv() {
+        const grid = document.getElementById('inv-grid'), btn = document.getElementById('inv-more');
+        const next = grid.querySelector('.inv-next');
+        if (!next) return;
+        btn.disabled = true;
+        try {
+            const res = await fetch(next.getAttribute('href'));
+            if (!res.ok) throw new Error('HTTP ' + res.status);
+            const html = await res.text();
+            next.remove();
+            grid.insertAdjacentHTML('beforeend', html);
+        } catch (e) { console.log(e); }
+        btn.disabled = false;
+        btn.hidden = !grid.querySelector('.inv-next');
+    }
+    """
+
+def gen_about_section(cfg):
+    about_short = cfg["about_short"]
+    about_h = cfg["about_h"]
+    about_img = cfg["about_img"]
+    formatted_about = format_text(about_short)
+    return f"""
+    <section id="about"><div class="container">
+        <div class="about-grid">
+            <div class="reveal">
+                <h2 style="font-size:2.5rem; margin-bottom:1.5rem;">{about_h}</h2>
+                <div style="font-size:1.1rem; opacity:0.9; margin-bottom:2rem; color:var(--txt);">{formatted_about}</div>
+                <a href="about.html" class="btn btn-primary" style="padding: 0.8rem 2rem; font-size:0.9rem;">Read Our Full Story</a>
+            </div>
+            {picture(cfg, about_img, "(max-width: 768px) 100vw, 50vw", 'class="reveal" loading="lazy" style="width:100%; border-radius:var(--radius); box-shadow:0 20px 50px -20px rgba(0,0,0,0.2); aspect-ratio:4/3; object-fit:cover;"')}
+        </div>
+    </div></section>
+    """
+
+def gen_faq_section(cfg):
+    faq_data = cfg["faq_data"]
+    items = ""
+    for line in faq_data.split('\n'):
+        if "?" in line and not line.strip() == "":
+            parts = line.split('?', 1)
+            if len(parts) == 2: items += f"<details class='reveal'><summary>{parts[0].strip()}?</summary><p>{parts[1].replace('?', '').strip()}</p></details>"
+    return f"""<section id="faq"><div class="container" style="max-width:800px;"><div class="section-head reveal"><h2>Frequently Asked Questions</h2></div>{items}</div></section>"""
+
+@cached_section
+def gen_footer(cfg):
+    # (Preserved Social Icons & Layout)
+    fb_link = cfg["fb_link"]
+    ig_link = cfg["ig_link"]
+    x_link = cfg["x_link"]
+    li_link = cfg["li_link"]
+    yt_link = cfg["yt_link"]
+    biz_name = cfg["biz_name"]
+    biz_addr = cfg["biz_addr"]
+    icons = ""
+    if fb_link: icons += f'<a href="{fb_link}" target="_blank"><svg class="social-icon" viewBox="0 0 24 24"><path d="M18 2h-3a5 5 0 0 0-5 5v3H7v4h3v8h4v-8h3l1-4h-4V7a1 1 0 0 1 1-1h3z"></path></svg></a>'
+    if ig_link: icons += f'<a href="{ig_link}" target="_blank" aria-label="Instagram"><svg class="social-icon" viewBox="0 0 24 24"><path d="M16.98 0a6.9 6.9 0 0 1 5.08 1.98A6.94 6.94 0 0 1 24 7.02v9.96c0 2.08-.68 3.87-1.98 5.13A7.14 7.14 0 0 1 16.94 24H7.06a7.06 7.06 0 0 1-5.03-1.89A6.96 6.96 0 0 1 0 16.94V7.02C0 2.8 2.8 0 7.02 0h9.96zM7.17 2.1c-1.4 0-2.6.48-3.46 1.33c-.85.85-1.33 2.06-1.33 3.46v10.3c0 1.3.47 2.5 1.33 3.36c.86.85 2.06 1.33 3.46 1.33h9.66c1.4 0 2.6-.48 3.46-1.33c.85-.85 1.33-2.06 1.33-3.46V6.89c0-1.4-.47-2.6-1.33-3.46c-.86-.85-2.06-1.33-3.46-1.33H7.17zm11.97 3.33c.77 0 1.4.63 1.4 1.4c0 .77-.63 1.4-1.4 1.4c-.77 0-1.4-.63-1.4-1.4c0-.77.63-1.4 1.4-1.4zM12 5.76c3.39 0 6.14 2.75 6.14 6.14c0 3.39-2.75 6.14-6.14 6.14c-3.39 0-6.14-2.75-6.14-6.14c0-3.39 2.75-6.14 6.14-6.14zm0 2.1c-2.2 0-3.99 1.79-3.99 4.04c0 2.25 1.79 4.04 3.99 4.04c2.2 0 3.99-1.79 3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04z"/></svg></a>'
+    if x_link: icons += f'<a href="{x_link}" target="_blank" aria-label="X (Twitter)"><svg class="social-icon" viewBox="0 0 24 24"><path d="M18.901 1.153h3.68l-8.04 9.19L24 22.846h-7.406l-5.8-7.584l-6.638 7.584H.474l8.6-9.83L0 1.154h7.594l5.243 6.932ZM17.61 20.644h2.039L6.486 3.24H4.298Z"></path></svg></a>'
+    if li_link: icons += f'<a href="{li_link}" target="_blank" aria-label="LinkedIn"><svg class="social-icon" viewBox="0 0 24 24"><path d="M16 8a6 6 0 0 1 6 6v7h-4v-7a2 2 0 0 0-2-2a2 2 0 0 0-2 2v7h-4v-7a6 6 0 0 1 6-6zM2 9h4v12H2zM4 2a2 2 0 1 1-2 2a2 2 0 0 1 2-2z"></path></svg></a>'
+    if yt_link: icons += f'<a href="{yt_link}" target="_blank" aria-label="YouTube"><svg class="social-icon" viewBox="0 0 24 24"><path d="M23.498 6.186a3.016 3.016 0 0 0-2.122-2.136C19.505 3.545 12 3.545 12 3.545s-7.505 0-9.377.505A3.017 3.017 0 0 0 .502 6.186C0 8.07 0 12 0 12s0 3.93.502 5.814a3.016 3.016 0 0 0 2.122 2.136c1.871.505 9.376.505 9.376.505s7.505 0 9.377-.505a3.015 3.015 0 0 0 2.122-2.136C24 15.93 24 12 24 12s0-3.93-.502-5.814zM9.545 15.568V8.432L15.818 12l-6.273 3.568z"/></svg></a>'
+
+    return f"""
+    <footer><div class="container">
+        <div class="footer-grid">
+            <div>
+                <h3 style="color:white; margin-bottom:1.5rem;">{biz_name}</h3>
+                <p style="opacity:0.8; font-size:0.9rem;">{biz_addr}</p>
+                <div style="margin-top:1.5rem; display:flex; gap:1.2rem;">{icons}</div>
+            </div>
+            <div>
+                <h4 style="color:white; font-size:0.9rem; text-transform:uppercase;">Links</h4>
+                <a href="index.html">Home</a><a href="blog.html">Blog</a><a href="booking.html">Book Now</a>
+            </div>
+            <div>
+                <h4 style="color:white; font-size:0.9rem; text-transform:uppercase;">Legal</h4>
+                <a href="privacy.html">Privacy</a><a href="terms.html">Terms</a>
+            </div>
+        </div>
+        <div style="border-top:1px solid rgba(255,255,255,0.1); margin-top:3rem; padding-top:2rem; text-align:center; opacity:0.4; font-size:0.8rem;">
+            &copy; 2026 {biz_name}. Powered by Titan Engine.
+        </div>
+    </div></footer>
+    """
+
+@cached_section
+def gen_wa_widget(cfg):
+    wa_num = cfg["wa_num"]
+    if not wa_num: return ""
+    return f"""<a href="https://wa.me/{wa_num}" class="wa-float" target="_blank" style="position:fixed; bottom:30px; right:30px; background:#25d366; color:white; width:60px; height:60px; border-radius:50%; display:flex; align-items:center; justify-content:center; box-shadow:0 10px 30px rgba(37,211,102,0.4); z-index:9999;"><svg style="width:32px;height:32px" viewBox="0 0 24 24"><path fill="currentColor" d="M12.04 2c-5.46 0-9.91 4.45-9.91 9.91c0 1.75.46 3.45 1.32 4.95L2.05 22l5.25-1.38c1.45.79 3.08 1.21 4.74 1.21c5.46 0 9.91-4.45 9.91-9.91c0-2.65-1.03-5.14-2.9-7.01A9.816 9.816 0 0 0 12.04 2m.01 1.67c2.2 0 4.26.86 5.82 2.42a8.225 8.225 0 0 1 2.41 5.83c0 4.54-3.7 8.23-8.24 8.23c-1.48 0-2.93-.39-4.19-1.15l-.3-.17l-3.12.82l.83-3.04l-.2-.32a8.188 8.188 0 0 1-1.26-4.38c.01-4.54 3.7-8.24 8.25-8.24m-3.53 3.16c-.13 0-.35.05-.54.26c-.19.2-.72.7-.72 1.72s.73 2.01.83 2.14c.1.13 1.44 2.19 3.48 3.07c.49.21.87.33 1.16.43c.49.16.94.13 1.29.08c.4-.06 1.21-.5 1.38-.98c.17-.48.17-.89.12-.98c-.05-.09-.18-.13-.37-.23c-.19-.1-.1.13-.1.13s-1.13-.56-1.32-.66c-.19-.1-.32-.15-.45.05c-.13.2-.51.65-.62.78c-.11.13-.23.15-.42.05c-.19-.1-.8-.3-1.53-.94c-.57-.5-1.02-1.12-1.21-1.45c-.11-.19-.01-.29.09-.38c.09-.08.19-.23.29-.34c.1-.11.13-.19.19-.32c.06-.13.03-.24-.01-.34c-.05-.1-.45-1.08-.62-1.48c-.16-.4-.36-.34-.51-.35c-.11-.01-.25-.01-.4-.01Z"/></path></svg></a>"""
+
+@cached_section
+def gen_scripts():
+    # Reveal-on-scroll: each .reveal is observed until it first enters the viewport (150px in, as before),
+    # then dropped - no scroll handler, no per-frame layout reads. Reduced motion / no IO: show at once.
+    return """
+    (() => {
+        const reduce = window.matchMedia && window.matchMedia('(prefers-reduced-motion: reduce)').matches;
+        const io = !reduce && 'IntersectionObserver' in window ? new IntersectionObserver((entries) => {
+            for (const e of entries) {
+                if (e.isIntersecting) { e.target.classList.add('active'); io.unobserve(e.target); }
+            }
+        }, { rootMargin: '0px 0px -150px 0px' }) : null;
+        function track(root) {
+            const els = root.matches && root.matches('.reveal') ? [root] : [];
+            els.push(...root.querySelectorAll('.reveal:not(.active)'));
+            for (const el of els) io ? io.observe(el) : el.classList.add('active');
+        }
+        track(document);
+        // Cards injected later (inventory, blog, product, post loaders) are picked up as they land
+        new MutationObserver((muts) => {
+            for (const m of muts) for (const n of m.addedNodes) if (n.nodeType === 1) track(n);
+        }).observe(document.body, { childList: true, subtree: true });
+    })();
+    """
+
+# --- NEW: SHARED ASSETS ---
+@cached_section
+def gen_app_js(cfg):
+    # Site-wide behaviour: one inline <script> per page, or app.<hash>.js in external-asset builds
+    parts = [
+        "function toggleMenu() { document.querySelector('.nav-links').classList.remove('active'); }",
+        gen_cart_js(cfg),
+        gen_scripts(),
+        "if ('serviceWorker' in navigator) { navigator.serviceWorker.register('service-worker.js'); }",
+    ]
+    if data_in_app_js(cfg): parts.insert(0, gen_csv_parser_js(cfg))
+    return "\n".join(parts)
+
+def content_hash(body):
+    return hashlib.sha256(body.encode("utf-8") if isinstance(body, str) else body).hexdigest()[:10]
+
+@cached_section
+def gen_asset_names(cfg):
+    return f"styles.{content_hash(get_theme_css(cfg))}.css", f"app.{content_hash(gen_app_js(cfg))}.js"
+
+def gen_headers(asset_names):
+    # Netlify / Cloudflare Pages _headers: hashed files never change, so let browsers and CDNs keep them forever
+    rules = [f"/{name}\n  Cache-Control: public, max-age=31536000, immutable" for name in asset_names]
+    return "\n".join(rules) + "\n"
+
+# --- NEW: CRITICAL CSS ---
+_ALWAYS_USED = {"*", "html", "body", ":root"}
+
+@functools.lru_cache(maxsize=64)
+def parse_css(css):
+    # -> [(prelude, body)], body is a declaration string or a nested rule list for @media/@supports
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    rules, i, n = [], 0, len(css)
+    while i < n:
+        open_at = css.find("{", i)
+        if open_at == -1: break
+        prelude = css[i:open_at].strip()
+        depth, j = 1, open_at + 1
+        while j < n and depth:
+            if css[j] == "{": depth += 1
+            elif css[j] == "}": depth -= 1
+            j += 1
+        body = css[open_at + 1:j - 1]
+        if prelude.startswith(("@media", "@supports")): body = parse_css(body)
+        rules.append((prelude, body))
+        i = j
+    return tuple(rules)
+
+def page_tokens(markup):
+    # Every word in the page (markup + scripts) counts as a possible class/id; tags must appear as <tag
+    words = set(re.findall(r'[A-Za-z_][\w-]*', markup))
+    tags = {t.lower() for t in re.findall(r'<([A-Za-z][\w-]*)', markup)}
+    return words, tags
+
+def selector_used(selector, words, tags):
+    sel = selector.strip()
+    if sel in _ALWAYS_USED: return True
+    sel = re.sub(r'::?[\w-]+(\([^)]*\))?', '', sel)
+    for name in re.findall(r'[.#]([\w-]+)', sel):
+        if name not in words: return False
+    for tag in re.findall(r'(?:^|[\s>+~])([a-zA-Z][\w-]*)', sel):
+        if tag.lower() not in tags | _ALWAYS_USED: return False
+    return True
+
+def purge_rules(rules, words, tags):
+    out, keyframes = [], []
+    for prelude, body in rules:
+        if prelude.startswith("@keyframes"):
+            keyframes.append((prelude, body))
+        elif isinstance(body, tuple):
+            inner = purge_rules(body, words, tags)
+            if inner: out.append(f"{prelude}{{{inner}}}")
+        elif prelude.startswith("@"):
+            out.append(f"{prelude}{{{body}}}")
+        else:
+            kept = [sel.strip() for sel in prelude.split(",") if selector_used(sel, words, tags)]
+            if kept: out.append(f"{', '.join(kept)} {{{body.strip()}}}")
+    used = "".join(out)
+    out += [f"{prelude}{{{body}}}" for prelude, body in keyframes if prelude.split()[-1] in used]
+    return "\n".join(out)
+
+def critical_css(css, markup):
+    words, tags = page_tokens(markup)
+    return purge_rules(parse_css(css), words, tags)
+
+def build_page(cfg, title, content, extra_js="", base=""):
+    # base="../" for pages written into sub-folders (product/<slug>.html) so relative links keep working
+    gsc_tag = cfg["gsc_tag"]
+    seo_d = cfg["seo_d"]
+    p_color = cfg["p_color"]
+    pwa_icon = cfg["pwa_icon"]
+    biz_name = cfg["biz_name"]
+    h_font = cfg["h_font"]
+    b_font = cfg["b_font"]
+    external = cfg["asset_mode"] == "external"
+    app_js = "" if external else f"<script>{gen_app_js(cfg)}</script>"
+    body = f"""
+    <body>
+        {gen_nav(cfg)}
+        {content}
+        {gen_footer(cfg)}
+        {gen_wa_widget(cfg)}
+        {gen_cart_system(cfg)}
+        {app_js}
+        {extra_js}
+    </body>"""
+    if cfg["critical_css"]:
+        # Rules this page can reach (its markup plus the site-wide JS that injects cart rows etc.)
+        css = critical_css(get_theme_css(cfg), body + (gen_app_js(cfg) if external else ""))
+    else:
+        css = get_theme_css(cfg)
+    if external:
+        css_name, js_name = gen_asset_names(cfg)
+        css_link = (f'<link rel="preload" href="{css_name}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'"><noscript><link rel="stylesheet" href="{css_name}"></noscript>'
+                    if cfg["critical_css"] else f'<link rel="stylesheet" href="{css_name}">')
+        head_assets = (f"<style>{css}</style>\n        " if cfg["critical_css"] else "") + f'{css_link}\n        <script src="{js_name}" defer></script>'
+    else:
+        head_assets = f"<style>{css}</style>"
+    meta_tags = f'<meta name="description" content="{seo_d}">'
+    if 'class="carousel-slide active"' in body: meta_tags += f"\n{gen_hero_preload(cfg)}"
+    if gsc_tag: meta_tags += f'\n<meta name="google-site-verification" content="{gsc_tag}">'
+
+    # Self-hosted faces (font_dir) are preloaded; a family without local files still comes from Google Fonts
+    fonts = cfg.get("@fonts") or []
+    hosted = {f["family"] for f in fonts}
+    google = [f"family={family.replace(' ', '+')}:wght@{weights}" for family, weights in ((h_font, "400;700;900"), (b_font, "300;400;600")) if family not in hosted]
+    font_links = [f'<link href="https://fonts.googleapis.com/css2?{"&".join(google)}&display=swap" rel="stylesheet">'] if google else []
+    for family, weight in ((h_font, 700), (b_font, 400)):
+        face = closest_face(fonts, family, weight)
+        link = face and f'<link rel="preload" href="{face["file"]}" as="font" type="font/{FONT_EXTENSIONS[face["format"]]}" crossorigin>'
+        if link and link not in font_links: font_links.append(link)
+    font_links = "\n        ".join(font_links)
+    
+    # NEW: PWA Meta Tags
+    pwa_tags = f"""
+    <link rel="manifest" href="manifest.json">
+    <meta name="theme-color" content="{p_color}">
+    <link rel="apple-touch-icon" href="{pwa_icon}">
+    """
+    
+    return f"""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0">
+        {f'<base href="{base}">' if base else ''}
+        <title>{title} | {biz_name}</title>
+        {meta_tags}
+        {pwa_tags}
+        {gen_schema(cfg)}
+        {font_links}
+        {head_assets}
+    </head>{body}
+    </html>
+    """
+
+# --- CONTENT GENERATORS (Blog, Product, Booking) ---
+
+def gen_booking_content(cfg):
+    booking_title = cfg["booking_title"]
+    booking_desc = cfg["booking_desc"]
+    booking_embed = cfg["booking_embed"]
+    return f"""
+    <section class="hero" style="min-height:30vh; background:var(--p);">
+        <div class="container hero-content"><h1>{booking_title}</h1><p>{booking_desc}</p></div>
+    </section>
+    <section>
+        <div class="container" style="text-align:center;">
+            <div style="background:white; border-radius:12px; overflow:hidden; box-shadow:0 10px 40px rgba(0,0,0,0.1); width:100%;">
+                {booking_embed}
+            </div>
+        </div>
+    </section>
+    """
+
+def gen_blog_index_html(cfg):
+    # UPDATED: Removed inline color style so CSS handles dark mode
+    hero_img_1 = image_src(cfg, cfg["hero_img_1"])
+    blog_hero_title = cfg["blog_hero_title"]
+    blog_hero_sub = cfg["blog_hero_sub"]
+    blog_sheet_url = cfg["blog_sheet_url"]
+    return f"""
+    <section class="hero" style="min-height:40vh; background-image: linear-gradient(rgba(0,0,0,0.6), rgba(0,0,0,0.6)), url('{hero_img_1}'); background-size: cover;">
+        <div class="container"><h1>{blog_hero_title}</h1><p>{blog_hero_sub}</p></div>
+    </section>
+    <section><div class="container"><div id="blog-grid" class="grid-3">Loading...</div></div></section>
+    {gen_csv_parser(cfg)}
+    <script>
+    let blogSrc = null, blogSeen = 0;
+    function blogCard(r) {{
+        return `<div class="card reveal"><img src="${{r[5]}}" class="prod-img"><div><span class="blog-badge">${{r[3]}}</span><h3><a href="post.html?id=${{r[0]}}">${{r[1]}}</a></h3></div></div>`;
+    }}
+    function renderBlog(rows) {{
+        // Stream batches grow one array: append only the rows since the last batch. A new array (cache hit,
+        // revalidated rows) replaces the grid once.
+        const box = document.getElementById('blog-grid');
+        if (rows !== blogSrc) {{ blogSrc = rows; blogSeen = 0; box.innerHTML = ''; }}
+        box.insertAdjacentHTML('beforeend', rows.slice(blogSeen).filter((r) => r.length > 4).map(blogCard).join(''));
+        blogSeen = rows.length;
+    }}
+    async function loadBlog() {{
+        try {{ renderBlog(await TitanData.rows('{blog_sheet_url}', renderBlog, renderBlog)); }} catch(e) {{}}
+    }}
+    document.addEventListener('DOMContentLoaded', loadBlog);
+    </script>
+    """
+
+# --- SOCIAL SHARE ---
+SHARE_ICONS = {
+    "wa": '<svg viewBox="0 0 24 24"><path d="M12.04 2c-5.46 0-9.91 4.45-9.91 9.91c0 1.75.46 3.45 1.32 4.95L2.05 22l5.25-1.38c1.45.79 3.08 1.21 4.74 1.21c5.46 0 9.91-4.45 9.91-9.91c0-2.65-1.03-5.14-2.9-7.01A9.816 9.816 0 0 0 12.04 2m.01 1.67c2.2 0 4.26.86 5.82 2.42a8.225 8.225 0 0 1 2.41 5.83c0 4.54-3.7 8.23-8.24 8.23c-1.48 0-2.93-.39-4.19-1.15l-.3-.17l-3.12.82l.83-3.04l-.2-.32a8.188 8.188 0 0 1-1.26-4.38c.01-4.54 3.7-8.24 8.25-8.24m-3.53 3.16c-.13 0-.35.05-.54.26c-.19.2-.72.7-.72 1.72s.73 2.01.83 2.14c.1.13 1.44 2.19 3.48 3.07c.49.21.87.33 1.16.43c.49.16.94.13 1.29.08c.4-.06 1.21-.5 1.38-.98c.17-.48.17-.89.12-.98c-.05-.09-.18-.13-.37-.23c-.19-.1-.1.13-.1.13s-1.13-.56-1.32-.66c-.19-.1-.32-.15-.45.05c-.13.2-.51.65-.62.78c-.11.13-.23.15-.42.05c-.19-.1-.8-.3-1.53-.94c-.57-.5-1.02-1.12-1.21-1.45c-.11-.19-.01-.29.09-.38c.09-.08.19-.23.29-.34c.1-.11.13-.19.19-.32c.06-.13.03-.24-.01-.34c-.05-.1-.45-1.08-.62-1.48c-.16-.4-.36-.34-.51-.35c-.11-.01-.25-.01-.4-.01Z"/></path></svg>',
+    "fb": '<svg viewBox="0 0 24 24"><path d="M18 2h-3a5 5 0 0 0-5 5v3H7v4h3v8h4v-8h3l1-4h-4V7a1 1 0 0 1 1-1h3z"></path></svg>',
+    "x": '<svg viewBox="0 0 24 24"><path d="M18.901 1.153h3.68l-8.04 9.19L24 22.846h-7.406l-5.8-7.584l-6.638 7.584H.474l8.6-9.83L0 1.154h7.594l5.243 6.932ZM17.61 20.644h2.039L6.486 3.24H4.298Z"></path></svg>',
+    "li": '<svg viewBox="0 0 24 24"><path d="M16 8a6 6 0 0 1 6 6v7h-4v-7a2 2 0 0 0-2-2a2 2 0 0 0-2 2v7h-4v-7a6 6 0 0 1 6-6zM2 9h4v12H2zM4 2a2 2 0 1 1-2 2a2 2 0 0 1 2-2z"></path></svg>',
+    "rd": '<svg viewBox="0 0 24 24"><path d="M12 0A12 12 0 0 0 0 12a12 12 0 0 0 12 12 12 12 0 0 0 12-12A12 12 0 0 0 12 0zm5.01 4.744c.688 0 1.25.561 1.25 1.249a1.25 1.25 0 0 1-2.498.056l-2.597-.547-.8 3.747c1.824.07 3.48.632 4.674 1.488.308-.309.73-.491 1.207-.491.968 0 1.754.786 1.754 1.754 0 .716-.435 1.333-1.01 1.614a3.111 3.111 0 0 1 .042.52c0 2.694-3.13 4.87-7.004 4.87-3.874 0-7.004-2.176-7.004-4.87 0-.183.015-.366.043-.534A1.748 1.748 0 0 1 4.028 12c0-.968.786-1.754 1.754-1.754.463 0 .898.196 1.207.49 1.207-.883 2.878-1.43 4.744-1.487l.885-4.182a.342.342 0 0 1 .14-.197.35.35 0 0 1 .238-.042l2.906.617a1.214 1.214 0 0 1 1.108-.701zM9.25 12C8.561 12 8 12.562 8 13.25c0 .687.561 1.248 1.25 1.248.687 0 1.248-.561 1.248-1.249 0-.688-.561-1.249-1.249-1.249zm5.5 0c-.687 0-1.248.561-1.248 1.25 0 .687.561 1.248 1.249 1.248.688 0 1.249-.561 1.249-1.249 0-.687-.562-1.249-1.25-1.249zm-5.466 3.99a.327.327 0 0 0-.231.094.33.33 0 0 0 0 .463c.842.842 2.484.913 2.961.913.477 0 2.105-.056 2.961-.913a.361.361 0 0 0 .029-.463.33.33 0 0 0-.464 0c-.547.533-1.684.73-2.512.73-.828 0-1.979-.196-2.512-.73a.326.326 0 0 0-.232-.095z"/></path></svg>',
+}
+
+def gen_share_links(u, t, networks=("wa", "fb", "x", "li")):
+    # u/t are already URL-encoded (or JS template placeholders like ${u} for runtime pages)
+    urls = {
+        "wa": f"https://wa.me/?text={t}%20{u}",
+        "fb": f"https://www.facebook.com/sharer/sharer.php?u={u}",
+        "x": f"https://twitter.com/intent/tweet?url={u}&text={t}",
+        "li": f"https://www.linkedin.com/sharing/share-offsite/?url={u}",
+        "rd": f"https://reddit.com/submit?url={u}&title={t}",
+    }
+    return "".join(f'<a href="{urls[n]}" target="_blank" class="share-btn bg-{n}">{SHARE_ICONS[n]}</a>' for n in networks)
+
+# --- UPDATED PRODUCT PAGE WITH SOCIAL SHARE ---
+def gen_product_page_content(cfg, is_demo=False):
+    sheet_url = cfg["sheet_url"]
+    custom_feat = cfg["custom_feat"]
+    demo_flag = "const isDemo = true;" if is_demo else "const isDemo = false;"
+    return f"""
+    <section style="padding-top:150px;"><div class="container"><div id="product-detail">Loading...</div></div></section>
+    {gen_csv_parser(cfg)}
+    <script>
+    {demo_flag}
+    function shareWA(url, title) {{ window.open('https://wa.me/?text=' + encodeURIComponent(title + ' ' + url), '_blank'); }}
+    function renderProduct(rows) {{
+        const params = new URLSearchParams(window.location.search);
+        let targetName = params.get('item');
+        if(isDemo && !targetName) targetName = "Demo Item";
+        for(const clean of rows) {{
+            if(isDemo) targetName = clean[0];
+            if(clean[0] === targetName) {{
+                let img = clean[3] || '{custom_feat}';
+                let stripe = (clean.length > 4 && clean[4].includes('http')) ? clean[4] : '';
+                let btn = stripe ? `<a href="${{stripe}}" class="btn btn-primary">Buy Now</a>` : `<button onclick="addToCart('${{clean[0]}}', '${{clean[1]}}')" class="btn btn-primary">Add to Cart</button>`;
+                
+                const u = encodeURIComponent(window.location.href);
+                const t = encodeURIComponent(clean[0]);
+                
+                document.getElementById('product-detail').innerHTML = `
+                    <div class="detail-view">
+                        <img src="${{img}}" style="width:100%; border-radius:12px;">
+                        <div>
+                            <h1 style="font-size:3rem; line-height:1.1;">${{clean[0]}}</h1>
+                            <p style="font-size:1.5rem; color:var(--s); font-weight:bold; margin-bottom:1.5rem;">${{clean[1]}}</p>
+                            <p>${{clean[2]}}</p>
+                            ${{btn}}
+                            
+                            <div style="margin-top:2rem; border-top:1px solid #eee; padding-top:1rem;">
+                                <p style="font-size:0.9rem; font-weight:bold;">Share Product:</p>
+                                <div class="share-row">
+                                    {gen_share_links('${u}', '${t}')}
+                                </div>
+                            </div>
+                        </div>
+                    </div>
+                `;
+                break;
+            }}
+        }}
+    }}
+    async function loadProduct() {{
+        try {{ renderProduct(await TitanData.rows('{sheet_url}', renderProduct)); }} catch(e) {{}}
+    }}
+    document.addEventListener('DOMContentLoaded', loadProduct);
+    </script>
+    """
+
+def gen_product_detail(cfg, row, slug):
+    # Static twin of the loadProduct() template, share links point at the canonical product URL
+    name, price, desc, img, stripe = product_fields(cfg, row)
+    btn = (f'<a href="{attr(stripe)}" class="btn btn-primary">Buy Now</a>' if stripe
+           else f'<button onclick="addToCart({js_call_args(name, price)})" class="btn btn-primary">Add to Cart</button>')
+    u = urllib.parse.quote(f"{cfg['prod_url'].rstrip('/')}/product/{slug}.html", safe="")
+    t = urllib.parse.quote(name, safe="")
+    return f"""
+    <section style="padding-top:150px;"><div class="container"><div id="product-detail">
+        <div class="detail-view">
+            {picture(cfg, img, "(max-width: 768px) 100vw, 50vw", f'style="width:100%; border-radius:12px;" alt="{attr(name)}"')}
+            <div>
+                <h1 style="font-size:3rem; line-height:1.1;">{name}</h1>
+                <p style="font-size:1.5rem; color:var(--s); font-weight:bold; margin-bottom:1.5rem;">{price}</p>
+                <p>{desc}</p>
+                {btn}
+                
+                <div style="margin-top:2rem; border-top:1px solid #eee; padding-top:1rem;">
+                    <p style="font-size:0.9rem; font-weight:bold;">Share Product:</p>
+                    <div class="share-row">{gen_share_links(u, t)}</div>
+                </div>
+            </div>
+        </div>
+    </div></div></section>
+    """
+
+# --- UPDATED BLOG POST WITH MOBILE PADDING FIX & SOCIAL SHARE ---
+def gen_blog_post_html(cfg):
+    blog_sheet_url = cfg["blog_sheet_url"]
+    return f"""
+    <div id="post-container" style="padding-top:70px;">Loading...</div>
+    {gen_csv_parser(cfg)}
+    <script>
+    function renderPost(rows) {{
+        const params = new URLSearchParams(window.location.search);
+        const slug = params.get('id');
+        const container = document.getElementById('post-container');
+        for(const r of rows) {{
+            if(r[0] === slug) {{
+                const contentHtml = parseMarkdown(r[6]);
+                const u = encodeURIComponent(window.location.href);
+                const t = encodeURIComponent(r[1]);
+                
+                container.innerHTML = `
+                    <div style="background:var(--p); padding:clamp(3rem, 8vw, 6rem) 1rem; color:white; text-align:center;">
+                        <div class="container">
+                            <span class="blog-badge">${{r[3]}}</span>
+                            <h1 style="font-size:clamp(1.8rem, 5vw, 3.5rem); margin-top:1rem;">${{r[1]}}</h1>
+                        </div>
+                    </div>
+                    <div class="container" style="max-width:800px; padding:3rem 1.5rem;">
+                        <img src="${{r[5]}}" style="width:100%; border-radius:12px; margin-bottom:2rem;">
+                        <div style="line-height:1.8;">${{contentHtml}}</div>
+                        
+                        <div style="margin-top:3rem; border-top:1px solid #eee; padding-top:1.5rem;">
+                            <p style="font-weight:bold;">Share this article:</p>
+                            <div class="share-row">
+                                {gen_share_links('${u}', '${t}', networks=("wa", "fb", "x", "li", "rd"))}
+                            </div>
+                        </div>
+                        <a href="blog.html" class="btn btn-primary" style="margin-top:2rem;">&larr; Back to Blog</a>
+                    </div>
+                `;
+                break;
+            }}
+        }}
+    }}
+    async function loadPost() {{
+        try {{ renderPost(await TitanData.rows('{blog_sheet_url}', renderPost)); }} catch(e) {{}}
+    }}
+    document.addEventListener('DOMContentLoaded', loadPost);
+    </script>
+    """
+
+# --- NEW: STATIC BLOG (PRERENDER) ---
+def load_posts(cfg):
+    # Same rows loadBlog() shows (id, title, date, category, excerpt, image, body); slug from the id column
+    rows = [r for r in load_sheet_rows(cfg["blog_sheet_url"]) if len(r) > 4]
+    return list(zip(unique_slugs(r[0] or r[1] for r in rows), rows))
+
+def blog_page_name(n):
+    return "blog.html" if n == 1 else f"blog-{n}.html"
+
+def gen_blog_pager(page, pages):
+    if pages < 2: return ""
+    links = []
+    if page > 1: links.append(f'<a href="{blog_page_name(page - 1)}" class="btn btn-primary" style="padding:0.6rem 1.2rem;">&larr; Newer</a>')
+    for n in range(1, pages + 1):
+        style = "padding:0.6rem 1rem;" + (" background:var(--s); color:white;" if n == page else "")
+        links.append(f'<a href="{blog_page_name(n)}" class="btn" style="{style}">{n}</a>')
+    if page < pages: links.append(f'<a href="{blog_page_name(page + 1)}" class="btn btn-primary" style="padding:0.6rem 1.2rem;">Older &rarr;</a>')
+    return f'<div style="display:flex; gap:0.5rem; justify-content:center; flex-wrap:wrap; margin-top:3rem;">{"".join(links)}</div>'
+
+def gen_blog_index_static(cfg, posts, page, pages):
+    hero_img_1 = image_src(cfg, cfg["hero_img_1"])
+    blog_hero_title = cfg["blog_hero_title"]
+    blog_hero_sub = cfg["blog_hero_sub"]
+    cards = "".join(f'<div class="card reveal"><a href="blog/{slug}.html"><img src="{attr(r[5] if len(r) > 5 else "")}" class="prod-img" loading="lazy" alt="{attr(r[1])}"></a><div><span class="blog-badge">{r[3]}</span><h3><a href="blog/{slug}.html">{r[1]}</a></h3></div></div>' for slug, r in posts)
+    return f"""
+    <section class="hero" style="min-height:40vh; background-image: linear-gradient(rgba(0,0,0,0.6), rgba(0,0,0,0.6)), url('{hero_img_1}'); background-size: cover;">
+        <div class="container"><h1>{blog_hero_title}</h1><p>{blog_hero_sub}</p></div>
+    </section>
+    <section><div class="container"><div id="blog-grid" class="grid-3">{cards}</div>{gen_blog_pager(page, pages)}</div></section>
+    """
+
+def gen_blog_post_static(cfg, row, slug):
+    r = row + [""] * (7 - len(row))
+    u = urllib.parse.quote(f"{cfg['prod_url'].rstrip('/')}/blog/{slug}.html", safe="")
+    t = urllib.parse.quote(r[1], safe="")
+    return f"""
+    <div id="post-container" style="padding-top:70px;">
+        <div style="background:var(--p); padding:clamp(3rem, 8vw, 6rem) 1rem; color:white; text-align:center;">
+            <div class="container">
+                <span class="blog-badge">{r[3]}</span>
+                <h1 style="font-size:clamp(1.8rem, 5vw, 3.5rem); margin-top:1rem;">{r[1]}</h1>
+            </div>
+        </div>
+        <div class="container" style="max-width:800px; padding:3rem 1.5rem;">
+            <img src="{attr(r[5])}" style="width:100%; border-radius:12px; margin-bottom:2rem;" alt="{attr(r[1])}">
+            <div style="line-height:1.8;">{format_text(r[6])}</div>
+            
+            <div style="margin-top:3rem; border-top:1px solid #eee; padding-top:1.5rem;">
+                <p style="font-weight:bold;">Share this article:</p>
+                <div class="share-row">{gen_share_links(u, t, networks=("wa", "fb", "x", "li", "rd"))}</div>
+            </div>
+            <a href="blog.html" class="btn btn-primary" style="margin-top:2rem;">&larr; Back to Blog</a>
+        </div>
+    </div>
+    """
+
+def gen_post_redirect(posts):
+    # Keeps old post.html?id=... links alive without shipping the blog CSV
+    id_map = json.dumps({r[0]: slug for slug, r in posts}).replace("</", "<\\/")
+    return f"""<!DOCTYPE html><html lang="en"><head><meta charset="UTF-8"><meta name="robots" content="noindex"><title>Redirecting...</title>
+    <script>const m = {id_map}; const id = new URLSearchParams(location.search).get('id'); location.replace(m[id] ? 'blog/' + m[id] + '.html' : 'blog.html');</script>
+    </head><body><a href="blog.html">Blog</a></body></html>"""
+
+def gen_inner_header(title):
+    return f"""<section class="hero" style="min-height: 40vh; background:var(--p);"><div class="container"><h1>{title}</h1></div></section>"""
+
+# --- NEW: MINIFIER ---
+# Conservative by design: string and template literals are copied verbatim, line breaks are kept
+# wherever automatic semicolon insertion could depend on them.
+_REGEX_PREFIX = set("(,=:[!&|?{};+-*%<>~^")
+_NO_NL_AFTER = set("{;,([=:&|?")
+_NO_NL_BEFORE = set("})],;")
+_WORD = re.compile(r'[\w$]')
+_REGEX_KEYWORDS = {"return", "typeof", "case", "do", "else", "in", "of", "new", "delete", "void", "throw"}
+
+def _squeeze_markup(chunk):
+    # Template literals holding HTML for innerHTML: indentation runs render as one space anyway
+    if "<" not in chunk or "<pre" in chunk or "<textarea" in chunk: return chunk
+    return re.sub(r'\n\s*', ' ', chunk)
+
+@functools.lru_cache(maxsize=512)
+def minify_js(src):
+    out = []
+    i, n = 0, len(src)
+    last = ""  # last significant emitted char
+    last_word = ""
+    pending = ""  # collapsed whitespace waiting for the next token: "", " " or "\n"
+    template_depth = []  # brace depth stack for ${ ... } inside template literals
+
+    def emit(text):
+        nonlocal pending, last, last_word
+        if pending and last:
+            nxt = text[0]
+            if pending == "\n" and last not in _NO_NL_AFTER and nxt not in _NO_NL_BEFORE:
+                out.append("\n")
+            elif (_WORD.match(last) and _WORD.match(nxt)) or (last in "+-" and nxt == last):
+                out.append(" ")
+        pending = ""
+        out.append(text)
+        last = text[-1]
+        last_word = text if _WORD.match(text[0]) else ""
+
+    def read_template(j):
+        # copy a template literal chunk up to closing ` or ${, return (chunk, end, opens_expr)
+        k = j
+        while k < n:
+            if src[k] == "\\": k += 2; continue
+            if src[k] == "`": return _squeeze_markup(src[j:k + 1]), k + 1, False
+            if src.startswith("${", k): return _squeeze_markup(src[j:k + 2]), k + 2, True
+            k += 1
+        return src[j:], n, False
+
+    while i < n:
+        c = src[i]
+        if c in " \t\r\n":
+            j = i
+            while j < n and src[j] in " \t\r\n": j += 1
+            if "\n" in src[i:j] or pending == "\n": pending = "\n"
+            elif not pending: pending = " "
+            i = j
+        elif src.startswith("//", i):
+            j = src.find("\n", i)
+            i = n if j == -1 else j
+        elif src.startswith("/*", i):
+            j = src.find("*/", i + 2)
+            i = n if j == -1 else j + 2
+            if not pending: pending = " "
+        elif c in "'\"":
+            j = i + 1
+            while j < n and src[j] != c:
+                j += 2 if src[j] == "\\" else 1
+            emit(src[i:j + 1])
+            i = j + 1
+        elif c == "`":
+            chunk, i, opens = read_template(i + 1)
+            emit("`" + chunk)
+            if opens: template_depth.append(0)
+        elif c == "/" and (not last or last in _REGEX_PREFIX or last_word in _REGEX_KEYWORDS):
+            j, in_class = i + 1, False
+            while j < n and (in_class or src[j] != "/"):
+                if src[j] == "\\": j += 1
+                elif src[j] == "[": in_class = True
+                elif src[j] == "]": in_class = False
+                j += 1
+            j += 1
+            while j < n and src[j].isalpha(): j += 1
+            emit(src[i:j])
+            i = j
+        elif c == "}" and template_depth and template_depth[-1] == 0:
+            template_depth.pop()
+            chunk, i, opens = read_template(i + 1)
+            emit("}" + chunk)
+            if opens: template_depth.append(0)
+        else:
+            if template_depth and c == "{": template_depth[-1] += 1
+            elif template_depth and c == "}": template_depth[-1] -= 1
+            j = i + 1
+            if _WORD.match(c):
+                while j < n and _WORD.match(src[j]): j += 1
+            emit(src[i:j])
+            i = j
+    return "".join(out).strip()
+
+@functools.lru_cache(maxsize=512)
+def minify_css(src):
+    src = re.sub(r'/\*.*?\*/', '', src, flags=re.S)
+    src = re.sub(r'\s+', ' ', src)
+    src = re.sub(r'\s*([{};,])\s*', r'\1', src)
+    src = re.sub(r':\s+', ':', src)
+    return src.replace(";}", "}").strip()
+
+_BLOCK_TAGS = "html|head|body|div|section|nav|footer|header|main|ul|ol|li|p|h[1-6]|meta|link|title|base|script|style|table|thead|tbody|tr|th|td|details|summary|form|iframe|!DOCTYPE"
+_RAW_BLOCK = re.compile(r'(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2>)', re.S | re.I)
+
+def minify_html(src):
+    kept = []
+
+    def stash(m):
+        tag, body = m.group(2).lower(), m.group(3)
+        if tag == "style": body = minify_css(body)
+        elif "ld+json" in m.group(1): body = json.dumps(json.loads(body), separators=(",", ":"), ensure_ascii=False).replace("</", "<\\/")
+        elif tag == "script" and "ld+json" not in m.group(1) and body.strip(): body = minify_js(body)
+        kept.append(re.sub(r'\s+', ' ', m.group(1)) + body + m.group(4))
+        return f"\x00{len(kept) - 1}\x00"
+
+    src = _RAW_BLOCK.sub(stash, src)
+    src = re.sub(r'<!--(?!\[if).*?-->', '', src, flags=re.S)
+    src = re.sub(r'\s+', ' ', src)
+    src = re.sub(rf'\s*(</?(?:{_BLOCK_TAGS})\b[^>]*>|\x00\d+\x00)\s*', r'\1', src, flags=re.I)
+    return re.sub(r'\x00(\d+)\x00', lambda m: kept[int(m.group(1))], src).strip()
+
+def minify_file(name, body):
+    if not isinstance(body, str): return body
+    if name.endswith(".html"): return minify_html(body)
+    if name.endswith(".css"): return minify_css(body)
+    if name.endswith(".js"): return minify_js(body)
+    if name.endswith(".json"): return json.dumps(json.loads(body), separators=(",", ":"), ensure_ascii=False)
+    return body
+
+def minify_files(files):
+    # Returns the minified files plus a per-file (name, before, after) byte report
+    out, report = {}, []
+    for name, body in files.items():
+        small = minify_file(name, body)
+        out[name] = small
+        report.append((name, byte_len(body), byte_len(small)))
+    return out, report
+
+def byte_len(body):
+    return len(body.encode("utf-8")) if isinstance(body, str) else len(body)
+
+# --- PAGE ASSEMBLY ---
+def gen_testimonials(cfg):
+    t_cards = "".join([f'<div class="card reveal" style="text-align:center;"><i>"{x.split("|")[1]}"</i><br><b>- {x.split("|")[0]}</b></div>' for x in cfg["testi_data"].split('\n') if "|" in x])
+    return f'<section style="background:#f8fafc"><div class="container"><div class="section-head reveal"><h2>Client Stories</h2></div><div class="grid-3">{t_cards}</div></div></section>'
+
+def gen_cta():
+    return '<section style="background:var(--s); color:white; text-align:center;"><div class="container reveal"><h2>Start Owning Your Future</h2><p style="margin-bottom:2rem;">Stop paying rent.</p><a href="contact.html" class="btn" style="background:white; color:var(--s);">Get Started</a></div></section>'
+
+def gen_home_content(cfg, products=None):
+    home_content = ""
+    if cfg["show_hero"]: home_content += gen_hero(cfg)
+    if cfg["show_stats"]: home_content += gen_stats(cfg)
+    if cfg["show_features"]: home_content += gen_features(cfg)
+    if cfg["show_pricing"]: home_content += gen_pricing_table(cfg)
+    if cfg["show_inventory"]: home_content += gen_inventory(cfg, products)
+    if cfg["show_gallery"]: home_content += gen_about_section(cfg)
+    if cfg["show_testimonials"]: home_content += gen_testimonials(cfg)
+    if cfg["show_faq"]: home_content += gen_faq_section(cfg)
+    if cfg["show_cta"]: home_content += gen_cta()
+    return home_content
+
+def gen_text_page(title, text):
+    return f"{gen_inner_header(title)}<div class='container'>{format_text(text)}</div>"
+
+def gen_contact_content(cfg):
+    biz_addr = cfg["biz_addr"]
+    biz_phone = cfg["biz_phone"]
+    biz_email = cfg["biz_email"]
+    wa_num = cfg["wa_num"]
+    prod_url = cfg["prod_url"]
+    map_iframe = cfg["map_iframe"]
+    return f"""
+{gen_inner_header("Contact Us")}
+<section>
+    <div class="container">
+        <div class="contact-grid">
+            <div>
+                <div style="background:var(--card); padding:2rem; border-radius:12px; border:1px solid #eee;">
+                    <h3 style="color:var(--p);">Get In Touch</h3>
+                    <p style="margin-top:1rem;"><strong>📍 Address:</strong><br>{biz_addr.replace(chr(10),'<br>')}</p>
+                    <p style="margin-top:1rem;"><strong>📞 Phone:</strong><br><a href="tel:{biz_phone}" style="color:var(--s);">{biz_phone}</a></p>
+                    <p style="margin-top:1rem;"><strong>📧 Email:</strong><br><a href="mailto:{biz_email}">{biz_email}</a></p>
+                    <br>
+                    <a href="https://wa.me/{wa_num}" target="_blank" class="btn btn-accent" style="width:100%; text-align:center;">Chat on WhatsApp</a>
+                </div>
+            </div>
+            
+            <div class="card">
+                <h3 style="margin-bottom:1.5rem;">Send a Message</h3>
+                <form action="https://formsubmit.co/{biz_email}" method="POST">
+                    <div style="display:grid; grid-template-columns:1fr 1fr; gap:1rem;">
+                        <div><label>Name</label><input type="text" name="name" required placeholder="Your Name"></div>
+                        <div><label>Email</label><input type="email" name="email" required placeholder="Your Email"></div>
+                    </div>
+                    <label>Message</label><textarea name="message" rows="5" required placeholder="How can we help you?"></textarea>
+                    <button type="submit" class="btn btn-primary" style="width:100%;">Send Message</button>
+                    <input type="hidden" name="_captcha" value="false">
+                    <input type="hidden" name="_next" value="{prod_url}/contact.html">
+                </form>
+            </div>
+        </div>
+        <br><br>
+        <div style="border-radius:12px; overflow:hidden; box-shadow:0 10px 30px rgba(0,0,0,0.1);">{map_iframe}</div>
+    </div>
+</section>
+"""
+
+# --- SITE COMPILER ---
+# --- INCREMENTAL BUILDS ---
+# Every output file is rendered through an _InputRecorder, so the build knows exactly which config keys
+# (plus sheet rows and the compiler source itself) each file read. The next build re-renders only files
+# whose recorded inputs changed and copies the rest from the previous SiteBuild.
+with open(__file__, "rb") as _src:
+    COMPILER_VERSION = content_hash(_src.read())
+_MISSING = object()
+
+def input_digest(value):
+    return "-" if value is _MISSING else hashlib.blake2b(repr(value).encode("utf-8"), digest_size=8).hexdigest()
+
+def stale_reason(previous, name, digest_of):
+    # None when the previous copy of `name` is still valid, otherwise a short human-readable reason
+    if previous is None: return "no previous build"
+    if name not in previous.deps or name not in previous.files: return "new file"
+    changed = sorted(k.lstrip("@") for k, d in previous.deps[name].items() if digest_of(k) != d)
+    if not changed: return None
+    return "changed: " + ", ".join(changed[:5]) + (f" (+{len(changed) - 5} more)" if len(changed) > 5 else "")
+
+@dataclass
+class SiteBuild:
+    files: dict = field(default_factory=dict)
+    seconds: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    size_report: list = field(default_factory=list)  # (file, bytes before, bytes after) when minified
+    deps: dict = field(default_factory=dict)  # file -> {input key: digest} read while rendering it
+    rebuilt: dict = field(default_factory=dict)  # file -> reason; files missing here were reused
+
+    def total_bytes(self):
+        return sum(byte_len(v) for v in self.files.values())
+
+def save_build_state(build, path):
+    # Persist what the next incremental build needs: outputs, their inputs, and pre-minify sizes
+    files = {n: ({"b64": base64.b64encode(b).decode("ascii")} if isinstance(b, bytes) else b) for n, b in build.files.items()}
+    state = {"compiler": COMPILER_VERSION, "files": files, "deps": build.deps, "sizes": {n: b for n, b, _ in build.size_report}}
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def load_build_state(path):
+    # A missing or unreadable state file just means a full build
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    files = {n: (base64.b64decode(b["b64"]) if isinstance(b, dict) else b) for n, b in state.get("files", {}).items()}
+    sizes = state.get("sizes", {})
+    return SiteBuild(files, deps=state.get("deps", {}), size_report=[(n, sizes[n], byte_len(files[n])) for n in sizes if n in files])
+
+def compile_site(cfg, previous=None):
+    cfg = make_config(cfg)
+    t0 = time.perf_counter()
+    hits0, misses0 = SECTION_CACHE.hits, SECTION_CACHE.misses
+    products = load_products(cfg) if cfg["prerender_inventory"] and cfg["sheet_url"] else None
+    posts = load_posts(cfg) if cfg["show_blog"] and cfg["prerender_blog"] and cfg["blog_sheet_url"] else None
+    # Render inputs: the config plus "@" pseudo-keys for data that does not live in it
+    translations = load_translations(cfg) if cfg["lang_sheet"] else {}
+    fonts = find_fonts(cfg["font_dir"], [cfg["h_font"], cfg["b_font"]]) if cfg["font_dir"] else []
+    search, search_files = None, {}
+    if cfg["show_search"]:
+        # The index covers the sheets whether or not their pages are prerendered
+        search_products = products if products is not None else (load_products(cfg) if cfg["sheet_url"] else [])
+        search_posts = posts if posts is not None else (load_posts(cfg) if cfg["show_blog"] and cfg["blog_sheet_url"] else [])
+        search, search_files = build_index(search_documents(cfg, search_products, search_posts))
+    images, image_files = build_images(cfg, products)
+    inputs = {**cfg, "@compiler": COMPILER_VERSION, "@products": products, "@images": images, "@lang": translations, "@search": search, "@fonts": fonts}
+    digests = {}
+    def digest_of(key):
+        if key not in digests: digests[key] = input_digest(inputs.get(key, _MISSING))
+        return digests[key]
+    prev_sizes = {n: b for n, b, _ in previous.size_report} if previous else {}
+    files, deps, rebuilt, size_report = {}, {}, {}, []
+
+    def emit(name, render):
+        reason = stale_reason(previous, name, digest_of)
+        if reason is None:
+            files[name], deps[name] = previous.files[name], previous.deps[name]
+            if name in prev_sizes: size_report.append((name, prev_sizes[name], byte_len(files[name])))
+            return
+        rec = _InputRecorder(inputs)
+        rec.read.add("@compiler")
+        body = render(rec)
+        if isinstance(body, str) and rec["minify"]:
+            small = minify_file(name, body)
+            size_report.append((name, byte_len(body), byte_len(small)))
+            body = small
+        files[name], rebuilt[name] = body, reason
+        deps[name] = {k: digest_of(k) for k in rec.read}
+
+    def emit_localized(name, render):
+        # Base page plus <stem>.<lang>.html per translation column; variants reuse the base render when it ran
+        raw = {}
+        def base(c):
+            raw["body"], raw["read"] = render(c), set(c.read)
+            return localize_page(c, raw["body"], name, None)
+        def variant(c, lang):
+            if "body" in raw: c.read.update(raw["read"])
+            else: raw["body"], raw["read"] = render(c), set(c.read)
+            return localize_page(c, raw["body"], name, lang)
+        emit(name, base)
+        for lang in translations:
+            emit(localized_name(name, lang), lambda c, lang=lang: variant(c, lang))
+
+    pages = [
+        ("index.html", lambda c: build_page(c, "Home", gen_home_content(c, c["@products"]))),
+        ("about.html", lambda c: build_page(c, "About", gen_text_page("About", c["about_long"]))),
+        ("contact.html", lambda c: build_page(c, "Contact", gen_contact_content(c))),
+        ("privacy.html", lambda c: build_page(c, "Privacy", gen_text_page("Privacy", c["priv_txt"]))),
+        ("terms.html", lambda c: build_page(c, "Terms", gen_text_page("Terms", c["term_txt"]))),
+        ("booking.html", lambda c: build_page(c, "Book Now", gen_booking_content(c))),
+        ("product.html", lambda c: build_page(c, "Product Details", gen_product_page_content(c, is_demo=False))),
+    ]
+    for slug, row in products or []:
+        inputs[f"@product:{slug}"] = row
+        pages.append((f"product/{slug}.html", lambda c, k=f"@product:{slug}", slug=slug: build_page(c, c[k][0], gen_product_detail(c, c[k], slug), base="../")))
+    if products and cfg["show_inventory"]:
+        page_size = max(1, int(cfg["inv_page_size"]))
+        count = -(-len(products) // page_size)
+        for n in range(2, count + 1):
+            inputs[f"@store:{n}"] = (products[(n - 1) * page_size:n * page_size], count)
+            pages.append((store_page_name(n), lambda c, k=f"@store:{n}", n=n: gen_store_page(c, c[k][0], n, c[k][1])))
+    if posts is not None:
+        per_page = max(1, int(cfg["blog_per_page"]))
+        chunks = [posts[i:i + per_page] for i in range(0, len(posts), per_page)] or [[]]
+        for n, chunk in enumerate(chunks, 1):
+            inputs[f"@blog:{n}"] = (chunk, len(chunks))
+            pages.append((blog_page_name(n), lambda c, k=f"@blog:{n}", n=n: build_page(c, "Blog" if n == 1 else f"Blog - Page {n}", gen_blog_index_static(c, c[k][0], n, c[k][1]))))
+        for slug, row in posts:
+            inputs[f"@post:{slug}"] = row
+            pages.append((f"blog/{slug}.html", lambda c, k=f"@post:{slug}", slug=slug: build_page(c, c[k][1], gen_blog_post_static(c, c[k], slug), base="../")))
+    elif cfg["show_blog"]:
+        pages.append(("blog.html", lambda c: build_page(c, "Blog", gen_blog_index_html(c))))
+        pages.append(("post.html", lambda c: build_page(c, "Article", gen_blog_post_html(c))))
+    if search is not None:
+        pages.append(("search.html", lambda c: build_page(c, "Search", gen_search_content(c, c["@search"]))))
+    if translations:
+        inputs["@pages"] = [name for name, _ in pages]  # localized links only point at pages that have variants
+        for name, render in pages: emit_localized(name, render)
+    else:
+        for name, render in pages: emit(name, render)
+    if posts is not None:
+        inputs["@posts"] = posts
+        emit("post.html", lambda c: gen_post_redirect(c["@posts"]))
+    if cfg["asset_mode"] == "external":
+        css_name, js_name = gen_asset_names(inputs)  # same mapping the pages link from (incl. @fonts)
+        emit(css_name, get_theme_css)
+        emit(js_name, gen_app_js)
+        emit("_headers", lambda c: gen_headers(gen_asset_names(c)))
+    if fonts:
+        # Subset to every character the pages contain; font file names are fixed, so no page depends on this
+        inputs["@glyphs"] = used_glyphs(body for name, body in files.items() if name.endswith(".html"))
+        for i, face in enumerate(fonts):
+            emit(face["file"], lambda c, i=i: render_font(c["@fonts"][i], c["@glyphs"]))
+    for name in sorted(search_files):
+        inputs[f"@{name}"] = search_files[name]
+        emit(name, lambda c, k=f"@{name}": c[k])
+    for name in sorted(image_files):
+        emit(name, lambda c, name=name: image_files[name])  # content-addressed names: same name, same bytes
+    emit("manifest.json", gen_pwa_manifest)
+    # The worker version hashes every other output, so it is the one file that depends on all of them
+    inputs["@files"] = dict(files)
+    emit("service-worker.js", lambda c: gen_sw(c, c["@files"]))
+    return SiteBuild(files, time.perf_counter() - t0, SECTION_CACHE.hits - hits0, SECTION_CACHE.misses - misses0,
+                     size_report, deps, rebuilt)
+
+def site_slug(cfg):
+    return cfg["biz_name"].lower().replace(' ', '_')
+
+def zip_site(files):
+    z_b = io.BytesIO()
+    with zipfile.ZipFile(z_b, "a", zipfile.ZIP_DEFLATED, False) as zf:
+        for name, body in files.items():
+            zf.writestr(name, body)
+    return z_b.getvalue()
+
+def write_site_dir(files, out_dir):
+    for name, body in files.items():
+        path = os.path.join(out_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(body.encode("utf-8") if isinstance(body, str) else body)
+
+# --- BATCH BUILD CLI ---
+def load_site_configs(paths):
+    # Accepts .json (one config or a list), .jsonl, or directories of .json files.
+    jobs = []
+    for path in paths:
+        if os.path.isdir(path):
+            jobs += load_site_configs(sorted(os.path.join(path, p) for p in os.listdir(path) if p.endswith((".json", ".jsonl"))))
+            continue
+        stem = os.path.splitext(os.path.basename(path))[0]
+        with open(path, encoding="utf-8") as f:
+            if path.endswith(".jsonl"):
+                items = [json.loads(line) for line in f if line.strip()]
+            else:
+                data = json.load(f)
+                items = data if isinstance(data, list) else [data]
+        for i, item in enumerate(items):
+            name = item.get("site_id") or (stem if len(items) == 1 else f"{stem}_{i + 1}")
+            jobs.append((name, item))
+    return jobs
+
+def _build_job(job):
+    name, overrides, out_dir, fmt, incremental = job
+    t0 = time.perf_counter()
+    state_path = os.path.join(out_dir, f".{name}.titan-build.json")
+    try:
+        previous = load_build_state(state_path) if incremental else None
+        build = compile_site(overrides, previous)
+        if fmt == "zip":
+            with open(os.path.join(out_dir, f"{name}.zip"), "wb") as f:
+                f.write(zip_site(build.files))
+        elif previous is not None:
+            # Only touch what changed, and drop pages that no longer exist
+            site_dir = os.path.join(out_dir, name)
+            write_site_dir({n: build.files[n] for n in build.rebuilt}, site_dir)
+            for gone in set(previous.files) - set(build.files):
+                try: os.remove(os.path.join(site_dir, gone))
+                except FileNotFoundError: pass
+        else:
+            write_site_dir(build.files, os.path.join(out_dir, name))
+        if incremental: save_build_state(build, state_path)
+    except Exception as e:
+        return name, time.perf_counter() - t0, 0, 0, "", f"{type(e).__name__}: {e}"
+    return (name, time.perf_counter() - t0, len(build.files), build.total_bytes(),
+            f"cache {build.cache_hits}/{build.cache_hits + build.cache_misses}  rebuilt {len(build.rebuilt)}/{len(build.files)}", None)
+
+def batch_build(jobs, out_dir, fmt="zip", workers=None, log=print, incremental=False):
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = [(name, overrides, out_dir, fmt, incremental) for name, overrides in jobs]
+    results = []
+    t0 = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        for name, secs, n_files, n_bytes, cache, err in pool.map(_build_job, tasks, chunksize=4):
+            results.append((name, secs, n_files, n_bytes, err))
+            if err: log(f"  FAIL {name:<32} {secs * 1000:8.1f} ms  {err}")
+            else: log(f"  ok   {name:<32} {secs * 1000:8.1f} ms  {n_files:3d} files  {n_bytes / 1024:8.1f} KB  {cache}")
+    wall = time.perf_counter() - t0
+    times = sorted(r[1] for r in results if not r[4])
+    if times:
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+        log(f"Built {len(times)}/{len(results)} sites in {wall:.2f}s wall | avg {sum(times) / len(times) * 1000:.1f} ms | p95 {p95 * 1000:.1f} ms | {len(times) / wall:.1f} sites/s")
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Titan batch compiler: build many client sites from JSON site configs.")
+    parser.add_argument("configs", nargs="+", help="Config .json/.jsonl files or directories of them")
+    parser.add_argument("-o", "--out", default="dist", help="Output directory (default: dist)")
+    parser.add_argument("-f", "--format", choices=["zip", "dir"], default="zip", help="One ZIP or one directory per site")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("-i", "--incremental", action="store_true", help="Re-render only files whose inputs changed since the last build (state kept in <out>/.<site>.titan-build.json)")
+    args = parser.parse_args(argv)
+
+    jobs = load_site_configs(args.configs)
+    print(f"Titan batch build: {len(jobs)} site(s) -> {args.out} ({args.format})")
+    results = batch_build(jobs, args.out, args.format, args.workers, incremental=args.incremental)
+    return 1 if any(r[4] for r in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import functools
+import io
+import os
+import re
+
+try:  # optional: without fontTools the font files are bundled as they are, unsubsetted
+    from fontTools import subset as ft_subset
+    from fontTools.ttLib import TTFont
+except ImportError:
+    ft_subset = TTFont = None
+
+# --- TITAN FONT PIPELINE ---
+# Local font files for the heading/body families are matched by file name (Inter-Regular.ttf,
+# Montserrat-BoldItalic.otf, Inter[wght].ttf), subset to the characters the site actually uses and
+# written as WOFF2 under fonts/. Output names do not depend on the subset, so pages never wait on it.
+
+FONT_FORMATS = {".woff2": "woff2", ".woff": "woff", ".ttf": "truetype", ".otf": "opentype"}
+FONT_EXTENSIONS = {fmt: ext[1:] for ext, fmt in FONT_FORMATS.items()}
+WEIGHTS = {
+    "thin": 100, "hairline": 100, "extralight": 200, "ultralight": 200, "light": 300, "regular": 400, "normal": 400,
+    "book": 400, "": 400, "medium": 500, "semibold": 600, "demibold": 600, "bold": 700, "extrabold": 800,
+    "ultrabold": 800, "black": 900, "heavy": 900,
+}
+ALWAYS_GLYPHS = "".join(chr(c) for c in range(0x20, 0x7F)) + " –—‘’“”•…€£₹"  # sheet rows rendered at runtime
+
+def _squash(text):
+    return re.sub(r"[^a-z0-9\[\]]", "", text.lower())
+
+def output_format():
+    # What render_font() writes: WOFF2 needs fontTools + brotli, WOFF only fontTools, otherwise the source as-is
+    if ft_subset is None: return None
+    try:
+        import brotli  # noqa: F401
+        return "woff2"
+    except ImportError:
+        return "woff"
+
+def find_fonts(folder, families):
+    # One face per (family, weight, style) found in `folder`; families without files are left to Google Fonts
+    if not folder or not os.path.isdir(folder): return []
+    fmt = output_format()
+    # Subsetting prefers plain TrueType/OpenType sources; without it the smallest file is served directly
+    rank = [".ttf", ".otf", ".woff2", ".woff"] if fmt else [".woff2", ".woff", ".ttf", ".otf"]
+    names = sorted(os.listdir(folder))
+    faces = {}
+    for family in dict.fromkeys(families):
+        key = _squash(family)
+        for file in names:
+            stem, ext = os.path.splitext(file)
+            ext = ext.lower()
+            if ext not in FONT_FORMATS or not _squash(stem).startswith(key): continue
+            rest = _squash(stem)[len(key):]
+            italic = "italic" in rest or "oblique" in rest
+            rest = re.sub(r"italic|oblique|regular(?=italic)", "", rest)
+            if "wght" in rest or "variable" in rest: weight = "100 900"
+            elif rest in WEIGHTS: weight = str(WEIGHTS[rest])
+            else: continue  # another family sharing the prefix, e.g. "Montserrat Alternates"
+            style = "italic" if italic else "normal"
+            current = faces.get((family, weight, style))
+            if current and rank.index(os.path.splitext(current["path"])[1].lower()) <= rank.index(ext): continue
+            path = os.path.join(folder, file)
+            out_ext = fmt or FONT_FORMATS[ext]
+            slug = re.sub(r"[^a-z0-9]+", "-", family.lower()).strip("-")
+            stat = os.stat(path)
+            faces[(family, weight, style)] = {
+                "family": family, "weight": weight, "style": style, "path": path, "stamp": (stat.st_size, stat.st_mtime_ns),
+                "file": f"fonts/{slug}-{weight.replace(' ', '-')}{'-italic' if italic else ''}.{FONT_EXTENSIONS[out_ext]}",
+                "format": out_ext,
+            }
+    return sorted(faces.values(), key=lambda f: (f["family"], f["weight"], f["style"]))
+
+def font_face_css(faces):
+    return "\n".join(
+        f"@font-face {{ font-family: '{f['family']}'; src: url('{f['file']}') format('{f['format']}'); "
+        f"font-weight: {f['weight']}; font-style: {f['style']}; font-display: swap; }}" for f in faces)
+
+def closest_face(faces, family, weight):
+    # Face a browser would pick for `weight` - what is worth preloading
+    def distance(f):
+        lo, _, hi = f["weight"].partition(" ")
+        return 0 if hi and int(lo) <= weight <= int(hi) else abs(int(lo) - weight)
+    options = [f for f in faces if f["family"] == family and f["style"] == "normal"]
+    return min(options, key=distance) if options else None
+
+def used_glyphs(texts):
+    # Every character of the generated pages (markup is ASCII, which is always kept anyway)
+    chars = set(ALWAYS_GLYPHS)
+    for text in texts: chars.update(text)
+    return "".join(sorted(c for c in chars if c.isprintable() or c == " "))
+
+def render_font(face, glyphs):
+    with open(face["path"], "rb") as f:
+        data = f.read()
+    return _subset(data, glyphs, face["format"]) if ft_subset is not None else data
+
+@functools.lru_cache(maxsize=32)
+def _subset(data, glyphs, flavor):
+    font = TTFont(io.BytesIO(data))
+    options = ft_subset.Options()
+    options.flavor = flavor
+    options.layout_features = ["*"]  # keep kerning/ligatures for the glyphs that remain
+    subsetter = ft_subset.Subsetter(options)
+    subsetter.populate(text=glyphs)
+    subsetter.subset(font)
+    out = io.BytesIO()
+    font.flavor = flavor
+    font.save(out)
+    return out.getvalue()
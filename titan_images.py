@@ -0,0 +1,118 @@
+import concurrent.futures
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageOps, features
+
+# --- TITAN IMAGE PIPELINE ---
+# Local source images are resized into a few widths and encoded as AVIF/WebP plus a JPEG/PNG fallback.
+# Results are keyed by a hash of the source bytes and the encode settings, kept in memory and on disk,
+# so a rebuild (or another site sharing the same photo) never re-encodes.
+
+FALLBACK_FORMATS = {"jpeg": ("jpg", "image/jpeg"), "png": ("png", "image/png")}
+MODERN_FORMATS = {"avif": ("avif", "image/avif"), "webp": ("webp", "image/webp")}
+PIPELINE_VERSION = 1
+
+_MEMO = OrderedDict()  # settings key -> (info, files), most recent last
+_MEMO_MAX = 64
+_MEMO_LOCK = threading.Lock()
+
+def supported_formats(formats):
+    # AVIF needs a Pillow built with libavif; drop what this install cannot encode
+    return [f for f in formats if f in MODERN_FORMATS and features.check(f)]
+
+def settings_key(data, widths, formats, quality):
+    h = hashlib.sha256(data)
+    h.update(json.dumps([PIPELINE_VERSION, sorted(widths), formats, quality]).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+def encode(img, fmt, quality):
+    buf = io.BytesIO()
+    if fmt == "jpeg": img.convert("RGB").save(buf, "JPEG", quality=quality, optimize=True, progressive=True)
+    elif fmt == "png": img.save(buf, "PNG", optimize=True)
+    elif fmt == "webp": img.save(buf, "WEBP", quality=quality, method=4)
+    else: img.save(buf, "AVIF", quality=max(30, quality - 20))
+    return buf.getvalue()
+
+def render_variants(data, stem, key, widths, formats, quality):
+    img = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+    if img.mode not in ("RGB", "RGBA"): img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB")
+    fallback = "png" if img.mode == "RGBA" else "jpeg"
+    sizes = sorted({w for w in widths if w < img.width} | {min(img.width, max(widths))})
+    files, sources = {}, {}
+    for fmt in formats + [fallback]:
+        ext, mime = MODERN_FORMATS.get(fmt) or FALLBACK_FORMATS[fmt]
+        entries = []
+        for w in sizes:
+            h = round(img.height * w / img.width)
+            variant = img if w == img.width else img.resize((w, h), Image.LANCZOS)
+            name = f"img/{stem}-{key[:8]}-{w}.{ext}"
+            files[name] = encode(variant, fmt, quality)
+            entries.append(f"{name} {w}w")
+        sources[mime] = ", ".join(entries)
+    top = sizes[-1]
+    info = {
+        "src": f"img/{stem}-{key[:8]}-{top}.{FALLBACK_FORMATS[fallback][0]}",
+        "width": top, "height": round(img.height * top / img.width),
+        "fallback": FALLBACK_FORMATS[fallback][1],
+        "sources": sources,  # mime -> srcset, modern formats first, fallback last
+        "files": sorted(files),
+    }
+    return info, files
+
+def process_image(path, widths=(480, 960, 1600), formats=("avif", "webp"), quality=78, cache_dir=".titan_img_cache"):
+    # Returns (info, files): info drives the <picture> markup, files maps ZIP paths to encoded bytes
+    with open(path, "rb") as f:
+        data = f.read()
+    formats = supported_formats(formats)
+    key = settings_key(data, widths, formats, quality)
+    with _MEMO_LOCK:
+        if key in _MEMO: return _MEMO[key]
+    stem = re.sub(r"[^a-z0-9]+", "-", os.path.splitext(os.path.basename(path))[0].lower()).strip("-") or "image"
+    cached = load_cached(cache_dir, key) if cache_dir else None
+    result = cached or render_variants(data, stem, key, list(widths), formats, quality)
+    if cache_dir and not cached: save_cached(cache_dir, key, *result)
+    with _MEMO_LOCK:
+        _MEMO[key] = result
+        while len(_MEMO) > _MEMO_MAX: _MEMO.popitem(last=False)
+    return result
+
+def process_images(paths, workers=None, **kwargs):
+    # Pillow drops the GIL while resizing/encoding, so threads parallelise fine (and work inside Streamlit).
+    # A file that cannot be read or decoded maps to None instead of failing the whole batch.
+    def safe(path):
+        try:
+            return process_image(path, **kwargs)
+        except (OSError, ValueError, Image.DecompressionBombError):
+            return None
+    paths = list(dict.fromkeys(paths))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(paths, pool.map(safe, paths)))
+
+def load_cached(cache_dir, key):
+    folder = os.path.join(cache_dir, key)
+    try:
+        with open(os.path.join(folder, "info.json"), encoding="utf-8") as f:
+            info = json.load(f)
+        files = {}
+        for name in info["files"]:
+            with open(os.path.join(folder, os.path.basename(name)), "rb") as f:
+                files[name] = f.read()
+        return info, files
+    except (OSError, ValueError, KeyError):
+        return None
+
+def save_cached(cache_dir, key, info, files):
+    folder = os.path.join(cache_dir, key)
+    os.makedirs(folder, exist_ok=True)
+    for name, body in files.items():
+        with open(os.path.join(folder, os.path.basename(name)), "wb") as f:
+            f.write(body)
+    with open(os.path.join(folder, "info.json.tmp"), "w", encoding="utf-8") as f:
+        json.dump(info, f)
+    os.replace(os.path.join(folder, "info.json.tmp"), os.path.join(folder, "info.json"))  # written last = entry complete
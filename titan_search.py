@@ -0,0 +1,53 @@
+import hashlib
+import json
+import re
+import unicodedata
+from collections import defaultdict
+
+# --- TITAN SEARCH INDEX ---
+# Products and posts are tokenized at build time into an inverted index split into small JSON shards by
+# the first letters of each term, plus document chunks holding only what a result row shows. The browser
+# fetches the shard for each word typed and the chunks holding the top hits - never the sheets themselves.
+
+INDEX_VERSION = 1
+SHARD_PREFIX = 2  # terms are sharded by their first two characters
+DOC_CHUNK = 500  # documents per docs-<n>.json
+TITLE_WEIGHT = 4
+
+_WORD = re.compile(r"[^\W_]+")
+
+def tokenize(text):
+    # Mirrors tokenize() in the generated client: lowercase, accents stripped, runs of letters/digits
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.category(c).startswith("M"))
+    return [t for t in _WORD.findall(text) if len(t) > 1 or t.isdigit()]
+
+def shard_name(prefix):
+    # File-system safe shard name; shardFile() in the client builds the same string
+    return "".join(c if c.isascii() and c.isalnum() else f"_{ord(c):x}" for c in prefix)
+
+def build_index(docs):
+    # docs: dicts with title, url, meta (one line shown under the title) and text (searchable body)
+    # Returns (manifest, files): the manifest is inlined in search.html, files maps ZIP paths to JSON.
+    # manifest["v"] changes with the content and is sent as ?v= so a redeploy never mixes stale shards.
+    postings = defaultdict(dict)  # term -> {doc id: score}
+    for i, doc in enumerate(docs):
+        for weight, text in ((TITLE_WEIGHT, doc["title"]), (1, doc.get("text", ""))):
+            for term in tokenize(text):
+                postings[term][i] = postings[term].get(i, 0) + weight
+    shards = defaultdict(lambda: {"terms": [], "post": []})
+    for term in sorted(postings):
+        shard = shards[term[:SHARD_PREFIX]]
+        flat, last = [], 0
+        for doc_id, score in sorted(postings[term].items()):
+            flat += [doc_id - last, min(score, 255)]  # doc ids delta-encoded
+            last = doc_id
+        shard["terms"].append(term)
+        shard["post"].append(flat)
+    files = {f"search/{shard_name(p)}.json": json.dumps(s, separators=(",", ":"), ensure_ascii=False) for p, s in shards.items()}
+    for n in range(0, len(docs), DOC_CHUNK):
+        chunk = [[d["title"], d["url"], d.get("meta", "")] for d in docs[n:n + DOC_CHUNK]]
+        files[f"search/docs-{n // DOC_CHUNK}.json"] = json.dumps(chunk, separators=(",", ":"), ensure_ascii=False)
+    digest = hashlib.sha256("".join(files[n] for n in sorted(files)).encode("utf-8")).hexdigest()[:10]
+    manifest = {"v": f"{INDEX_VERSION}-{digest}", "docs": len(docs), "chunk": DOC_CHUNK, "prefix": SHARD_PREFIX, "shards": sorted(shards)}
+    return manifest, files